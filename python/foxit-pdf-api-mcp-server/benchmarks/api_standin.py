@@ -0,0 +1,129 @@
+"""Local stand-in for the Foxit PDF API, used by the benchmarks.
+
+Only the transfer endpoints are implemented. Uploads are read in chunks and
+discarded. A download of document "bench-<size>-<n>" streams <size> bytes.
+Run it on its own to serve on a local port; the bound URL is printed on the
+first line of output.
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+
+# Size of the chunks bodies are read and written in
+CHUNK_SIZE = 1024 * 1024
+
+_DOWNLOAD = re.compile(r"^/api/documents/bench-(\d+)-[^/]+/download$")
+
+# Random content, so nothing along the way can compress it
+_BLOCK = os.urandom(CHUNK_SIZE)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Handles the upload, download and delete requests of the benchmarks."""
+
+    protocol_version = "HTTP/1.1"
+    _uploads = count(1)
+    _lock = threading.Lock()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: dict[str, object]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _drain_body(self) -> int:
+        """Read the request body without keeping it; returns its size."""
+        size = 0
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                chunk_size = int(self.rfile.readline().split(b";")[0], 16)
+                if chunk_size == 0:
+                    # Skip trailers up to the empty line ending the body
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    return size
+                while chunk_size:
+                    data = self.rfile.read(min(chunk_size, CHUNK_SIZE))
+                    chunk_size -= len(data)
+                    size += len(data)
+                self.rfile.readline()
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            data = self.rfile.read(min(remaining, CHUNK_SIZE))
+            if not data:
+                break
+            remaining -= len(data)
+            size += len(data)
+        return size
+
+    def do_POST(self) -> None:
+        size = self._drain_body()
+        if self.path.endswith("/api/documents/upload"):
+            with self._lock:
+                document_id = f"upload-{next(self._uploads)}"
+            self._send_json(200, {"documentId": document_id, "size": size})
+        else:
+            self._send_json(404, {"message": f"Not implemented: {self.path}", "code": "NOT_FOUND"})
+
+    def do_GET(self) -> None:
+        match = _DOWNLOAD.match(self.path.split("?")[0])
+        if match is None:
+            self._send_json(404, {"message": f"Not implemented: {self.path}", "code": "NOT_FOUND"})
+            return
+        remaining = int(match.group(1))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(remaining))
+        self.end_headers()
+        while remaining:
+            chunk = _BLOCK[: min(remaining, CHUNK_SIZE)]
+            self.wfile.write(chunk)
+            remaining -= len(chunk)
+
+    def do_DELETE(self) -> None:
+        self._send_json(200, {"status": "deleted"})
+
+
+def serve(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Create the stand-in server.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
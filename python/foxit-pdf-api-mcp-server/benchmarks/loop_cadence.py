@@ -0,0 +1,215 @@
+"""Event-loop cadence check for the upload and download paths.
+
+A timer ticks every few milliseconds, as task poll loops do, while
+upload_document reads a large file and download_document writes one, both
+against the local API stand-in (api_standin.py). Each tick records how late
+it fired.
+
+A warm page cache makes local reads too fast to stall anything, so the check
+simulates a slow disk: every read and write of a benchmark file blocks its
+thread for --disk-latency-ms. File I/O on the event loop then delays ticks by
+at least that much, and the check fails; file I/O on the file I/O pool leaves
+them on time.
+
+Usage:
+    python benchmarks/loop_cadence.py [--size 100] [--disk-latency-ms 100]
+"""
+
+import argparse
+import asyncio
+import builtins
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Awaitable, Callable
+
+MB = 1024 * 1024
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+
+class _SlowFile:
+    """File proxy whose reads and writes block for a fixed latency."""
+
+    def __init__(self, file: IO[Any], latency: float) -> None:
+        self._file = file
+        self._latency = latency
+
+    def read(self, *args: Any) -> Any:
+        time.sleep(self._latency)
+        return self._file.read(*args)
+
+    def write(self, data: Any) -> int:
+        time.sleep(self._latency)
+        return self._file.write(data)
+
+    def __enter__(self) -> "_SlowFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._file.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+
+def simulate_slow_disk(root: Path, latency: float) -> None:
+    """Make reads and writes of files under root block for latency seconds."""
+    real_open, real_fdopen = builtins.open, os.fdopen
+
+    def slow(file: Any) -> Any:
+        return _SlowFile(file, latency) if isinstance(file, io.IOBase) else file
+
+    def open_(path: Any, *args: Any, **kwargs: Any) -> Any:
+        file = real_open(path, *args, **kwargs)
+        under_root = isinstance(path, (str, Path)) and Path(path).is_relative_to(root)
+        return slow(file) if under_root else file
+
+    def fdopen(fd: int, *args: Any, **kwargs: Any) -> Any:
+        # Blob store temp files are opened from a descriptor
+        return slow(real_fdopen(fd, *args, **kwargs))
+
+    builtins.open = open_  # type: ignore[assignment]
+    os.fdopen = fdopen  # type: ignore[assignment]
+
+
+async def _ticker(interval: float, lateness: list[float], stop: asyncio.Event) -> None:
+    """Tick every interval seconds, recording how late each tick fires."""
+    loop = asyncio.get_running_loop()
+    expected = loop.time() + interval
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, expected - loop.time()))
+        lateness.append(loop.time() - expected)
+        expected += interval
+
+
+async def _measure(
+    interval: float, work: Callable[[], Awaitable[dict[str, Any]]]
+) -> tuple[list[float], float]:
+    lateness: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(_ticker(interval, lateness, stop))
+    started = time.monotonic()
+    try:
+        payload = await work()
+    finally:
+        stop.set()
+        await ticker
+    if not payload.get("success"):
+        raise RuntimeError(payload.get("error"))
+    return lateness, time.monotonic() - started
+
+
+async def run_checks(
+    size: int, interval: float, disk_latency: float, work_dir: Path
+) -> list[dict[str, Any]]:
+    """
+    Run every workload with the ticker and report the ticks' lateness.
+
+    Args:
+        size: Bytes of the file uploaded and downloaded
+        interval: Ticker interval in seconds
+        disk_latency: Simulated latency of each file read and write, in seconds
+        work_dir: Directory for the input, output and server data files
+
+    Returns:
+        One record per workload, with tick count and p99/max lateness
+    """
+    from foxit_pdf_api_mcp_server.server import mcp
+
+    input_path = work_dir / "input.bin"
+    with open(input_path, "wb") as file:
+        for offset in range(0, size, MB):
+            file.write(os.urandom(min(MB, size - offset)))
+    simulate_slow_disk(work_dir, disk_latency)
+
+    async def call(tool: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        result = await mcp.call_tool(tool, arguments)
+        payload: dict[str, Any] = json.loads(result.content[0].text)
+        return payload
+
+    workloads: dict[str, Callable[[], Awaitable[dict[str, Any]]]] = {
+        "upload_document": lambda: call("upload_document", {"resourceUri": input_path.as_uri()}),
+        "download_document": lambda: call(
+            "download_document",
+            {"documentId": f"bench-{size}-cadence", "outputPath": str(work_dir / "output.bin")},
+        ),
+    }
+
+    records = []
+    for name, work in workloads.items():
+        lateness, elapsed = await _measure(interval, work)
+        ordered = sorted(lateness)
+        records.append(
+            {
+                "workload": name,
+                "seconds": round(elapsed, 2),
+                "ticks": len(ordered),
+                "p99LagMs": round(ordered[int(len(ordered) * 0.99)] * 1000, 1) if ordered else 0,
+                "maxLagMs": round(ordered[-1] * 1000, 1) if ordered else 0,
+            }
+        )
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that timers keep their cadence during large file transfers."
+    )
+    parser.add_argument("--size", type=int, default=100, help="File size in MB")
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Ticker interval")
+    parser.add_argument(
+        "--disk-latency-ms", type=float, default=100.0, help="Simulated latency per file read/write"
+    )
+    parser.add_argument("--max-lag-ms", type=float, default=50.0, help="Largest tick lateness")
+    args = parser.parse_args()
+
+    standin = subprocess.Popen(
+        [sys.executable, str(BENCH_DIR / "api_standin.py")],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert standin.stdout is not None
+    api_url = standin.stdout.readline().strip()
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="foxit-cadence-") as temp_dir:
+            work_dir = Path(temp_dir)
+            os.environ.update(
+                {
+                    "FOXIT_CLOUD_API_HOST": api_url,
+                    "FOXIT_CLOUD_API_CLIENT_ID": "benchmark",
+                    "FOXIT_CLOUD_API_CLIENT_SECRET": "benchmark",
+                    "FOXIT_MCP_DATA_DIR": str(work_dir / "data"),
+                }
+            )
+            records = asyncio.run(
+                run_checks(
+                    args.size * MB, args.interval_ms / 1000, args.disk_latency_ms / 1000, work_dir
+                )
+            )
+    finally:
+        standin.terminate()
+        standin.wait()
+
+    failed = False
+    print(f"{'workload':<20}{'seconds':>9}{'ticks':>7}{'p99 lag':>11}{'max lag':>11}  result")
+    for record in records:
+        ok = record["maxLagMs"] <= args.max_lag_ms
+        failed = failed or not ok
+        print(
+            f"{record['workload']:<20}{record['seconds']:>9}{record['ticks']:>7}"
+            f"{record['p99LagMs']:>9}ms{record['maxLagMs']:>9}ms  {'ok' if ok else 'FAIL'}"
+        )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
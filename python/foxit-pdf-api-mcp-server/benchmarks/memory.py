@@ -0,0 +1,271 @@
+"""Peak-memory benchmarks for the upload and download paths.
+
+Every scenario (transfer kind, file size, concurrency) runs the real
+upload_document / download_document tools in a fresh process against the
+local API stand-in (api_standin.py), and measures:
+
+- peak RSS above the process's settled baseline, with tracing off
+- the tracemalloc peak of Python allocations, in a second traced pass
+
+A scenario fails when either peak, divided by the number of transfers in
+flight, exceeds a multiple of the transfer chunk size. Streaming paths stay
+within a few chunks per transfer; a path that buffers whole files does not.
+
+Usage:
+    python benchmarks/memory.py [--sizes 1,50,100] [--concurrency 1,4,8]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Optional
+
+MB = 1024 * 1024
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+
+# Chunk size of streamed downloads, which uploads also stay below
+CHUNK_SIZE = 1024 * 1024
+
+KINDS = ("upload", "download")
+
+
+def _proc_status_bytes(field: str) -> Optional[int]:
+    """Read a memory field (e.g. VmRSS) of this process from /proc, in bytes."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _current_rss() -> int:
+    rss = _proc_status_bytes("VmRSS")
+    if rss is not None:
+        return rss
+    # No /proc: fall back to the high-water mark (KB on Linux, bytes on macOS)
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _peak_rss() -> int:
+    peak = _proc_status_bytes("VmHWM")
+    return peak if peak is not None else _current_rss()
+
+
+def _reset_peak_rss() -> None:
+    """Reset the RSS high-water mark to the current RSS, where Linux allows it."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+async def _transfer(kind: str, index: int, size: int, work_dir: Path, round_name: str) -> None:
+    """Run one upload or download through its MCP tool."""
+    from foxit_pdf_api_mcp_server.server import mcp
+
+    if kind == "upload":
+        arguments: dict[str, Any] = {"resourceUri": (work_dir / f"input-{size}.bin").as_uri()}
+        tool = "upload_document"
+    else:
+        output = work_dir / f"output-{round_name}-{index}.bin"
+        arguments = {"documentId": f"bench-{size}-{round_name}{index}", "outputPath": str(output)}
+        tool = "download_document"
+
+    result = await mcp.call_tool(tool, arguments)
+    payload = json.loads(result.content[0].text)
+    if not payload.get("success"):
+        raise RuntimeError(f"{tool} failed: {payload.get('error')}")
+    if kind == "download":
+        output.unlink()
+
+
+async def _run_round(
+    kind: str, size: int, concurrency: int, work_dir: Path, round_name: str
+) -> None:
+    await asyncio.gather(
+        *(_transfer(kind, i, size, work_dir, round_name) for i in range(concurrency))
+    )
+
+
+def run_scenario(kind: str, size: int, concurrency: int, work_dir: Path) -> dict[str, int]:
+    """
+    Measure one scenario in this process (called in a fresh child process).
+
+    Args:
+        kind: "upload" or "download"
+        size: Bytes per transferred file
+        concurrency: Transfers in flight at once
+        work_dir: Directory for input, output and server data files
+
+    Returns:
+        Peak RSS and tracemalloc peak above their baselines, in bytes
+    """
+    if kind == "upload":
+        for file_size in (size, 64 * 1024):
+            with open(work_dir / f"input-{file_size}.bin", "wb") as file:
+                for offset in range(0, file_size, CHUNK_SIZE):
+                    file.write(os.urandom(min(CHUNK_SIZE, file_size - offset)))
+
+    async def measure() -> dict[str, int]:
+        # Warm up imports, connections and worker threads with a small transfer
+        await _run_round(kind, 64 * 1024, concurrency, work_dir, "warmup")
+        gc.collect()
+
+        _reset_peak_rss()
+        baseline = _current_rss()
+        await _run_round(kind, size, concurrency, work_dir, "rss")
+        peak_rss = _peak_rss() - baseline
+        gc.collect()
+
+        tracemalloc.start()
+        try:
+            traced_baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await _run_round(kind, size, concurrency, work_dir, "traced")
+            traced_peak = tracemalloc.get_traced_memory()[1] - traced_baseline
+        finally:
+            tracemalloc.stop()
+        return {"peakRss": max(peak_rss, 0), "tracedPeak": traced_peak}
+
+    return asyncio.run(measure())
+
+
+def _child_env(api_url: str, work_dir: Path) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])),
+            "FOXIT_CLOUD_API_HOST": api_url,
+            "FOXIT_CLOUD_API_CLIENT_ID": "benchmark",
+            "FOXIT_CLOUD_API_CLIENT_SECRET": "benchmark",
+            "FOXIT_MCP_DATA_DIR": str(work_dir / "data"),
+            "FOXIT_BLOB_STORE_MAX_MB": "4096",
+            "FOXIT_GC_ENABLED": "false",
+            "FOXIT_PREFETCH_ENABLED": "false",
+        }
+    )
+    return env
+
+
+def _run_child(kind: str, size: int, concurrency: int, api_url: str) -> dict[str, int]:
+    with tempfile.TemporaryDirectory(prefix="foxit-bench-") as temp_dir:
+        work_dir = Path(temp_dir)
+        completed = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--scenario",
+                f"{kind}:{size}:{concurrency}",
+                "--work-dir",
+                str(work_dir),
+            ],
+            env=_child_env(api_url, work_dir),
+            capture_output=True,
+            text=True,
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "")
+    result: dict[str, int] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure peak memory of uploads and downloads against a local API stand-in."
+    )
+    parser.add_argument("--sizes", type=_int_list, default=[1, 50, 100], help="File sizes in MB")
+    parser.add_argument(
+        "--concurrency", type=_int_list, default=[1, 4, 8], help="Transfers in flight"
+    )
+    parser.add_argument("--kinds", default=",".join(KINDS), help="upload, download or both")
+    parser.add_argument(
+        "--max-chunk-multiple",
+        type=float,
+        default=8.0,
+        help="Largest tracemalloc peak per transfer, in chunks",
+    )
+    parser.add_argument(
+        "--max-rss-chunk-multiple",
+        type=float,
+        default=16.0,
+        help="Largest peak RSS per transfer, in chunks",
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        kind, size, concurrency = args.scenario.split(":")
+        print(json.dumps(run_scenario(kind, int(size), int(concurrency), args.work_dir)))
+        return
+
+    standin = subprocess.Popen(
+        [sys.executable, str(BENCH_DIR / "api_standin.py")],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert standin.stdout is not None
+    api_url = standin.stdout.readline().strip()
+
+    results: list[dict[str, Any]] = []
+    print(f"{'kind':<9}{'size':>7}{'conc':>6}{'RSS/xfer':>12}{'traced/xfer':>13}  result")
+    try:
+        for kind in args.kinds.split(","):
+            for size_mb in args.sizes:
+                for concurrency in args.concurrency:
+                    row: dict[str, Any] = {
+                        "kind": kind,
+                        "sizeMb": size_mb,
+                        "concurrency": concurrency,
+                    }
+                    try:
+                        row.update(_run_child(kind, size_mb * MB, concurrency, api_url))
+                        rss_chunks = row["peakRss"] / concurrency / CHUNK_SIZE
+                        traced_chunks = row["tracedPeak"] / concurrency / CHUNK_SIZE
+                        row["passed"] = (
+                            rss_chunks <= args.max_rss_chunk_multiple
+                            and traced_chunks <= args.max_chunk_multiple
+                        )
+                        summary = f"{rss_chunks:>9.1f} ch{traced_chunks:>10.1f} ch"
+                    except RuntimeError as error:
+                        row["passed"] = False
+                        row["error"] = str(error)
+                        summary = f"{'-':>12}{'-':>13}"
+                    results.append(row)
+                    print(
+                        f"{kind:<9}{size_mb:>5}MB{concurrency:>6}{summary}  "
+                        f"{'ok' if row['passed'] else ' '.join(['FAIL', row.get('error', '')])}",
+                        flush=True,
+                    )
+    finally:
+        standin.terminate()
+        standin.wait()
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if not all(row["passed"] for row in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
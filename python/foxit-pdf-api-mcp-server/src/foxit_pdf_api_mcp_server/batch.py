@@ -0,0 +1,220 @@
+"""Batch mode: run a JSONL manifest of operations without an MCP client."""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Optional, TypedDict
+
+from .client import FoxitPDFClient, file_io
+from .utils import download_to_path
+from .utils.pipeline import PipelineStep, load_pipeline, run_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSummary(TypedDict):
+    """Outcome counts and throughput of a batch run."""
+
+    total: int
+    succeeded: int
+    failed: int
+    skipped: int
+    seconds: float
+    perSecond: float
+
+
+def _parse_entry(
+    entry: Any,
+) -> tuple[list[PipelineStep], Optional[str], Optional[str], Optional[str]]:
+    """Validate one manifest entry and return (steps, input path, documentId, output path)."""
+    if not isinstance(entry, dict):
+        raise ValueError("Manifest entry must be a JSON object")
+    if "steps" in entry:
+        steps = load_pipeline(json.dumps(entry["steps"]))
+    else:
+        steps = load_pipeline(
+            json.dumps([{"operation": entry.get("operation"), "args": entry.get("args", {})}])
+        )
+    if bool(entry.get("input")) == bool(entry.get("documentId")):
+        raise ValueError("Manifest entry must have exactly one of input or documentId")
+    return steps, entry.get("input"), entry.get("documentId"), entry.get("output")
+
+
+def _append_line(file: IO[bytes], text: str) -> None:
+    file.write(text.encode("utf-8") + b"\n")
+    file.flush()
+
+
+class BatchRunner:
+    """
+    Runs every line of a JSONL manifest through the client with bounded concurrency.
+
+    Each manifest line is a JSON object with either "operation" (and optional
+    "args") or "steps" (a pipeline), either "input" (a local file to upload) or
+    "documentId", and an optional "output" path for the final result. Finished
+    line numbers are appended to a checkpoint file so an interrupted run resumes
+    where it stopped; one result record per line is appended to a JSONL log.
+    """
+
+    def __init__(
+        self,
+        client: FoxitPDFClient,
+        manifest_path: Path,
+        concurrency: int = 8,
+        checkpoint_path: Optional[Path] = None,
+        results_path: Optional[Path] = None,
+        cleanup: bool = True,
+    ) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            client: Foxit PDF client instance
+            manifest_path: JSONL manifest of operations
+            concurrency: Manifest lines processed concurrently
+            checkpoint_path: Finished line numbers (default: <manifest>.checkpoint)
+            results_path: JSONL result log (default: <manifest>.results.jsonl)
+            cleanup: Delete uploads and intermediate results once a line finishes
+        """
+        self.client = client
+        self.manifest_path = manifest_path
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path or manifest_path.with_name(
+            manifest_path.name + ".checkpoint"
+        )
+        self.results_path = results_path or manifest_path.with_name(
+            manifest_path.stem + ".results.jsonl"
+        )
+        self.cleanup = cleanup
+
+    def _load_checkpoint(self) -> set[int]:
+        if not self.checkpoint_path.exists():
+            return set()
+        done = set()
+        for line in self.checkpoint_path.read_text().split():
+            if line.isdigit():
+                done.add(int(line))
+        return done
+
+    @staticmethod
+    async def _entries(
+        manifest: file_io.AsyncFile, done: set[int]
+    ) -> AsyncIterator[tuple[int, str]]:
+        line_number = 0
+        while line := await manifest.readline():
+            line_number += 1
+            if line.strip() and line_number not in done:
+                yield line_number, line.decode("utf-8")
+
+    async def _run_entry(self, line_number: int, line: str) -> dict[str, Any]:
+        started = time.monotonic()
+        record: dict[str, Any] = {"line": line_number}
+        created: list[str] = []
+        try:
+            steps, input_path, document_id, output_path = _parse_entry(json.loads(line))
+            if input_path:
+                async with await file_io.open_file(Path(input_path).expanduser()) as file:
+                    upload = await self.client.upload_document(file.file, Path(input_path).name)
+                document_id = upload["documentId"]
+                created.append(document_id)
+            assert document_id is not None
+
+            outcome = await run_pipeline(self.client, document_id, steps, created)
+            result = outcome["result"]
+            record["taskIds"] = outcome["taskIds"]
+
+            result_document_id = result.get("resultDocumentId")
+            if output_path and result_document_id:
+                info = await download_to_path(
+                    self.client, result_document_id, Path(output_path).expanduser()
+                )
+                record.update(output=info["path"], size=info["size"], sha256=info["sha256"])
+            elif output_path:
+                path = Path(output_path).expanduser()
+                await file_io.write_text(path, json.dumps(result.get("resultData"), indent=2))
+                record["output"] = str(path)
+            else:
+                # Nothing saved locally: the result document is the output, so keep it
+                if result_document_id:
+                    created.remove(result_document_id)
+                    record["resultDocumentId"] = result_document_id
+                if result.get("resultData") is not None:
+                    record["resultData"] = result["resultData"]
+            record["status"] = "done"
+        except Exception as error:
+            record.update(
+                status="failed",
+                error=str(error),
+                code=getattr(error, "code", "BATCH_ENTRY_FAILED"),
+            )
+        finally:
+            if self.cleanup and created:
+                await asyncio.gather(
+                    *(self.client.delete_document(doc_id) for doc_id in created),
+                    return_exceptions=True,
+                )
+        record["seconds"] = round(time.monotonic() - started, 3)
+        return record
+
+    async def run(self) -> BatchSummary:
+        """
+        Process every unfinished manifest line.
+
+        Returns:
+            Counts for this run and its throughput in lines per second
+        """
+        done = await file_io.run(self._load_checkpoint)
+        counts = {"done": 0, "failed": 0}
+        started = time.monotonic()
+
+        async with (
+            await file_io.open_file(self.manifest_path) as manifest,
+            await file_io.open_file(self.results_path, "ab") as results,
+            await file_io.open_file(self.checkpoint_path, "ab") as checkpoint,
+        ):
+            entries = self._entries(manifest, done)
+            # An async generator cannot be advanced by two workers at once
+            entries_lock = asyncio.Lock()
+
+            async def next_entry() -> Optional[tuple[int, str]]:
+                async with entries_lock:
+                    return await anext(entries, None)
+
+            async def worker() -> None:
+                # Workers pull lines lazily, so the manifest is never held in memory
+                while (entry := await next_entry()) is not None:
+                    line_number, line = entry
+                    record = await self._run_entry(line_number, line)
+                    counts[record["status"]] += 1
+                    await file_io.run(_append_line, results.file, json.dumps(record))
+                    if record["status"] == "done":
+                        await file_io.run(_append_line, checkpoint.file, str(line_number))
+                    processed = counts["done"] + counts["failed"]
+                    if processed % 100 == 0:
+                        logger.info("Processed %d lines", processed)
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        seconds = time.monotonic() - started
+        processed = counts["done"] + counts["failed"]
+        return BatchSummary(
+            total=processed + len(done),
+            succeeded=counts["done"],
+            failed=counts["failed"],
+            skipped=len(done),
+            seconds=round(seconds, 3),
+            perSecond=round(processed / seconds, 3) if seconds > 0 else 0.0,
+        )
+
+
+async def run_batch(runner: BatchRunner) -> BatchSummary:
+    """Run a batch, then close the client."""
+    try:
+        return await runner.run()
+    finally:
+        await runner.client.close()
+
+
+__all__ = ["BatchRunner", "BatchSummary", "run_batch"]
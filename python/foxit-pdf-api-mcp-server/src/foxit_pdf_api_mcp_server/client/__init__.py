@@ -1,6 +1,25 @@
 """Foxit PDF API HTTP client."""
 
+from .circuit_breaker import CircuitBreakers
+from .credential_pool import Credential, CredentialPool
+from .document_registry import DocumentRegistry, TrackedDocument
+from .endpoint_pool import Endpoint, EndpointPool
 from .foxit_client import FoxitAPIError, FoxitPDFClient
+from .hedging import HedgePolicy
+from .single_flight import OperationCoalescer, SingleFlight
 
-__all__ = ["FoxitPDFClient", "FoxitAPIError"]
+__all__ = [
+    "FoxitPDFClient",
+    "FoxitAPIError",
+    "DocumentRegistry",
+    "TrackedDocument",
+    "Endpoint",
+    "EndpointPool",
+    "Credential",
+    "CredentialPool",
+    "CircuitBreakers",
+    "HedgePolicy",
+    "OperationCoalescer",
+    "SingleFlight",
+]
 """HTTP client for Foxit PDF API."""
\ No newline at end of file
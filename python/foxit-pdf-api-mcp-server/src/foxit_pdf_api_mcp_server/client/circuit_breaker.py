@@ -0,0 +1,157 @@
+"""Per-path circuit breakers that fail fast while an API endpoint is down."""
+
+import re
+import time
+from typing import Any, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Path segments that are document or task IDs, so all IDs share one breaker
+_ID_PATTERNS = [
+    (None, re.compile(r"^/api/tasks/[^/]+$"), "/api/tasks/{taskId}"),
+    (None, re.compile(r"^/api/documents/[^/]+/download$"), "/api/documents/{documentId}/download"),
+    ("DELETE", re.compile(r"^/api/documents/[^/]+$"), "/api/documents/{documentId}"),
+]
+
+
+def path_template(method: str, path: str) -> str:
+    """
+    Get the breaker key of a request: its method and path with IDs replaced.
+
+    Args:
+        method: HTTP method
+        path: API path, optionally with a query string
+
+    Returns:
+        Key such as "GET /api/tasks/{taskId}"
+    """
+    path = "/" + path.split("?", 1)[0].lstrip("/")
+    for pattern_method, pattern, template in _ID_PATTERNS:
+        if (pattern_method is None or pattern_method == method) and pattern.match(path):
+            path = template
+            break
+    return f"{method} {path}"
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.rejected = 0
+
+
+class CircuitBreakers:
+    """
+    Closed/open/half-open circuit breakers keyed by API path.
+
+    A breaker opens after failure_threshold consecutive failures (network
+    errors, timeouts and 5xx responses) and rejects calls for cooldown seconds.
+    It then lets half_open_probes calls through: a success closes it, a failure
+    opens it for another cooldown. Breakers are independent, so a failing OCR
+    endpoint does not affect uploads or other operations.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        """
+        Initialize the breakers.
+
+        Args:
+            failure_threshold: Consecutive failures that open a breaker
+            cooldown: Seconds an open breaker rejects calls before probing
+            half_open_probes: Calls let through concurrently while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self._circuits: dict[str, _Circuit] = {}
+
+    def before_call(self, key: str) -> Optional[float]:
+        """
+        Check whether a call may proceed, reserving a probe slot if half-open.
+
+        Every call that is allowed must be followed by after_call(key, ...).
+
+        Args:
+            key: Breaker key
+
+        Returns:
+            None if the call may proceed, else seconds until the next probe
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state == CLOSED:
+            return None
+
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            remaining = circuit.opened_at + self.cooldown - now
+            if remaining > 0:
+                circuit.rejected += 1
+                return remaining
+            circuit.state = HALF_OPEN
+
+        if circuit.probes_in_flight >= self.half_open_probes:
+            circuit.rejected += 1
+            return 0.0
+        circuit.probes_in_flight += 1
+        return None
+
+    def after_call(self, key: str, ok: Optional[bool]) -> None:
+        """
+        Record the outcome of an allowed call.
+
+        Args:
+            key: Breaker key
+            ok: True on success, False on failure, None if the call was abandoned
+                (e.g. cancelled) without an outcome
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            if ok is not False:
+                return
+            circuit = self._circuits[key] = _Circuit()
+
+        if circuit.state == HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+        if ok is None:
+            return
+
+        if ok:
+            circuit.state = CLOSED
+            circuit.consecutive_failures = 0
+            return
+
+        circuit.consecutive_failures += 1
+        if circuit.state == HALF_OPEN or circuit.consecutive_failures >= self.failure_threshold:
+            circuit.state = OPEN
+            circuit.opened_at = time.monotonic()
+            circuit.probes_in_flight = 0
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get the state of every breaker that has seen a failure."""
+        now = time.monotonic()
+        return [
+            {
+                "key": key,
+                "state": circuit.state,
+                "consecutiveFailures": circuit.consecutive_failures,
+                "rejected": circuit.rejected,
+                "retryInSeconds": (
+                    round(max(0.0, circuit.opened_at + self.cooldown - now), 1)
+                    if circuit.state == OPEN
+                    else 0.0
+                ),
+            }
+            for key, circuit in self._circuits.items()
+        ]
+
+
+__all__ = ["CLOSED", "HALF_OPEN", "OPEN", "CircuitBreakers", "path_template"]
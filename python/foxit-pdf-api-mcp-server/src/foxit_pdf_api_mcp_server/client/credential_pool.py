@@ -0,0 +1,155 @@
+"""Load-aware spreading of API calls across several credential sets."""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+import httpx
+
+# Seconds a credential is avoided for new work after a 429 without Retry-After
+DEFAULT_THROTTLE_BACKOFF = 5.0
+
+
+class Credential:
+    """One client ID/secret pair with its own connection pool and concurrency budget."""
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        max_concurrency: int,
+        http: httpx.AsyncClient,
+    ) -> None:
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.max_concurrency = max_concurrency
+        self.http = http
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.pending = 0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.throttled_until = 0.0
+
+    @property
+    def label(self) -> str:
+        """Client ID shortened for logs and stats."""
+        return f"{self.client_id[:6]}…" if len(self.client_id) > 6 else self.client_id
+
+    @property
+    def load(self) -> float:
+        """Requests in flight or waiting, relative to the concurrency budget."""
+        return self.pending / self.max_concurrency
+
+    def headers(self) -> dict[str, str]:
+        return {"client_id": self.client_id, "client_secret": self.client_secret}
+
+    def record(self, response: Optional[httpx.Response]) -> None:
+        """Record the outcome of a request (None for network errors)."""
+        self.requests += 1
+        if response is None or response.status_code >= 500:
+            self.errors += 1
+        elif response.status_code == 429:
+            self.throttled += 1
+            try:
+                backoff = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                backoff = DEFAULT_THROTTLE_BACKOFF
+            self.throttled_until = time.monotonic() + backoff
+
+    def stats(self, now: float) -> dict[str, Any]:
+        return {
+            "clientId": self.label,
+            "maxConcurrency": self.max_concurrency,
+            "pending": self.pending,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "throttledForSeconds": round(max(0.0, self.throttled_until - now), 1),
+        }
+
+
+class CredentialPool:
+    """
+    Spreads new work across credential sets by current load.
+
+    Documents and tasks belong to the account that created them, so each ID is
+    pinned to its credential and every later call for it uses that credential.
+    New work goes to the credential with the lowest load that is not backing
+    off from a 429 response. IDs not created through this pool (e.g. from an
+    earlier run) use the first credential.
+    """
+
+    def __init__(
+        self,
+        credentials: list[tuple[str, str]],
+        max_concurrency: int,
+        timeout: httpx.Timeout,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            credentials: (client ID, client secret) pairs, the first being the default
+            max_concurrency: Requests in flight allowed per credential
+            timeout: HTTP timeouts per phase
+        """
+        if not credentials:
+            raise ValueError("At least one credential is required")
+        self.credentials = [
+            Credential(
+                client_id,
+                client_secret,
+                max_concurrency,
+                httpx.AsyncClient(
+                    timeout=timeout,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=max_concurrency),
+                ),
+            )
+            for client_id, client_secret in credentials
+        ]
+        self._pins: dict[str, Credential] = {}
+
+    @property
+    def primary(self) -> Credential:
+        """The default credential, used for IDs this pool did not create."""
+        return self.credentials[0]
+
+    def choose(self) -> Credential:
+        """Pick the credential for new work."""
+        if len(self.credentials) == 1:
+            return self.primary
+
+        now = time.monotonic()
+        available = [c for c in self.credentials if c.throttled_until <= now]
+        if not available:
+            return min(self.credentials, key=lambda c: c.throttled_until)
+        return min(available, key=lambda c: (c.load, c.requests))
+
+    def credential_for(self, resource_id: Optional[str]) -> Credential:
+        """Get the credential a document or task ID belongs to."""
+        if resource_id is None:
+            return self.primary
+        return self._pins.get(resource_id, self.primary)
+
+    def pin(self, resource_id: str, credential: Credential) -> None:
+        """Record that a document or task ID was created with credential."""
+        if len(self.credentials) > 1:
+            self._pins[resource_id] = credential
+
+    def unpin(self, resource_id: str) -> None:
+        """Forget the credential of a deleted document or finished task."""
+        self._pins.pop(resource_id, None)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get per-credential usage and throttling."""
+        now = time.monotonic()
+        return [credential.stats(now) for credential in self.credentials]
+
+    async def aclose(self) -> None:
+        """Close every connection pool."""
+        await asyncio.gather(*(c.http.aclose() for c in self.credentials))
+
+
+__all__ = ["Credential", "CredentialPool"]
@@ -0,0 +1,53 @@
+"""End-to-end deadlines that bound every request made within a call."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Monotonic time by which the current call must finish, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("foxit_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound all client requests and task polling inside the block.
+
+    Nested deadlines cannot extend an outer one: the earlier of the two applies.
+    The deadline is carried by a context variable, so tasks started inside the
+    block (e.g. hedged requests) inherit it.
+
+    Args:
+        seconds: Time budget from now, or None for no limit
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(at, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Seconds left (zero or negative once it has passed), or None without a deadline
+    """
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def expired() -> bool:
+    """Check whether the current deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+__all__ = ["deadline", "expired", "remaining"]
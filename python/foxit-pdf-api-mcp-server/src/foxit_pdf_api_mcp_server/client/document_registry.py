@@ -0,0 +1,390 @@
+"""Registry of remote documents created through the client."""
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Container, Iterator, Optional, TypedDict
+
+# Origin recorded for documents created by upload_document
+UPLOAD_ORIGIN = "upload"
+
+
+class TrackedDocument(TypedDict):
+    """A remote document created by this server."""
+
+    documentId: str
+    origin: str
+    taskId: Optional[str]
+    inputs: list[str]
+    createdAt: float
+    pinned: bool
+    supersededAt: Optional[float]
+    deleteRequested: bool
+    # Base URL and client ID it was created with, so a later run deletes it there
+    endpoint: Optional[str]
+    credential: Optional[str]
+
+
+class CallDocuments:
+    """Uploads and operation tasks started or attached to during one tool call."""
+
+    def __init__(self) -> None:
+        self.uploads: list[str] = []
+        self.tasks: list[str] = []
+
+
+# Call whose uploads and tasks are being recorded, if any
+_current_call: ContextVar[Optional[CallDocuments]] = ContextVar(
+    "foxit_call_documents", default=None
+)
+
+
+@contextmanager
+def track_call() -> Iterator[CallDocuments]:
+    """
+    Record the uploads and tasks started inside the block.
+
+    Yields:
+        The record, filled in as the registry sees uploads and task submissions
+    """
+    call = CallDocuments()
+    token = _current_call.set(call)
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+
+
+def input_document_ids(payload: Any) -> list[str]:
+    """
+    Collect the document IDs an operation payload refers to.
+
+    Args:
+        payload: JSON payload of an operation request
+
+    Returns:
+        Unique document IDs in the order they appear
+    """
+    found: list[str] = []
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            document_id = value.get("documentId")
+            if isinstance(document_id, str) and document_id not in found:
+                found.append(document_id)
+            stack.extend(reversed([v for k, v in value.items() if k != "documentId"]))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+    return found
+
+
+class DocumentRegistry:
+    """
+    Tracks every document created through the client, with origin and age.
+
+    Uploads are recorded when they return, operation results when their task
+    completes. A result produced from another operation's result marks that
+    input as superseded. Documents used by tasks still running are treated as
+    in use, the same as pinned ones.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._documents: dict[str, TrackedDocument] = {}
+        # Running tasks: task ID -> (operation path, input document IDs, submission time)
+        self._tasks: dict[str, tuple[str, list[str], float]] = {}
+        # Running tasks whose caller went away; their results are queued for deletion
+        self._abandoned: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, document_id: str) -> Optional[TrackedDocument]:
+        """Get a tracked document by ID."""
+        return self._documents.get(document_id)
+
+    def all(self) -> list[TrackedDocument]:
+        """Get all tracked documents, oldest first."""
+        return sorted(self._documents.values(), key=lambda doc: doc["createdAt"])
+
+    def _add(
+        self,
+        document_id: str,
+        origin: str,
+        task_id: Optional[str],
+        inputs: list[str],
+        endpoint: Optional[str] = None,
+        credential: Optional[str] = None,
+    ) -> TrackedDocument:
+        existing = self._documents.get(document_id)
+        if existing is not None:
+            return existing
+        document = TrackedDocument(
+            documentId=document_id,
+            origin=origin,
+            taskId=task_id,
+            inputs=inputs,
+            createdAt=time.time(),
+            pinned=False,
+            supersededAt=None,
+            deleteRequested=False,
+            endpoint=endpoint,
+            credential=credential,
+        )
+        self._documents[document_id] = document
+        return document
+
+    def record_upload(
+        self,
+        document_id: str,
+        endpoint: Optional[str] = None,
+        credential: Optional[str] = None,
+    ) -> TrackedDocument:
+        """Record a document created by an upload, with the route that created it."""
+        call = _current_call.get()
+        if call is not None:
+            call.uploads.append(document_id)
+        return self._add(document_id, UPLOAD_ORIGIN, None, [], endpoint, credential)
+
+    def record_task(self, task_id: str, operation: str, inputs: list[str]) -> None:
+        """Record a submitted operation task and the documents it reads."""
+        self._tasks[task_id] = (operation, inputs, time.time())
+
+    def track_task(self, task_id: str) -> None:
+        """Add a task the current call submitted or attached to to its record."""
+        call = _current_call.get()
+        if call is not None and task_id not in call.tasks:
+            call.tasks.append(task_id)
+
+    def record_task_finished(
+        self,
+        task_id: str,
+        result_document_id: Optional[str],
+        endpoint: Optional[str] = None,
+        credential: Optional[str] = None,
+    ) -> Optional[TrackedDocument]:
+        """
+        Record a task reaching a terminal state.
+
+        Args:
+            task_id: Task ID
+            result_document_id: Result document ID, if the task produced one
+            endpoint: Base URL the task ran on
+            credential: Client ID the task ran under
+
+        Returns:
+            The tracked result document, if any
+        """
+        operation, inputs, _submitted_at = self._tasks.pop(task_id, ("unknown", [], 0.0))
+        if not result_document_id:
+            self._abandoned.discard(task_id)
+            return None
+
+        result = self._add(result_document_id, operation, task_id, inputs, endpoint, credential)
+        if task_id in self._abandoned:
+            self._abandoned.discard(task_id)
+            result["deleteRequested"] = True
+        now = time.time()
+        for input_id in inputs:
+            source = self._documents.get(input_id)
+            if source is not None and source["origin"] != UPLOAD_ORIGIN:
+                source["supersededAt"] = source["supersededAt"] or now
+        return result
+
+    def in_use(self) -> set[str]:
+        """Get the IDs of documents read by tasks that are still running."""
+        return {doc_id for _, inputs, _ in self._tasks.values() for doc_id in inputs}
+
+    def pin(self, document_id: str) -> TrackedDocument:
+        """
+        Protect a document from collection.
+
+        Documents not created through this server are tracked on first pin.
+        """
+        document = self._documents.get(document_id) or self._add(
+            document_id, "external", None, []
+        )
+        document["pinned"] = True
+        return document
+
+    def unpin(self, document_id: str) -> Optional[TrackedDocument]:
+        """Allow a pinned document to be collected again."""
+        document = self._documents.get(document_id)
+        if document is not None:
+            document["pinned"] = False
+        return document
+
+    def request_delete(self, document_id: str) -> None:
+        """Queue a tracked document for deletion on the next collection."""
+        document = self._documents.get(document_id)
+        if document is not None:
+            document["deleteRequested"] = True
+
+    def abandon(self, call: CallDocuments, shared_tasks: Container[str] = ()) -> list[str]:
+        """
+        Queue deletion of everything a cancelled call created.
+
+        Uploads and the results of finished tasks are queued now; results of
+        tasks still running are queued when record_task_finished sees them.
+        Uploads read by a running task stay in use until it finishes.
+
+        Args:
+            call: Record from track_call()
+            shared_tasks: Tasks other calls are also waiting for, which are kept
+
+        Returns:
+            IDs of the call's tasks that are still running
+        """
+        for document_id in call.uploads:
+            self.request_delete(document_id)
+
+        running = []
+        for task_id in call.tasks:
+            if task_id in shared_tasks:
+                continue
+            if task_id in self._tasks:
+                self._abandoned.add(task_id)
+                running.append(task_id)
+            else:
+                for document in self._documents.values():
+                    if document["taskId"] == task_id:
+                        document["deleteRequested"] = True
+        return running
+
+    def keep_results(self, task_id: str) -> None:
+        """Undo abandon() for a task whose result another call turned out to need."""
+        self._abandoned.discard(task_id)
+        for document in self._documents.values():
+            if document["taskId"] == task_id:
+                document["deleteRequested"] = False
+
+    def forget(self, document_id: str) -> None:
+        """Stop tracking a document (after it has been deleted)."""
+        self._documents.pop(document_id, None)
+
+    def expire_tasks(self, before: float) -> list[str]:
+        """
+        Stop tracking tasks submitted before a time that nobody polled to the end.
+
+        Their inputs are no longer held in use, and a result they may still
+        produce is not recorded.
+
+        Args:
+            before: Submission time cutoff (seconds since the epoch)
+
+        Returns:
+            IDs of the tasks dropped
+        """
+        expired = [
+            task_id
+            for task_id, (_, _, submitted_at) in self._tasks.items()
+            if submitted_at < before
+        ]
+        for task_id in expired:
+            del self._tasks[task_id]
+            self._abandoned.discard(task_id)
+        return expired
+
+    def expire(self, before: float) -> list[str]:
+        """
+        Stop tracking documents created before a time, without deleting them.
+
+        Pinned documents, documents queued for deletion and documents read by
+        running tasks are kept. This bounds the registry when nothing collects it.
+
+        Args:
+            before: Creation time cutoff (seconds since the epoch)
+
+        Returns:
+            IDs of the documents dropped
+        """
+        busy = self.in_use()
+        expired = [
+            doc["documentId"]
+            for doc in self._documents.values()
+            if doc["createdAt"] < before
+            and not doc["pinned"]
+            and not doc["deleteRequested"]
+            and doc["documentId"] not in busy
+        ]
+        for document_id in expired:
+            del self._documents[document_id]
+        return expired
+
+    def collectable(
+        self, now: float, ttl: float, superseded_grace: float
+    ) -> list[TrackedDocument]:
+        """
+        Get documents eligible for deletion.
+
+        A document is eligible when it is neither pinned nor in use, and it was
+        explicitly queued for deletion, is older than ttl, or was superseded more
+        than superseded_grace seconds ago.
+
+        Args:
+            now: Current time (seconds since the epoch)
+            ttl: Maximum age of any unpinned document
+            superseded_grace: How long superseded intermediates are kept
+
+        Returns:
+            Eligible documents, oldest first
+        """
+        busy = self.in_use()
+        return [
+            doc
+            for doc in self.all()
+            if not doc["pinned"]
+            and doc["documentId"] not in busy
+            and (
+                doc["deleteRequested"]
+                or now - doc["createdAt"] > ttl
+                or (
+                    doc["supersededAt"] is not None
+                    and now - doc["supersededAt"] > superseded_grace
+                )
+            )
+        ]
+
+    def dumps(self) -> str:
+        """Serialize the tracked documents for write_state()."""
+        return json.dumps(list(self._documents.values()))
+
+    def save(self, path: Path) -> None:
+        """Write the tracked documents to a JSON file."""
+        write_state(path, self.dumps())
+
+    def load(self, path: Path) -> None:
+        """Merge tracked documents from a JSON file written by save()."""
+        if not path.exists():
+            return
+        for document in json.loads(path.read_text()):
+            # Files from before routes were recorded: the first endpoint and credential
+            document.setdefault("endpoint", None)
+            document.setdefault("credential", None)
+            self._documents.setdefault(document["documentId"], document)
+
+
+def write_state(path: Path, state: str) -> None:
+    """
+    Replace a registry file atomically with state from DocumentRegistry.dumps().
+
+    Safe to call off the event loop, as it touches no registry.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(path.name + ".part")
+    partial_path.write_text(state)
+    partial_path.replace(path)
+
+
+__all__ = [
+    "CallDocuments",
+    "DocumentRegistry",
+    "TrackedDocument",
+    "UPLOAD_ORIGIN",
+    "input_document_ids",
+    "track_call",
+    "write_state",
+]
@@ -0,0 +1,147 @@
+"""Latency- and health-aware routing across regional API base URLs."""
+
+import time
+from typing import Any, Optional
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class Endpoint:
+    """One regional API base URL and its measured health."""
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.latency: Optional[float] = None
+        self.measured_at = float("-inf")
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def stats(self, now: float) -> dict[str, Any]:
+        return {
+            "baseUrl": self.base_url,
+            "healthy": self.is_healthy(now),
+            "latencyMs": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutiveFailures": self.consecutive_failures,
+        }
+
+
+class EndpointPool:
+    """
+    Routes requests across regional base URLs.
+
+    Document and task IDs are regional, so every ID is pinned to the endpoint
+    that created it and later requests for it go there. Only new work (uploads
+    and operations without input documents) is routed freely: to the healthy
+    endpoint with the lowest moving-average latency. An endpoint that fails
+    failure_threshold times in a row is skipped for cooldown seconds; latency
+    samples older than probe_interval are refreshed by routing new work to that
+    endpoint once, so a recovered region wins traffic back. IDs not created
+    through this pool (e.g. from an earlier run) go to the first endpoint.
+    """
+
+    def __init__(
+        self,
+        base_urls: list[str],
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        probe_interval: float = 60.0,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            base_urls: API base URLs, the first being the default region
+            failure_threshold: Consecutive failures that mark an endpoint unhealthy
+            cooldown: Seconds an unhealthy endpoint is skipped before it is retried
+            probe_interval: Seconds after which a latency sample is considered stale
+        """
+        if not base_urls:
+            raise ValueError("At least one base URL is required")
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self._pins: dict[str, Endpoint] = {}
+
+    @property
+    def primary(self) -> Endpoint:
+        """The default endpoint, used for IDs this pool did not create."""
+        return self.endpoints[0]
+
+    def choose(self) -> Endpoint:
+        """Pick the endpoint for new work."""
+        if len(self.endpoints) == 1:
+            return self.primary
+
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.is_healthy(now)]
+        if not healthy:
+            # Everything is degraded: use whichever comes out of cooldown first
+            return min(self.endpoints, key=lambda endpoint: endpoint.unhealthy_until)
+
+        for endpoint in healthy:
+            if now - endpoint.measured_at > self.probe_interval:
+                # Send one request to refresh the sample, not every request until it returns
+                endpoint.measured_at = now
+                return endpoint
+        return min(
+            healthy,
+            key=lambda endpoint: float("inf") if endpoint.latency is None else endpoint.latency,
+        )
+
+    def endpoint_for(self, resource_id: Optional[str]) -> Endpoint:
+        """Get the endpoint a document or task ID belongs to."""
+        if resource_id is None:
+            return self.primary
+        return self._pins.get(resource_id, self.primary)
+
+    def pin(self, resource_id: str, endpoint: Endpoint) -> None:
+        """Record that a document or task ID was created on endpoint."""
+        if len(self.endpoints) > 1:
+            self._pins[resource_id] = endpoint
+
+    def unpin(self, resource_id: str) -> None:
+        """Forget the endpoint of a deleted document or finished task."""
+        self._pins.pop(resource_id, None)
+
+    def record(self, endpoint: Endpoint, latency: float, ok: bool) -> None:
+        """
+        Record the outcome of a request.
+
+        Args:
+            endpoint: Endpoint the request went to
+            latency: Seconds until the response headers arrived (or the error)
+            ok: False for network errors, timeouts and 5xx responses
+        """
+        now = time.monotonic()
+        endpoint.requests += 1
+        if ok:
+            endpoint.consecutive_failures = 0
+            endpoint.unhealthy_until = 0.0
+            endpoint.latency = (
+                latency
+                if endpoint.latency is None
+                else LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * endpoint.latency
+            )
+            endpoint.measured_at = now
+        else:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.unhealthy_until = now + self.cooldown
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get per-endpoint health and latency."""
+        now = time.monotonic()
+        return [endpoint.stats(now) for endpoint in self.endpoints]
+
+
+__all__ = ["Endpoint", "EndpointPool"]
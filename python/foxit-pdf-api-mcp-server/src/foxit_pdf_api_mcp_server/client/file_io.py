@@ -0,0 +1,166 @@
+"""File I/O on a bounded thread pool, so disk access never blocks the event loop.
+
+Every read, write, open and close runs on a shared pool of a few worker
+threads. Large files are read and written in chunks, one pool call per
+chunk, so a slow disk delays only the transfer using it while timers, task
+polls and other tool calls keep running.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Callable, Optional, Protocol, TypeVar, Union
+
+T = TypeVar("T")
+
+# Worker threads used unless set_max_workers() says otherwise
+DEFAULT_WORKERS = 4
+
+# Bytes per read when streaming a file
+CHUNK_SIZE = 1024 * 1024
+
+_max_workers = DEFAULT_WORKERS
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class SeekableReader(Protocol):
+    """Binary file object that can be read in chunks and rewound, like an open file."""
+
+    def read(self, size: int = -1, /) -> bytes: ...
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET, /) -> int: ...
+
+    def tell(self) -> int: ...
+
+
+def set_max_workers(workers: int) -> None:
+    """
+    Set the number of file I/O worker threads.
+
+    Call before the first file operation; a pool already started keeps
+    serving work that was queued on it, and new work goes to a new pool.
+
+    Args:
+        workers: Worker threads
+    """
+    global _max_workers, _executor
+    _max_workers = workers
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="foxit-file-io")
+    return _executor
+
+
+async def run(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking file operation on the file I/O pool.
+
+    Args:
+        fn: Blocking function, e.g. Path.mkdir or shutil.copyfile
+        *args: Its positional arguments
+        **kwargs: Its keyword arguments
+
+    Returns:
+        What fn returned
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool(), functools.partial(fn, *args, **kwargs))
+
+
+class AsyncFile:
+    """A binary file whose operations run on the file I/O pool."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        """
+        Wrap an open binary file.
+
+        Args:
+            file: File object; closed by close()
+        """
+        self.file = file
+
+    async def read(self, size: int = -1) -> bytes:
+        return await run(self.file.read, size)
+
+    async def readline(self) -> bytes:
+        return await run(self.file.readline)
+
+    async def write(self, data: bytes) -> int:
+        return await run(self.file.write, data)
+
+    async def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return await run(self.file.seek, offset, whence)
+
+    async def close(self) -> None:
+        await run(self.file.close)
+
+    async def __aenter__(self) -> "AsyncFile":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+async def open_file(path: Union[str, Path], mode: str = "rb") -> AsyncFile:
+    """
+    Open a file in binary mode on the file I/O pool.
+
+    Args:
+        path: File path
+        mode: Binary open mode ("rb", "wb", "ab", ...)
+
+    Returns:
+        The open file; use it with "async with" or close() it
+    """
+    return AsyncFile(await run(open, path, mode))
+
+
+async def iter_file(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read a file in chunks.
+
+    Args:
+        path: File path
+        chunk_size: Bytes per chunk
+
+    Yields:
+        Chunks of file content
+    """
+    async with await open_file(path) as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+async def write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path, creating its directory."""
+    await run(_write_bytes, path, data)
+
+
+async def write_text(path: Path, text: str) -> None:
+    """Write UTF-8 text to path, creating its directory."""
+    await write_bytes(path, text.encode("utf-8"))
+
+
+__all__ = [
+    "AsyncFile",
+    "SeekableReader",
+    "iter_file",
+    "open_file",
+    "run",
+    "set_max_workers",
+    "write_bytes",
+    "write_text",
+]
@@ -1,8 +1,71 @@
-from typing import Any, Optional
+import asyncio
+import logging
+import os
+import secrets
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, Union
 
 import httpx
 
 from ..types.api import DocumentUploadResponse, OperationResponse, TaskResponse
+from . import deadline, file_io
+from .circuit_breaker import CircuitBreakers, path_template
+from .credential_pool import Credential, CredentialPool
+from .document_registry import DocumentRegistry, input_document_ids
+from .endpoint_pool import Endpoint, EndpointPool
+from .hedging import HedgePolicy
+from .single_flight import OperationCoalescer, SingleFlight, operation_key
+
+logger = logging.getLogger(__name__)
+
+# Chunk size used when streaming document content
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_size(file: file_io.SeekableReader) -> int:
+    """Bytes left from the current position of a seekable file."""
+    position = file.tell()
+    size = file.seek(0, os.SEEK_END) - position
+    file.seek(position)
+    return size
+
+
+class _MultipartUpload:
+    """
+    multipart/form-data body that streams a file through the file I/O pool.
+
+    httpx reads file objects given as files= on the event loop; this body
+    reads each chunk on the pool instead. It restarts from the file's initial
+    position every time it is iterated, so the request can be sent again.
+    """
+
+    def __init__(self, file: file_io.SeekableReader, file_name: str, content_type: str) -> None:
+        self.file = file
+        self.start = file.tell()
+        boundary = secrets.token_hex(16)
+        quoted_name = "".join(
+            {'"': "%22", "\\": "\\\\", "\r": "%0D", "\n": "%0A"}.get(char, char)
+            for char in file_name
+        )
+        self.head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{quoted_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self.tail = f"\r\n--{boundary}--\r\n".encode()
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+    async def headers(self) -> dict[str, str]:
+        size = len(self.head) + await file_io.run(_file_size, self.file) + len(self.tail)
+        return {"Content-Type": self.content_type, "Content-Length": str(size)}
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await file_io.run(self.file.seek, self.start)
+        yield self.head
+        while chunk := await file_io.run(self.file.read, file_io.CHUNK_SIZE):
+            yield chunk
+        yield self.tail
 
 
 class FoxitAPIError(Exception):
@@ -31,6 +94,13 @@ class FoxitAPIError(Exception):
         super().__init__(message)
 
 
+def _deadline_error(stage: str) -> FoxitAPIError:
+    """Error raised when the deadline of the current call runs out."""
+    return FoxitAPIError(
+        message=f"Deadline exceeded while {stage}", code="DEADLINE_EXCEEDED"
+    )
+
+
 class FoxitPDFClient:
     """
     HTTP Client for Foxit PDF API.
@@ -46,6 +116,20 @@ class FoxitPDFClient:
         default_timeout: int = 300,
         poll_interval: int = 2,
         max_retries: int = 3,
+        fallback_base_urls: Optional[list[str]] = None,
+        endpoint_failure_threshold: int = 3,
+        endpoint_cooldown: float = 30.0,
+        extra_credentials: Optional[list[tuple[str, str]]] = None,
+        credential_concurrency: int = 16,
+        breaker_failure_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+        hedge_percentile: float = 95.0,
+        hedge_max_rate: float = 0.05,
+        coalesce_operations: bool = True,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        write_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
     ) -> None:
         """
         Initialize Foxit PDF API client.
@@ -57,6 +141,27 @@ class FoxitPDFClient:
             default_timeout: Default timeout in seconds
             poll_interval: Poll interval in seconds
             max_retries: Maximum number of retries
+            fallback_base_urls: Base URLs of other regions that new work may be
+                routed to when they are faster or base_url is unhealthy
+            endpoint_failure_threshold: Consecutive failures that take a region
+                out of rotation for new work
+            endpoint_cooldown: Seconds before an unhealthy region is tried again
+            extra_credentials: Further (client ID, client secret) pairs that new
+                work is spread across
+            credential_concurrency: Requests in flight allowed per credential
+            breaker_failure_threshold: Consecutive failures of one API path that
+                make further calls to it fail fast
+            breaker_cooldown: Seconds a failing path is rejected before it is probed
+            hedge_percentile: Latency percentile after which a task status poll or
+                download is duplicated
+            hedge_max_rate: Largest fraction of those requests that may be
+                duplicated (0 disables hedging)
+            coalesce_operations: Attach identical concurrent operations to one
+                remote task instead of creating a task per call
+            connect_timeout: Seconds to establish a connection (default: default_timeout)
+            read_timeout: Seconds to wait for each chunk of a response (default: default_timeout)
+            write_timeout: Seconds to send each chunk of a request (default: default_timeout)
+            pool_timeout: Seconds to wait for a free connection (default: default_timeout)
         """
         self.base_url = base_url
         self.client_id = client_id
@@ -64,33 +169,259 @@ class FoxitPDFClient:
         self.default_timeout = default_timeout
         self.poll_interval = poll_interval
         self.max_retries = max_retries
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout or default_timeout,
+            read=read_timeout or default_timeout,
+            write=write_timeout or default_timeout,
+            pool=pool_timeout or default_timeout,
+        )
 
-        # Create async HTTP client
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(default_timeout), follow_redirects=True
+        # One connection pool and concurrency budget per credential set;
+        # documents and tasks stay with the credential that created them
+        self.credentials = CredentialPool(
+            [(client_id, client_secret), *(extra_credentials or [])],
+            max_concurrency=credential_concurrency,
+            timeout=self.timeout,
         )
 
+        # Regional endpoints; documents and tasks stay on the one that created them
+        self.endpoints = EndpointPool(
+            [base_url, *(fallback_base_urls or [])],
+            failure_threshold=endpoint_failure_threshold,
+            cooldown=endpoint_cooldown,
+        )
+
+        # Circuit breakers per region and API path
+        self.breakers = CircuitBreakers(
+            failure_threshold=breaker_failure_threshold, cooldown=breaker_cooldown
+        )
+
+        # Duplicates of slow task status polls and downloads
+        self.hedging = HedgePolicy(percentile=hedge_percentile, max_rate=hedge_max_rate)
+
+        # Identical concurrent operations share one task, and concurrent polls
+        # of a task share one request
+        self.coalesce_operations = coalesce_operations
+        self.operations = OperationCoalescer(max_age=default_timeout)
+        self._status_polls: SingleFlight[TaskResponse] = SingleFlight()
+
+        # Remote documents created through this client
+        self.documents = DocumentRegistry()
+
+        # Callbacks notified of each completed task (see add_result_listener)
+        self._result_listeners: list[Callable[[TaskResponse], None]] = []
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """HTTP client of the primary credential."""
+        return self.credentials.primary.http
+
+    @_client.setter
+    def _client(self, http: httpx.AsyncClient) -> None:
+        self.credentials.primary.http = http
+
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Close the HTTP clients."""
+        await self.credentials.aclose()
+
+    def add_result_listener(self, listener: Callable[[TaskResponse], None]) -> None:
+        """
+        Register a callback for tasks observed as COMPLETED.
+
+        Listeners run synchronously inside get_task_status and must not block;
+        start background work with asyncio instead.
 
-    def _get_auth_headers(self) -> dict[str, str]:
+        Args:
+            listener: Callback receiving the completed task response
+        """
+        self._result_listeners.append(listener)
+
+    def remove_result_listener(self, listener: Callable[[TaskResponse], None]) -> None:
+        """Unregister a callback added with add_result_listener."""
+        if listener in self._result_listeners:
+            self._result_listeners.remove(listener)
+
+    def _get_auth_headers(self, credential: Optional[Credential] = None) -> dict[str, str]:
         """
         Get authentication headers.
 
+        Args:
+            credential: Credential set to authenticate with (default: the primary one)
+
         Returns:
             Dictionary with authentication headers
         """
+        return (credential or self.credentials.primary).headers()
+
+    def _route(self, resource_id: Optional[str] = None) -> dict[str, Any]:
+        """
+        Get the endpoint and credential for a request.
+
+        Args:
+            resource_id: Document or task ID the request is about, or None for
+                new work, which goes to the least loaded healthy route
+
+        Returns:
+            endpoint and credential keyword arguments for _make_request
+        """
+        if resource_id is None:
+            return {"endpoint": self.endpoints.choose(), "credential": self.credentials.choose()}
         return {
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
+            "endpoint": self.endpoints.endpoint_for(resource_id),
+            "credential": self.credentials.credential_for(resource_id),
         }
 
+    def _check_breaker(self, endpoint: Endpoint, method: str, path: str) -> str:
+        """
+        Fail fast if the breaker of an API path is open.
+
+        Args:
+            endpoint: Regional endpoint the request goes to
+            method: HTTP method
+            path: API path
+
+        Returns:
+            Breaker key, to be passed to breakers.after_call once the call ends
+
+        Raises:
+            FoxitAPIError: With code CIRCUIT_OPEN if the path is failing
+        """
+        template = path_template(method, path)
+        key = f"{endpoint.base_url} {template}"
+        retry_in = self.breakers.before_call(key)
+        if retry_in is not None:
+            raise FoxitAPIError(
+                message=(
+                    f"{template} is failing; not calling it for another {retry_in:.0f}s"
+                ),
+                code="CIRCUIT_OPEN",
+            )
+        return key
+
+    async def _get_hedged(self, path: str, route: dict[str, Any]) -> httpx.Response:
+        """
+        Make an idempotent GET request, duplicating it if it is slow.
+
+        Args:
+            path: API path
+            route: Routing from _route()
+
+        Returns:
+            The first HTTP response to arrive
+        """
+        key = f"{route['endpoint'].base_url} {path_template('GET', path)}"
+        return await self.hedging.run(key, lambda: self._make_request("GET", path, **route))
+
+    async def _open_stream_hedged(
+        self, path: str, route: dict[str, Any]
+    ) -> tuple[AsyncExitStack, httpx.Response]:
+        """
+        Open a streaming GET request, duplicating it if its headers are slow.
+
+        Args:
+            path: API path
+            route: Routing from _route()
+
+        Returns:
+            Exit stack that closes the stream, and the response with an unread body
+        """
+
+        async def attempt() -> tuple[AsyncExitStack, httpx.Response]:
+            async with AsyncExitStack() as stack:
+                response = await stack.enter_async_context(
+                    self._stream_request("GET", path, **route)
+                )
+                return stack.pop_all(), response
+
+        async def discard(opened: tuple[AsyncExitStack, httpx.Response]) -> None:
+            await opened[0].aclose()
+
+        key = f"{route['endpoint'].base_url} {path_template('GET', path)}"
+        return await self.hedging.run(key, attempt, discard)
+
+    def _request_timeout(self) -> httpx.Timeout:
+        """
+        Get the per-phase timeouts of a request, cut to the remaining deadline.
+
+        Raises:
+            FoxitAPIError: With code DEADLINE_EXCEEDED if no time is left
+        """
+        left = deadline.remaining()
+        if left is None:
+            return self.timeout
+        if left <= 0:
+            raise _deadline_error("sending a request")
+        return httpx.Timeout(
+            connect=min(self.timeout.connect or left, left),
+            read=min(self.timeout.read or left, left),
+            write=min(self.timeout.write or left, left),
+            pool=min(self.timeout.pool or left, left),
+        )
+
+    @asynccontextmanager
+    async def _slot(self, credential: Credential) -> AsyncIterator[None]:
+        """Hold a concurrency slot of a credential, waiting no longer than the deadline."""
+        try:
+            async with asyncio.timeout(deadline.remaining()):
+                await credential.semaphore.acquire()
+        except TimeoutError as e:
+            raise _deadline_error("waiting for a free request slot") from e
+        try:
+            yield
+        finally:
+            credential.semaphore.release()
+
+    def _pin(self, resource_id: str, route: dict[str, Any]) -> None:
+        """Keep a new document or task ID on the route that created it."""
+        self.endpoints.pin(resource_id, route["endpoint"])
+        self.credentials.pin(resource_id, route["credential"])
+
+    def _unpin(self, resource_id: str) -> None:
+        """Forget the route of a deleted document or finished task."""
+        self.endpoints.unpin(resource_id)
+        self.credentials.unpin(resource_id)
+
+    @staticmethod
+    def _route_labels(route: dict[str, Any]) -> dict[str, str]:
+        """Base URL and client ID of a route, as recorded in the document registry."""
+        return {
+            "endpoint": route["endpoint"].base_url,
+            "credential": route["credential"].client_id,
+        }
+
+    def restore_routes(self) -> list[str]:
+        """
+        Pin documents loaded into the registry to the route they were created on.
+
+        Documents recorded without a route use the primary endpoint and credential.
+
+        Returns:
+            IDs of documents whose endpoint or credential is no longer configured;
+            requests for them would go to the wrong account or region
+        """
+        endpoints = {endpoint.base_url: endpoint for endpoint in self.endpoints.endpoints}
+        credentials = {
+            credential.client_id: credential for credential in self.credentials.credentials
+        }
+        unroutable = []
+        for document in self.documents.all():
+            endpoint = endpoints.get(document["endpoint"] or self.endpoints.primary.base_url)
+            credential = credentials.get(
+                document["credential"] or self.credentials.primary.client_id
+            )
+            if endpoint is None or credential is None:
+                unroutable.append(document["documentId"])
+            else:
+                self._pin(document["documentId"], {"endpoint": endpoint, "credential": credential})
+        return unroutable
+
     async def _make_request(
         self,
         method: str,
         path: str,
         headers: Optional[dict[str, str]] = None,
+        endpoint: Optional[Endpoint] = None,
+        credential: Optional[Credential] = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """
@@ -100,6 +431,8 @@ class FoxitPDFClient:
             method: HTTP method
             path: API path (relative to base_url)
             headers: Additional headers
+            endpoint: Regional endpoint to send to (default: the primary one)
+            credential: Credential set to use (default: the primary one)
             **kwargs: Additional arguments for httpx request
 
         Returns:
@@ -108,18 +441,133 @@ class FoxitPDFClient:
         Raises:
             FoxitAPIError: If request fails
         """
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        request_headers = self._get_auth_headers()
+        endpoint = endpoint or self.endpoints.primary
+        credential = credential or self.credentials.primary
+        url = f"{endpoint.base_url}/{path.lstrip('/')}"
+        request_headers = self._get_auth_headers(credential)
 
         if headers:
             request_headers.update(headers)
 
+        timeout = self._request_timeout()
+        breaker_key = self._check_breaker(endpoint, method, path)
+        response: Optional[httpx.Response] = None
+        outcome: Optional[bool] = None
+        credential.pending += 1
         try:
-            response = await self._client.request(
-                method=method, url=url, headers=request_headers, **kwargs
-            )
+            async with self._slot(credential):
+                started = time.monotonic()
+                try:
+                    # Read timeouts apply per chunk; the deadline bounds the whole response
+                    async with asyncio.timeout(deadline.remaining()):
+                        response = await credential.http.request(
+                            method=method,
+                            url=url,
+                            headers=request_headers,
+                            timeout=timeout,
+                            **kwargs,
+                        )
+                except httpx.RequestError:
+                    # A timeout cut short by the deadline says nothing about health
+                    outcome = None if deadline.expired() else False
+                    raise
+                finally:
+                    if response is not None:
+                        outcome = response.status_code < 500
+                    # A cancelled request (e.g. a hedge that lost) says nothing about health
+                    if outcome is not None:
+                        self.endpoints.record(endpoint, time.monotonic() - started, outcome)
             return response
+        except TimeoutError as e:
+            raise _deadline_error(f"waiting for {path_template(method, path)}") from e
+        except httpx.TimeoutException as e:
+            if deadline.expired():
+                raise _deadline_error(f"waiting for {path_template(method, path)}") from e
+            raise FoxitAPIError(
+                message=f"Request timeout: {str(e)}", code="TIMEOUT"
+            ) from e
+        except httpx.RequestError as e:
+            raise FoxitAPIError(
+                message=f"Request failed: {str(e)}", code="REQUEST_FAILED"
+            ) from e
+        finally:
+            self.breakers.after_call(breaker_key, outcome)
+            credential.pending -= 1
+            if outcome is not None:
+                credential.record(response)
+
+    @asynccontextmanager
+    async def _stream_request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict[str, str]] = None,
+        endpoint: Optional[Endpoint] = None,
+        credential: Optional[Credential] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Make a streaming HTTP request with authentication.
+
+        The response body is not read up front; error responses are read and
+        raised as FoxitAPIError before the response is handed to the caller.
+        The credential's concurrency slot is held until the body is consumed.
+
+        Args:
+            method: HTTP method
+            path: API path (relative to base_url)
+            headers: Additional headers
+            endpoint: Regional endpoint to send to (default: the primary one)
+            credential: Credential set to use (default: the primary one)
+            **kwargs: Additional arguments for httpx request
+
+        Yields:
+            HTTP response with an unread body
+
+        Raises:
+            FoxitAPIError: If request fails
+        """
+        endpoint = endpoint or self.endpoints.primary
+        credential = credential or self.credentials.primary
+        url = f"{endpoint.base_url}/{path.lstrip('/')}"
+        request_headers = self._get_auth_headers(credential)
+
+        if headers:
+            request_headers.update(headers)
+
+        timeout = self._request_timeout()
+        breaker_key = self._check_breaker(endpoint, method, path)
+        response: Optional[httpx.Response] = None
+        outcome: Optional[bool] = None
+        credential.pending += 1
+        try:
+            async with self._slot(credential):
+                started = time.monotonic()
+                try:
+                    async with credential.http.stream(
+                        method=method,
+                        url=url,
+                        headers=request_headers,
+                        timeout=timeout,
+                        **kwargs,
+                    ) as response:
+                        # Latency is measured to the response headers, not the whole body
+                        outcome = response.status_code < 500
+                        self.endpoints.record(endpoint, time.monotonic() - started, outcome)
+                        if response.status_code >= 400:
+                            await response.aread()
+                            await self._handle_response(response)
+                        yield response
+                except httpx.RequestError:
+                    if response is None:
+                        self.endpoints.record(endpoint, time.monotonic() - started, False)
+                    # Also counts a body that fails mid-transfer against the path,
+                    # unless the deadline cut it short
+                    outcome = None if deadline.expired() else False
+                    raise
         except httpx.TimeoutException as e:
+            if deadline.expired():
+                raise _deadline_error(f"waiting for {path_template(method, path)}") from e
             raise FoxitAPIError(
                 message=f"Request timeout: {str(e)}", code="TIMEOUT"
             ) from e
@@ -127,6 +575,11 @@ class FoxitPDFClient:
             raise FoxitAPIError(
                 message=f"Request failed: {str(e)}", code="REQUEST_FAILED"
             ) from e
+        finally:
+            self.breakers.after_call(breaker_key, outcome)
+            credential.pending -= 1
+            if outcome is not None:
+                credential.record(response)
 
     async def _handle_response(self, response: httpx.Response) -> dict[str, Any]:
         """
@@ -180,28 +633,74 @@ class FoxitPDFClient:
                 message=f"Invalid JSON response: {str(e)}", code="INVALID_RESPONSE"
             ) from e
 
+    async def _submit_operation(self, path: str, payload: dict[str, Any]) -> OperationResponse:
+        """
+        Submit a task-based operation.
+
+        While an identical operation (same path and payload) is still running,
+        its taskId is returned instead of submitting another task.
+
+        Args:
+            path: Operation API path
+            payload: JSON request body
+
+        Returns:
+            Operation response with taskId
+        """
+
+        async def submit() -> str:
+            inputs = input_document_ids(payload)
+            # Operations run where their input lives; others are new work
+            route = self._route(inputs[0] if inputs else None)
+            response = await self._make_request("POST", path, json=payload, **route)
+            data = await self._handle_response(response)
+            self._pin(data["taskId"], route)
+            self.documents.record_task(data["taskId"], path, inputs)
+            return str(data["taskId"])
+
+        if not self.coalesce_operations:
+            task_id = await submit()
+        else:
+            try:
+                task_id = await self.operations.submit(operation_key(path, payload), submit)
+            except TimeoutError as e:
+                raise _deadline_error("waiting for a shared submission") from e
+        # Shared submissions run outside the caller's context, so the call is told here
+        self.documents.track_task(task_id)
+        return OperationResponse(taskId=task_id)
+
     # Document operations
 
     async def upload_document(
-        self, file_content: bytes, file_name: str
+        self, file_content: Union[bytes, file_io.SeekableReader], file_name: str
     ) -> DocumentUploadResponse:
         """
         Upload a document.
 
         Args:
-            file_content: File content as bytes
+            file_content: File content as bytes, or a seekable binary file object
+                that is streamed in chunks (read on the file I/O pool) instead of
+                being read into memory
             file_name: Name of the file
 
         Returns:
             Upload response with documentId
         """
-        files = {"file": (file_name, file_content, "application/octet-stream")}
-
+        request: dict[str, Any]
+        if isinstance(file_content, bytes):
+            request = {"files": {"file": (file_name, file_content, "application/octet-stream")}}
+        else:
+            body = _MultipartUpload(file_content, file_name, "application/octet-stream")
+            request = {"content": body, "headers": await body.headers()}
+
+        route = self._route()
         response = await self._make_request(
-            "POST", "/api/documents/upload", files=files
+            "POST", "/api/documents/upload", **request, **route
         )
 
         data = await self._handle_response(response)
+        self._pin(data["documentId"], route)
+        self.documents.record_upload(data["documentId"], **self._route_labels(route))
         return DocumentUploadResponse(documentId=data["documentId"])
 
     async def download_document(
@@ -221,13 +720,41 @@ class FoxitPDFClient:
         if filename:
             path += f"?filename={filename}"
 
-        response = await self._make_request("GET", path)
+        response = await self._get_hedged(path, self._route(document_id))
 
         if response.status_code >= 400:
             await self._handle_response(response)
 
         return response.content
 
+    async def iter_document(
+        self,
+        document_id: str,
+        filename: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a document's content without buffering it in memory.
+
+        Args:
+            document_id: Document ID to download
+            filename: Optional filename for download
+            chunk_size: Size of the chunks to yield
+
+        Yields:
+            Chunks of document content
+        """
+        path = f"/api/documents/{document_id}/download"
+        if filename:
+            path += f"?filename={filename}"
+
+        stack, response = await self._open_stream_hedged(path, self._route(document_id))
+        async with stack:
+            async for chunk in response.aiter_bytes(chunk_size):
+                if deadline.expired():
+                    raise _deadline_error(f"downloading document {document_id}")
+                yield chunk
+
     async def delete_document(self, document_id: str) -> None:
         """
         Delete a document.
@@ -235,23 +762,52 @@ class FoxitPDFClient:
         Args:
             document_id: Document ID to delete
         """
-        response = await self._make_request("DELETE", f"/api/documents/{document_id}")
+        response = await self._make_request(
+            "DELETE", f"/api/documents/{document_id}", **self._route(document_id)
+        )
         if response.status_code >= 400:
             await self._handle_response(response)
+        self.documents.forget(document_id)
+        self._unpin(document_id)
 
     async def get_task_status(self, task_id: str) -> TaskResponse:
         """
         Get task status.
 
+        Concurrent polls of the same task share one request.
+
         Args:
             task_id: Task ID to check
 
         Returns:
             Task status response
         """
-        response = await self._make_request("GET", f"/api/tasks/{task_id}")
+        try:
+            return await self._status_polls.do(task_id, lambda: self._fetch_task_status(task_id))
+        except TimeoutError as e:
+            raise _deadline_error("polling a task") from e
+
+    async def _fetch_task_status(self, task_id: str) -> TaskResponse:
+        route = self._route(task_id)
+        response = await self._get_hedged(f"/api/tasks/{task_id}", route)
         data = await self._handle_response(response)
-        return TaskResponse(**data)
+        task = TaskResponse(**data)
+        if task.get("status") in ("COMPLETED", "FAILED"):
+            self.operations.finished(task_id)
+            self.documents.record_task_finished(
+                task_id, task.get("resultDocumentId"), **self._route_labels(route)
+            )
+            if task.get("resultDocumentId"):
+                self._pin(task["resultDocumentId"], route)
+            # The result document keeps the route; the finished task needs it no more
+            self._unpin(task_id)
+        if task.get("status") == "COMPLETED":
+            for listener in list(self._result_listeners):
+                try:
+                    listener(task)
+                except Exception:
+                    logger.exception("Result listener failed for task %s", task_id)
+        return task
 
     # PDF Creation operations
 
@@ -265,129 +821,81 @@ class FoxitPDFClient:
         Returns:
             Operation response with taskId
         """
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-word",
-            json={"documentId": document_id},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-word", {"documentId": document_id}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_from_excel(self, document_id: str) -> OperationResponse:
         """Convert Excel document to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-excel",
-            json={"documentId": document_id},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-excel", {"documentId": document_id}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_from_ppt(self, document_id: str) -> OperationResponse:
         """Convert PowerPoint document to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-ppt",
-            json={"documentId": document_id},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-ppt", {"documentId": document_id}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_from_html(
         self, document_id: str, config: Optional[dict[str, Any]] = None
     ) -> OperationResponse:
         """Convert HTML to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-html",
-            json={"documentId": document_id, "config": config},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-html", {"documentId": document_id, "config": config}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_from_url(
         self, url: str, config: Optional[dict[str, Any]] = None
     ) -> OperationResponse:
         """Convert URL to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-url",
-            json={"url": url, "config": config},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-url", {"url": url, "config": config}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_from_text(self, document_id: str) -> OperationResponse:
         """Convert text file to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-text",
-            json={"documentId": document_id},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-text", {"documentId": document_id}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_from_image(self, document_id: str) -> OperationResponse:
         """Convert image to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/create/pdf-from-image",
-            json={"documentId": document_id},
+        return await self._submit_operation(
+            "/api/documents/create/pdf-from-image", {"documentId": document_id}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     # PDF Conversion operations
 
     async def pdf_to_word(self, document_id: str, password: Optional[str] = None) -> OperationResponse:
         """Convert PDF to Word."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/convert/pdf-to-word",
-            json={"documentId": document_id, "password": password},
+        return await self._submit_operation(
+            "/api/documents/convert/pdf-to-word", {"documentId": document_id, "password": password}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_to_excel(self, document_id: str, password: Optional[str] = None) -> OperationResponse:
         """Convert PDF to Excel."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/convert/pdf-to-excel",
-            json={"documentId": document_id, "password": password},
+        return await self._submit_operation(
+            "/api/documents/convert/pdf-to-excel", {"documentId": document_id, "password": password}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_to_ppt(self, document_id: str, password: Optional[str] = None) -> OperationResponse:
         """Convert PDF to PowerPoint."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/convert/pdf-to-ppt",
-            json={"documentId": document_id, "password": password},
+        return await self._submit_operation(
+            "/api/documents/convert/pdf-to-ppt", {"documentId": document_id, "password": password}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_to_html(self, document_id: str, password: Optional[str] = None) -> OperationResponse:
         """Convert PDF to HTML."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/convert/pdf-to-html",
-            json={"documentId": document_id, "password": password},
+        return await self._submit_operation(
+            "/api/documents/convert/pdf-to-html", {"documentId": document_id, "password": password}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_to_text(self, document_id: str, password: Optional[str] = None) -> OperationResponse:
         """Convert PDF to text."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/convert/pdf-to-text",
-            json={"documentId": document_id, "password": password},
+        return await self._submit_operation(
+            "/api/documents/convert/pdf-to-text", {"documentId": document_id, "password": password}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_to_image(
         self,
@@ -396,13 +904,10 @@ class FoxitPDFClient:
         password: Optional[str] = None,
     ) -> OperationResponse:
         """Convert PDF to images."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/convert/pdf-to-image",
-            json={"documentId": document_id, "config": config, "password": password},
+            {"documentId": document_id, "config": config, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     # PDF Manipulation operations
 
@@ -417,25 +922,18 @@ class FoxitPDFClient:
         payload: dict[str, Any] = {"documentId": document_id, "splitStrategy": split_strategy, "password": password}
         if config:
             payload.update(config)
-        response = await self._make_request(
-            "POST", "/api/documents/modify/pdf-split", json=payload
-        )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
+        return await self._submit_operation("/api/documents/modify/pdf-split", payload)
 
     async def pdf_merge(
         self,
         documents: list[dict[str, Any]],
     ) -> OperationResponse:
         """Merge PDFs."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/enhance/pdf-combine",
             # Different deployments validate different field names.
-            json={"documents": documents, "documentInfos": documents},
+            {"documents": documents, "documentInfos": documents},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_extract(
         self,
@@ -451,11 +949,7 @@ class FoxitPDFClient:
             "config": config,
             "password": password,
         }
-        response = await self._make_request(
-            "POST", "/api/documents/modify/pdf-extract", json=payload
-        )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
+        return await self._submit_operation("/api/documents/modify/pdf-extract", payload)
 
     async def pdf_compress(
         self,
@@ -464,37 +958,26 @@ class FoxitPDFClient:
         password: Optional[str] = None,
     ) -> OperationResponse:
         """Compress PDF."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/modify/pdf-compress",
-            json={
+            {
                 "documentId": document_id,
                 "compressionLevel": compression_level,
                 "password": password,
             },
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_flatten(self, document_id: str, password: Optional[str] = None) -> OperationResponse:
         """Flatten PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/modify/pdf-flatten",
-            json={"documentId": document_id, "password": password},
+        return await self._submit_operation(
+            "/api/documents/modify/pdf-flatten", {"documentId": document_id, "password": password}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_linearize(self, document_id: str) -> OperationResponse:
         """Linearize PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/optimize/pdf-linearize",
-            json={"documentId": document_id},
+        return await self._submit_operation(
+            "/api/documents/optimize/pdf-linearize", {"documentId": document_id}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_manipulate(
         self,
@@ -511,11 +994,7 @@ class FoxitPDFClient:
             "operations": operations,
             "password": password,
         }
-        response = await self._make_request(
-            "POST", "/api/documents/modify/pdf-manipulate", json=payload
-        )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
+        return await self._submit_operation("/api/documents/modify/pdf-manipulate", payload)
 
     # PDF Security operations
 
@@ -523,25 +1002,18 @@ class FoxitPDFClient:
         self, document_id: str, config: dict[str, Any]
     ) -> OperationResponse:
         """Add password protection to PDF."""
-        response = await self._make_request(
-            "POST",
-            "/api/documents/security/pdf-protect",
-            json={"documentId": document_id, "config": config},
+        return await self._submit_operation(
+            "/api/documents/security/pdf-protect", {"documentId": document_id, "config": config}
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_remove_password(
         self, document_id: str, password: str
     ) -> OperationResponse:
         """Remove password from PDF."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/security/pdf-remove-password",
-            json={"documentId": document_id, "password": password},
+            {"documentId": document_id, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     # PDF Enhancement operations
 
@@ -552,13 +1024,10 @@ class FoxitPDFClient:
         password: Optional[str] = None,
     ) -> OperationResponse:
         """Add watermark to PDF."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/enhance/pdf-watermark",
-            json={"documentId": document_id, "config": config, "password": password},
+            {"documentId": document_id, "config": config, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     # PDF Analysis operations
 
@@ -572,10 +1041,9 @@ class FoxitPDFClient:
         """Compare two PDFs."""
         doc1 = {"documentId": document_id1, "password": password1}
         doc2 = {"documentId": document_id2, "password": password2}
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/analyze/pdf-compare",
-            json={
+            {
                 # Different deployments validate different field names.
                 "document1": doc1,
                 "document2": doc2,
@@ -583,8 +1051,6 @@ class FoxitPDFClient:
                 "compareDocument": doc2,
             },
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_ocr(
         self,
@@ -593,13 +1059,10 @@ class FoxitPDFClient:
         password: Optional[str] = None,
     ) -> OperationResponse:
         """Perform OCR on PDF."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/analyze/pdf-ocr",
-            json={"documentId": document_id, "config": config, "password": password},
+            {"documentId": document_id, "config": config, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def get_pdf_properties(
         self,
@@ -607,25 +1070,19 @@ class FoxitPDFClient:
         config: Optional[dict[str, Any]] = None,
     ) -> OperationResponse:
         """Get PDF properties (task-based; returns resultData)."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/analyze/get-pdf-properties",
-            json={"documentId": document_id, "config": config},
+            {"documentId": document_id, "config": config},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def pdf_structural_analysis(
         self, document_id: str, password: Optional[str] = None
     ) -> OperationResponse:
         """Analyze PDF structure."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/analyze/pdf-structural-analysis",
-            json={"documentId": document_id, "password": password},
+            {"documentId": document_id, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     # PDF Forms operations
 
@@ -633,13 +1090,10 @@ class FoxitPDFClient:
         self, document_id: str, password: Optional[str] = None
     ) -> OperationResponse:
         """Export PDF form data."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/forms/export-pdf-form-data",
-            json={"documentId": document_id, "password": password},
+            {"documentId": document_id, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
 
     async def import_pdf_form_data(
         self,
@@ -648,10 +1102,7 @@ class FoxitPDFClient:
         password: Optional[str] = None,
     ) -> OperationResponse:
         """Import PDF form data."""
-        response = await self._make_request(
-            "POST",
+        return await self._submit_operation(
             "/api/documents/forms/import-pdf-form-data",
-            json={"documentId": document_id, "formData": form_data, "password": password},
+            {"documentId": document_id, "formData": form_data, "password": password},
         )
-        data = await self._handle_response(response)
-        return OperationResponse(taskId=data["taskId"])
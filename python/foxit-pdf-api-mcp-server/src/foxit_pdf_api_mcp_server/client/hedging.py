@@ -0,0 +1,174 @@
+"""Hedged requests: a duplicate of a slow idempotent GET, first answer wins."""
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Latency samples kept per path and needed before hedging starts
+WINDOW_SIZE = 200
+MIN_SAMPLES = 20
+
+# Hedges that may be sent back to back before the rate cap applies
+MAX_BURST = 10.0
+
+
+class _Window:
+    def __init__(self) -> None:
+        self.samples: deque[float] = deque(maxlen=WINDOW_SIZE)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+
+class HedgePolicy:
+    """
+    Decides when to send a hedge request and keeps the hedge rate bounded.
+
+    The hedge delay of a path is the chosen percentile of its recent latencies,
+    so only the slowest requests are duplicated. Every request earns max_rate
+    hedge tokens (up to MAX_BURST) and every hedge spends one, which keeps
+    hedges below max_rate of all requests however slow the API gets.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_rate: float = 0.05,
+        min_delay: float = 0.05,
+    ) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            max_rate: Largest fraction of requests that may be hedged (0 disables)
+            min_delay: Shortest hedge delay in seconds, whatever the percentile says
+        """
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self._windows: dict[str, _Window] = {}
+        self._tokens = MAX_BURST if max_rate > 0 else 0.0
+
+    def _window(self, key: str) -> _Window:
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window()
+        return window
+
+    def delay(self, key: str) -> Optional[float]:
+        """
+        Get how long to wait for an answer before hedging.
+
+        Args:
+            key: Path template of the request
+
+        Returns:
+            Seconds, or None if the path has too few samples or hedging is off
+        """
+        if self.max_rate <= 0:
+            return None
+        window = self._window(key)
+        if len(window.samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(window.samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+
+    def record(self, key: str, latency: float) -> None:
+        """Record the latency of an answered request and earn hedge budget."""
+        window = self._window(key)
+        window.samples.append(latency)
+        window.requests += 1
+        self._tokens = min(MAX_BURST, self._tokens + self.max_rate)
+
+    def acquire(self, key: str) -> bool:
+        """Spend budget on a hedge; False if the hedge rate cap is reached."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._window(key).hedged += 1
+        return True
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get per-path hedge delay and counts."""
+        return [
+            {
+                "key": key,
+                "requests": window.requests,
+                "hedged": window.hedged,
+                "hedgeWins": window.hedge_wins,
+                "delayMs": (
+                    round(delay * 1000, 1) if (delay := self.delay(key)) is not None else None
+                ),
+            }
+            for key, window in self._windows.items()
+        ]
+
+    async def run(
+        self,
+        key: str,
+        attempt: Callable[[], Awaitable[T]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> T:
+        """
+        Run an idempotent request, hedging it if it is slow.
+
+        Args:
+            key: Path template of the request
+            attempt: Starts one request and returns its answer
+            discard: Releases the answer of a request that finished but lost
+                (e.g. closes a response stream)
+
+        Returns:
+            The first successful answer; if both requests fail, the primary's error
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        delay = self.delay(key)
+        if delay is None:
+            result = await attempt()
+            self.record(key, loop.time() - started)
+            return result
+
+        primary = asyncio.ensure_future(attempt())
+        tasks = [primary]
+        winner: Optional["asyncio.Future[T]"] = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.acquire(key):
+                hedge_started = loop.time()
+                tasks.append(asyncio.ensure_future(attempt()))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        winner = task
+                        break
+                if winner is primary:
+                    self.record(key, loop.time() - started)
+                    return primary.result()
+                if winner is not None:
+                    self._window(key).hedge_wins += 1
+                    self.record(key, loop.time() - hedge_started)
+                    return winner.result()
+            # Every request failed
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Wait for the losers to unwind, releasing any answer they still produced
+            for outcome in await asyncio.gather(
+                *(task for task in tasks if task is not winner), return_exceptions=True
+            ):
+                if discard is not None and not isinstance(outcome, BaseException):
+                    await discard(outcome)
+
+
+__all__ = ["HedgePolicy"]
@@ -0,0 +1,171 @@
+"""Coalescing of identical concurrent API calls into one."""
+
+import asyncio
+import contextvars
+import json
+import time
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from . import deadline
+
+T = TypeVar("T")
+
+
+def operation_key(path: str, payload: dict[str, Any]) -> str:
+    """
+    Get a canonical key for an operation request.
+
+    Keys are equal for requests with the same path and the same payload,
+    whatever the order of its fields; fields set to None are ignored.
+
+    Args:
+        path: Operation API path
+        payload: JSON request body
+
+    Returns:
+        Canonical key
+    """
+
+    def prune(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: prune(v) for k, v in value.items() if v is not None}
+        if isinstance(value, list):
+            return [prune(v) for v in value]
+        return value
+
+    body = json.dumps(prune(payload), sort_keys=True, separators=(",", ":"), default=str)
+    return f"{path} {body}"
+
+
+class SingleFlight(Generic[T]):
+    """
+    Runs one call per key at a time; concurrent callers share its result.
+
+    The shared call runs as its own task in a fresh context, so a caller that
+    is cancelled does not cancel it for the others, and the deadline of the
+    caller that started it does not cut it short for callers with more time.
+    Each caller waits no longer than its own deadline.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, "asyncio.Future[T]"] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a call for key is running."""
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn, or wait for the call already in flight for key.
+
+        Args:
+            key: Call key
+            fn: Makes the call
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            TimeoutError: If the caller's deadline passes before the call ends
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.get_running_loop().create_task(
+                self._call(fn), context=contextvars.Context()
+            )
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+            # Consume the error if every caller was cancelled before it arrived
+            call.add_done_callback(lambda f: f.cancelled() or f.exception())
+        else:
+            self.coalesced += 1
+        async with asyncio.timeout(deadline.remaining()):
+            return await asyncio.shield(call)
+
+    @staticmethod
+    async def _call(fn: Callable[[], Awaitable[T]]) -> T:
+        return await fn()
+
+
+class OperationCoalescer:
+    """
+    Attaches identical concurrent operations to one remote task.
+
+    An operation is in flight from its submission until its task is seen to
+    finish (or max_age passes, for tasks nobody polls to the end). While it is
+    in flight, an identical submission gets the same taskId instead of
+    creating another task, so every caller receives the same result.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            max_age: Seconds after submission an operation stops being shared
+        """
+        self.max_age = max_age
+        self._submissions: SingleFlight[str] = SingleFlight()
+        self._running: dict[str, tuple[str, float]] = {}
+        self._keys: dict[str, str] = {}
+        # Tasks more than one caller attached to, with the time they were shared
+        self._shared: dict[str, float] = {}
+        self.coalesced = 0
+
+    async def submit(self, key: str, submit: Callable[[], Awaitable[str]]) -> str:
+        """
+        Submit an operation unless an identical one is in flight.
+
+        Args:
+            key: Key from operation_key()
+            submit: Submits the operation and returns its taskId
+
+        Returns:
+            taskId of the new or the shared task
+        """
+        now = time.monotonic()
+        for task_id, shared_at in list(self._shared.items()):
+            if now - shared_at > self.max_age:
+                del self._shared[task_id]
+
+        running = self._running.get(key)
+        if running is not None:
+            task_id, submitted_at = running
+            if now - submitted_at < self.max_age:
+                self.coalesced += 1
+                self._shared[task_id] = now
+                return task_id
+            self.finished(task_id)
+
+        async def submit_and_track() -> str:
+            task_id = await submit()
+            self._running[key] = (task_id, time.monotonic())
+            self._keys[task_id] = key
+            return task_id
+
+        follower = self._submissions.in_flight(key)
+        task_id = await self._submissions.do(key, submit_and_track)
+        if follower:
+            self._shared[task_id] = now
+        return task_id
+
+    def finished(self, task_id: str) -> None:
+        """Stop sharing a task that completed or failed."""
+        key = self._keys.pop(task_id, None)
+        if key is not None and self._running.get(key, (None,))[0] == task_id:
+            del self._running[key]
+
+    def is_shared(self, task_id: str) -> bool:
+        """Check whether several callers attached to a task."""
+        return task_id in self._shared
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of shared operations and coalesced submissions."""
+        return {
+            "inFlight": len(self._running),
+            "coalesced": self.coalesced + self._submissions.coalesced,
+        }
+
+
+__all__ = ["OperationCoalescer", "SingleFlight", "operation_key"]
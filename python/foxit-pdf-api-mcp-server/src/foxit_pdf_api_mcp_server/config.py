@@ -2,6 +2,7 @@
 
 import os
 import sys
+from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -11,13 +12,71 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _get_int_env(name: str, default: int, allow_zero: bool = False) -> int:
+    """
+    Read a positive integer setting from the environment.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+        allow_zero: Also accept 0 (e.g. to turn a feature off)
+
+    Returns:
+        Parsed integer value
+
+    Raises:
+        SystemExit: If the value is not a positive integer (or zero, if allowed)
+    """
+    raw = os.getenv(name)
+    if not raw:
+        return default
+
+    kind = "non-negative" if allow_zero else "positive"
+    try:
+        value = int(raw)
+        if value < 0 or (value == 0 and not allow_zero):
+            raise ValueError(f"must be {kind}")
+    except ValueError:
+        print(f"Error: {name} must be a {kind} integer, got: {raw}", file=sys.stderr)
+        sys.exit(1)
+
+    return value
+
+
+def _get_bool_env(name: str, default: bool) -> bool:
+    """
+    Read a boolean setting from the environment.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+
+    Returns:
+        True for 1/true/yes/on, False for anything else
+    """
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     """Configuration for Foxit PDF API MCP Server."""
 
     def __init__(self) -> None:
         """Initialize configuration from environment variables."""
-        # API Base URL
-        self.api_base_url = self._get_api_base_url()
+        # API Base URLs: the first is the default region, the rest are fallbacks
+        self.api_base_urls = self._get_api_base_urls()
+        self.api_base_url = self.api_base_urls[0]
+        self.endpoint_failure_threshold = _get_int_env("FOXIT_ENDPOINT_FAILURE_THRESHOLD", 3)
+        self.endpoint_cooldown = _get_int_env("FOXIT_ENDPOINT_COOLDOWN", 30)
+        self.breaker_failure_threshold = _get_int_env("FOXIT_BREAKER_FAILURE_THRESHOLD", 5)
+        self.breaker_cooldown = _get_int_env("FOXIT_BREAKER_COOLDOWN", 30)
+
+        # Hedging of slow task status polls and downloads (off unless enabled)
+        self.hedge_enabled = _get_bool_env("FOXIT_HEDGE_ENABLED", False)
+        self.hedge_percentile = _get_int_env("FOXIT_HEDGE_PERCENTILE", 95)
+        self.hedge_max_percent = _get_int_env("FOXIT_HEDGE_MAX_PERCENT", 5)
 
         # API Credentials
         self.client_id = os.getenv("FOXIT_CLOUD_API_CLIENT_ID", "")
@@ -32,17 +91,109 @@ class Config:
             )
             sys.exit(1)
 
+        # Further credential sets that new work is spread across
+        self.extra_credentials = self._get_extra_credentials()
+        self.credential_concurrency = _get_int_env("FOXIT_CREDENTIAL_CONCURRENCY", 16)
+
         # Operation settings
         self.default_timeout = 300  # 5 minutes in seconds
         self.poll_interval = 2  # 2 seconds
         self.max_retries = 3
 
-    def _get_api_base_url(self) -> str:
+        # HTTP timeouts per phase, and the end-to-end budget of each tool call
+        self.connect_timeout = _get_int_env("FOXIT_CONNECT_TIMEOUT", 10)
+        self.read_timeout = _get_int_env("FOXIT_READ_TIMEOUT", 60)
+        self.write_timeout = _get_int_env("FOXIT_WRITE_TIMEOUT", 60)
+        self.pool_timeout = _get_int_env("FOXIT_POOL_TIMEOUT", 30)
+        self.tool_deadline = _get_int_env("FOXIT_TOOL_DEADLINE", self.default_timeout)
+        self.bulk_tool_deadline = _get_int_env("FOXIT_BULK_TOOL_DEADLINE", 3600)
+        self.coalesce_operations = _get_bool_env("FOXIT_COALESCE_OPERATIONS", True)
+
+        # Local file handling
+        self.max_upload_bytes = _get_int_env("FOXIT_MAX_UPLOAD_MB", 100) * 1024 * 1024
+        self.file_io_workers = _get_int_env("FOXIT_FILE_IO_WORKERS", 4)
+        self.bulk_concurrency = _get_int_env("FOXIT_BULK_CONCURRENCY", 8)
+
+        # Page-sharded execution of large documents
+        self.shard_concurrency = _get_int_env("FOXIT_SHARD_CONCURRENCY", 4)
+        self.shard_max_attempts = _get_int_env("FOXIT_SHARD_MAX_ATTEMPTS", 3)
+        self.data_dir = Path(
+            os.getenv("FOXIT_MCP_DATA_DIR")
+            or Path.home() / ".foxit-pdf-api-mcp-server"
+        ).expanduser()
+
+        # Remote document garbage collection (off unless enabled)
+        self.gc_enabled = _get_bool_env("FOXIT_GC_ENABLED", False)
+        self.gc_document_ttl = _get_int_env("FOXIT_GC_DOCUMENT_TTL", 3600)
+        self.gc_superseded_grace = _get_int_env("FOXIT_GC_SUPERSEDED_GRACE", 300)
+        self.gc_interval = _get_int_env("FOXIT_GC_INTERVAL", 60)
+        self.gc_concurrency = _get_int_env("FOXIT_GC_CONCURRENCY", 4)
+        self.gc_deletes_per_second = _get_int_env("FOXIT_GC_DELETES_PER_SECOND", 5)
+
+        # Local content-addressed store for downloaded documents (0 turns it off)
+        self.blob_store_max_bytes = (
+            _get_int_env("FOXIT_BLOB_STORE_MAX_MB", 1024, allow_zero=True) * 1024 * 1024
+        )
+        self.blob_store_enabled = self.blob_store_max_bytes > 0
+
+        # Largest part of a document returned by one foxit://documents resource read
+        self.resource_max_read_bytes = (
+            _get_int_env("FOXIT_RESOURCE_MAX_READ_MB", 4) * 1024 * 1024
+        )
+
+        # Cached get_pdf_properties results, so paging through them starts no new task
+        self.properties_cache_size = _get_int_env("FOXIT_PROPERTIES_CACHE_SIZE", 32)
+        self.properties_cache_ttl = _get_int_env("FOXIT_PROPERTIES_CACHE_TTL", 600)
+
+        # Background download of completed results (off unless enabled)
+        self.prefetch_enabled = _get_bool_env("FOXIT_PREFETCH_ENABLED", False)
+        self.prefetch_max_document_bytes = (
+            _get_int_env("FOXIT_PREFETCH_MAX_DOCUMENT_MB", 128) * 1024 * 1024
+        )
+        self.prefetch_ttl = _get_int_env("FOXIT_PREFETCH_TTL", 600)
+        self.prefetch_concurrency = _get_int_env("FOXIT_PREFETCH_CONCURRENCY", 2)
+
+        # Event-loop lag monitoring (off unless enabled)
+        self.loop_monitor_enabled = _get_bool_env("FOXIT_LOOP_MONITOR_ENABLED", False)
+        self.loop_monitor_interval_ms = _get_int_env("FOXIT_LOOP_MONITOR_INTERVAL_MS", 50)
+        self.loop_lag_threshold_ms = _get_int_env("FOXIT_LOOP_LAG_THRESHOLD_MS", 100)
+
+    def _get_extra_credentials(self) -> list[tuple[str, str]]:
         """
-        Get and validate API base URL from environment.
+        Get additional credential sets from environment.
+
+        FOXIT_CLOUD_API_EXTRA_CREDENTIALS holds comma-separated client_id:client_secret pairs.
 
         Returns:
-            Validated API base URL without trailing slashes
+            List of (client ID, client secret) pairs
+
+        Raises:
+            SystemExit: If an entry is not a client_id:client_secret pair
+        """
+        raw = os.getenv("FOXIT_CLOUD_API_EXTRA_CREDENTIALS", "")
+        credentials = []
+        for entry in (part.strip() for part in raw.split(",")):
+            if not entry:
+                continue
+            client_id, _, client_secret = entry.partition(":")
+            if not client_id or not client_secret:
+                print(
+                    "Error: FOXIT_CLOUD_API_EXTRA_CREDENTIALS entries must be "
+                    "client_id:client_secret pairs",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+            credentials.append((client_id, client_secret))
+        return credentials
+
+    def _get_api_base_urls(self) -> list[str]:
+        """
+        Get and validate API base URLs from environment.
+
+        Several regions can be given as a comma-separated list.
+
+        Returns:
+            Validated API base URLs without trailing slashes
 
         Raises:
             SystemExit: If URL is invalid or not provided
@@ -64,17 +215,20 @@ class Config:
             )
             sys.exit(1)
 
+        urls = [part.strip() for part in url.split(",") if part.strip()]
+
         # Validate URL format
-        try:
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                raise ValueError("Invalid URL format")
-        except Exception as e:
-            print(f"Error: Invalid API base URL format: {url}", file=sys.stderr)
-            sys.exit(1)
+        for candidate in urls:
+            try:
+                parsed = urlparse(candidate)
+                if not parsed.scheme or not parsed.netloc:
+                    raise ValueError("Invalid URL format")
+            except Exception as e:
+                print(f"Error: Invalid API base URL format: {candidate}", file=sys.stderr)
+                sys.exit(1)
 
         # Remove trailing slashes
-        return url.rstrip("/")
+        return [candidate.rstrip("/") for candidate in urls]
 
 
 # Global config instance
@@ -2,10 +2,61 @@
 
 import argparse
 import asyncio
+import json
 import os
 import sys
+from pathlib import Path
+
+from .server import client, mcp
+
+def run_watch(args: argparse.Namespace) -> None:
+    """Run hot-folder mode until interrupted."""
+    from .utils.pipeline import load_pipeline
+    from .watch import HotFolderWatcher, run_watcher
+
+    try:
+        steps = load_pipeline(args.pipeline)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Invalid pipeline: {error}")
+
+    watcher = HotFolderWatcher(
+        client,
+        directories=args.directories,
+        steps=steps,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        poll_interval=args.poll_interval,
+        stable_seconds=args.stable_seconds,
+        state_path=args.state_file,
+        recursive=args.recursive,
+        cleanup=not args.keep_remote,
+    )
+    try:
+        asyncio.run(run_watcher(watcher))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_batch_command(args: argparse.Namespace) -> None:
+    """Run a batch manifest and print its summary."""
+    from .batch import BatchRunner, run_batch
+
+    if not args.manifest.is_file():
+        sys.exit(f"Manifest not found: {args.manifest}")
+
+    runner = BatchRunner(
+        client,
+        manifest_path=args.manifest,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        results_path=args.results,
+        cleanup=not args.keep_remote,
+    )
+    summary = asyncio.run(run_batch(runner))
+    print(json.dumps(summary, indent=2))
+    if summary["failed"]:
+        sys.exit(1)
 
-from .server import mcp
 
 #HTTP mode is not yet available. We are currently implementing it
 def main() -> None:
@@ -34,9 +85,92 @@ def main() -> None:
         help="Port to bind to for HTTP transport (default: $SERVER_PORT or 8080)",
     )
 
+    subparsers = parser.add_subparsers(dest="command")
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Run a pipeline on every new file dropped into watched directories",
+    )
+    watch_parser.add_argument("directories", nargs="+", type=Path, help="Directories to watch")
+    watch_parser.add_argument(
+        "--pipeline",
+        required=True,
+        help=(
+            "Pipeline steps as a JSON file or inline JSON array, "
+            'e.g. \'[{"operation": "pdf_ocr"}, {"operation": "pdf_compress", '
+            '"args": {"compression_level": "MEDIUM"}}]\''
+        ),
+    )
+    watch_parser.add_argument(
+        "--output-dir", "-o", required=True, type=Path, help="Directory results are written to"
+    )
+    watch_parser.add_argument(
+        "--workers", type=int, default=4, help="Files processed concurrently (default: 4)"
+    )
+    watch_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between directory scans (default: 2)",
+    )
+    watch_parser.add_argument(
+        "--stable-seconds",
+        type=float,
+        default=5.0,
+        help="Seconds a file must stay unchanged before it is processed (default: 5)",
+    )
+    watch_parser.add_argument(
+        "--state-file",
+        type=Path,
+        help="Progress file used to skip finished files on restart "
+        "(default: OUTPUT_DIR/.foxit-watch-state.jsonl)",
+    )
+    watch_parser.add_argument(
+        "--recursive", action="store_true", help="Also watch subdirectories"
+    )
+    watch_parser.add_argument(
+        "--keep-remote",
+        action="store_true",
+        help="Keep uploaded and intermediate documents on the server",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run a JSONL manifest of operations and exit"
+    )
+    batch_parser.add_argument(
+        "manifest",
+        type=Path,
+        help=(
+            "JSONL manifest; each line names an operation (or steps), an input file "
+            "or documentId, optional args and an optional output path"
+        ),
+    )
+    batch_parser.add_argument(
+        "--concurrency", type=int, default=8, help="Lines processed concurrently (default: 8)"
+    )
+    batch_parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Finished line numbers, used to resume (default: MANIFEST.checkpoint)",
+    )
+    batch_parser.add_argument(
+        "--results",
+        type=Path,
+        help="JSONL result log (default: <manifest name>.results.jsonl)",
+    )
+    batch_parser.add_argument(
+        "--keep-remote",
+        action="store_true",
+        help="Keep uploaded and intermediate documents on the server",
+    )
+
     args = parser.parse_args()
 
-    if args.transport == "stdio":
+    if args.command == "watch":
+        run_watch(args)
+    elif args.command == "batch":
+        run_batch_command(args)
+    elif args.transport == "stdio":
         # Run in stdio mode (default for MCP clients like Claude Desktop)
         asyncio.run(mcp.run())
     elif args.transport == "http":
@@ -0,0 +1,94 @@
+"""FastMCP middleware for Foxit PDF API MCP Server."""
+
+import asyncio
+from typing import Any, Optional
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from .client.deadline import deadline
+from .client.document_registry import track_call
+from .utils.document_gc import DocumentCollector
+
+
+class DeadlineMiddleware(Middleware):
+    """
+    Give every tool call and resource read an end-to-end deadline.
+
+    Uploads, operation submits, task polls and downloads made during the call
+    each use only the time that is left, and fail with DEADLINE_EXCEEDED once
+    it runs out instead of starting work the caller will no longer wait for.
+    Bulk transfers, bulk form filling and page-sharded operations get the
+    longer bulk budget instead.
+    """
+
+    # Tools that always move many documents in one call
+    BULK_TOOLS = frozenset(
+        {"bulk_upload_documents", "bulk_download_documents", "bulk_import_pdf_form_data"}
+    )
+
+    def __init__(self, seconds: float, bulk_seconds: Optional[float] = None) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            seconds: Time budget of each tool call
+            bulk_seconds: Time budget of bulk and sharded tool calls
+                (default: the same as seconds)
+        """
+        self.seconds = seconds
+        self.bulk_seconds = seconds if bulk_seconds is None else bulk_seconds
+
+    def _budget(self, params: Any) -> float:
+        arguments = getattr(params, "arguments", None) or {}
+        if params.name in self.BULK_TOOLS or arguments.get("shardPages"):
+            return self.bulk_seconds
+        return self.seconds
+
+    async def on_call_tool(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        with deadline(self._budget(context.message)):
+            return await call_next(context)
+
+    async def on_read_resource(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        with deadline(self.seconds):
+            return await call_next(context)
+
+
+class CancellationMiddleware(Middleware):
+    """
+    Clean up after tool calls and resource reads the MCP client cancels.
+
+    Cancellation stops task polling and frees the call's request slots right
+    away; the uploads and operation results the call created are then deleted
+    in the background (see DocumentCollector.abandon).
+    """
+
+    def __init__(self, collector: DocumentCollector) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            collector: Collector that deletes what cancelled calls created
+        """
+        self.collector = collector
+
+    async def on_call_tool(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        with track_call() as call:
+            try:
+                return await call_next(context)
+            except asyncio.CancelledError:
+                self.collector.abandon(call)
+                raise
+
+    async def on_read_resource(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        return await self.on_call_tool(context, call_next)
+
+
+__all__ = ["CancellationMiddleware", "DeadlineMiddleware"]
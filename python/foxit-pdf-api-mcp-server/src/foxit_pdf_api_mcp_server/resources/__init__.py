@@ -0,0 +1 @@
+"""MCP resource registration."""
@@ -0,0 +1,162 @@
+"""Foxit documents as MCP resources, read in byte ranges or page slices."""
+
+import codecs
+import re
+from typing import Any, Optional
+
+from fastmcp.resources import ResourceContent, ResourceResult
+
+from ..client import file_io
+from ..config import config
+from ..server import blob_store, client, mcp, prefetcher
+from ..utils import execute_and_wait, fetch_blob
+from ..utils.blob_store import BlobInfo
+
+# Leading bytes of the binary formats the API produces
+_MAGIC = [
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+]
+
+# Bytes inspected to tell text from binary content
+_SNIFF_BYTES = 4096
+
+_PAGE_RANGES = re.compile(r"^\d+(-\d+)?(,\d+(-\d+)?)*$")
+
+
+def _sniff(head: bytes) -> str:
+    """Guess the MIME type of content from its first bytes."""
+    for magic, mime_type in _MAGIC:
+        if head.startswith(magic):
+            return mime_type
+    if b"\x00" not in head:
+        try:
+            # A multi-byte character may be cut at the end of the sample
+            codecs.getincrementaldecoder("utf-8")().decode(head)
+            return "text/plain"
+        except UnicodeDecodeError:
+            pass
+    return "application/octet-stream"
+
+
+def _char_boundary(data: Any, index: int) -> int:
+    """Move index back to the start of the UTF-8 character it falls in."""
+    while 0 < index < len(data) and data[index] & 0xC0 == 0x80:
+        index -= 1
+    return index
+
+
+def _read_range(blob: BlobInfo, offset: int, length: int) -> tuple[bytes, str, int]:
+    """
+    Read part of a stored blob.
+
+    Text is cut at character boundaries, so the slice actually read may start
+    and end a few bytes before the requested one.
+
+    Returns:
+        Content read, MIME type of the whole blob, and the offset read from
+    """
+    with blob_store.mapped(blob) as data:
+        mime_type = _sniff(bytes(data[:_SNIFF_BYTES]))
+        end = min(offset + length, blob["size"])
+        if mime_type == "text/plain":
+            offset = _char_boundary(data, offset)
+            end = _char_boundary(data, end)
+            if end <= offset < blob["size"]:
+                # Range shorter than one character: read that character whole
+                end = offset + 1
+                while end < blob["size"] and data[end] & 0xC0 == 0x80:
+                    end += 1
+        return bytes(data[offset:end]), mime_type, offset
+
+
+async def _page_slice(document_id: str, pages: str) -> BlobInfo:
+    """Get the pages of a PDF as a PDF of their own, cached and held in the blob store."""
+    if not _PAGE_RANGES.match(pages):
+        raise ValueError(f"Invalid pages: {pages!r}; expected ranges such as 1-3,5")
+    slice_id = f"{document_id}?pages={pages}"
+    blob = await file_io.run(blob_store.lookup, slice_id, hold=True)
+    if blob is not None:
+        return blob
+
+    result = await execute_and_wait(
+        client, lambda: client.pdf_extract(document_id, "PAGES", {"pageRanges": pages})
+    )
+    result_id = result.get("resultDocumentId")
+    if not result_id:
+        raise ValueError(f"Extracting pages {pages} of {document_id} produced no document")
+    try:
+        return await blob_store.ingest(slice_id, client.iter_document(result_id), hold=True)
+    finally:
+        # The slice is kept locally; the remote copy is not needed
+        await client.delete_document(result_id)
+
+
+@mcp.resource(
+    "foxit://documents/{documentId}{?offset,length,pages}",
+    name="document",
+    description=(
+        "Content of a Foxit document (an upload or an operation result). Reads up to "
+        "FOXIT_RESOURCE_MAX_READ_MB per request: pass offset and length to read further "
+        "byte ranges, or pages (e.g. 1-3,5) to read only those pages of a PDF. Text "
+        "documents are returned as text, everything else as binary content."
+    ),
+)
+async def read_document(
+    documentId: str,
+    offset: int = 0,
+    length: Optional[int] = None,
+    pages: Optional[str] = None,
+) -> ResourceResult:
+    """
+    Read a document, or part of it, served from the local blob store.
+
+    Documents not in the store yet are downloaded into it first, so later
+    reads of any part are local.
+
+    Args:
+        documentId: Document ID (from upload or operation result)
+        offset: First byte to read
+        length: Bytes to read (default and maximum: FOXIT_RESOURCE_MAX_READ_MB)
+        pages: Page ranges of a PDF to read instead of the whole document
+
+    Returns:
+        The content read; its metadata gives the range read, the total size,
+        and nextOffset while there is more to read
+    """
+    if offset < 0 or (length is not None and length <= 0):
+        raise ValueError("offset must not be negative and length must be positive")
+    limit = min(length or config.resource_max_read_bytes, config.resource_max_read_bytes)
+
+    if pages:
+        blob = await _page_slice(documentId, pages)
+    else:
+        await prefetcher.wait(documentId)
+        blob = await fetch_blob(client, blob_store, documentId)
+    try:
+        data, mime_type, offset = await file_io.run(_read_range, blob, offset, limit)
+    finally:
+        await file_io.run(blob_store.release, blob)
+
+    end = offset + len(data)
+    meta: dict[str, Any] = {
+        "documentId": documentId,
+        "offset": offset,
+        "length": len(data),
+        "totalSize": blob["size"],
+        "sha256": blob["sha256"],
+    }
+    if pages:
+        meta["pages"] = pages
+    if end < blob["size"]:
+        meta["nextOffset"] = end
+
+    if mime_type == "text/plain":
+        # Only the start of the document was checked to be text
+        text = data.decode("utf-8", errors="replace")
+        content = ResourceContent(text, mime_type="text/plain; charset=utf-8")
+    else:
+        content = ResourceContent(data, mime_type=mime_type)
+    return ResourceResult([content], meta=meta)
@@ -1,10 +1,28 @@
 """Foxit PDF API MCP Server setup."""
 
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator
+
 from fastmcp import FastMCP
 
 from .__version__ import __version__
-from .client import FoxitPDFClient
+from .client import FoxitPDFClient, file_io
 from .config import config
+from .middleware import CancellationMiddleware, DeadlineMiddleware
+from .utils.blob_store import BlobStore
+from .utils.document_gc import DocumentCollector
+from .utils.loop_monitor import LoopLagMonitor
+from .utils.result_cache import ResultCache
+from .utils.result_prefetch import ResultPrefetcher
+from .utils.structure_index import StructureIndex
+from .utils.text_index import TextIndex
+
+# Bounded thread pool for all local file reads and writes
+file_io.set_max_workers(config.file_io_workers)
 
 # Create Foxit PDF API client
 client = FoxitPDFClient(
@@ -14,12 +32,96 @@ client = FoxitPDFClient(
     default_timeout=config.default_timeout,
     poll_interval=config.poll_interval,
     max_retries=config.max_retries,
+    fallback_base_urls=config.api_base_urls[1:],
+    endpoint_failure_threshold=config.endpoint_failure_threshold,
+    endpoint_cooldown=config.endpoint_cooldown,
+    extra_credentials=config.extra_credentials,
+    credential_concurrency=config.credential_concurrency,
+    breaker_failure_threshold=config.breaker_failure_threshold,
+    breaker_cooldown=config.breaker_cooldown,
+    hedge_percentile=config.hedge_percentile,
+    hedge_max_rate=config.hedge_max_percent / 100 if config.hedge_enabled else 0.0,
+    coalesce_operations=config.coalesce_operations,
+    connect_timeout=config.connect_timeout,
+    read_timeout=config.read_timeout,
+    write_timeout=config.write_timeout,
+    pool_timeout=config.pool_timeout,
+)
+
+# Local index over structural analysis results
+structure_index = StructureIndex(config.data_dir / "structure_index.sqlite3")
+
+# Local full-text index over pdf_to_text results
+text_index = TextIndex(config.data_dir / "text_index.sqlite3")
+
+# Collector for remote documents created by this server
+collector = DocumentCollector(
+    client,
+    ttl=config.gc_document_ttl,
+    superseded_grace=config.gc_superseded_grace,
+    interval=config.gc_interval,
+    concurrency=config.gc_concurrency,
+    deletes_per_second=config.gc_deletes_per_second,
+    state_path=config.data_dir / "documents.json",
+    delete_expired=config.gc_enabled,
+)
+
+# Local store of downloaded documents, by documentId and content hash. When it is
+# turned off, documents read locally (resources, indexing) still pass through a
+# store in the temp directory that keeps nothing once a call is done with it.
+if config.blob_store_enabled:
+    blob_store = BlobStore(config.data_dir / "blobs", max_bytes=config.blob_store_max_bytes)
+else:
+    blob_store = BlobStore(Path(tempfile.gettempdir()) / f"foxit-blobs-{os.getpid()}", max_bytes=0)
+
+# Full get_pdf_properties results, served page by page
+properties_cache = ResultCache(config.properties_cache_size, config.properties_cache_ttl)
+
+# Background download of completed results into the blob store
+prefetcher = ResultPrefetcher(
+    client,
+    blob_store,
+    max_document_bytes=config.prefetch_max_document_bytes,
+    ttl=config.prefetch_ttl,
+    concurrency=config.prefetch_concurrency,
+)
+
+# Event-loop lag sampler and blocking-call watchdog
+loop_monitor = LoopLagMonitor(
+    interval=config.loop_monitor_interval_ms / 1000,
+    threshold=config.loop_lag_threshold_ms / 1000,
 )
 
+
+@asynccontextmanager
+async def lifespan(server: Any) -> AsyncIterator[None]:
+    """Run background services for the lifetime of the server."""
+    if config.loop_monitor_enabled:
+        loop_monitor.start()
+    collector.load()
+    collector.start()
+    if config.prefetch_enabled and config.blob_store_enabled:
+        client.add_result_listener(prefetcher.schedule)
+    try:
+        yield
+    finally:
+        client.remove_result_listener(prefetcher.schedule)
+        await prefetcher.close()
+        await collector.stop()
+        await loop_monitor.stop()
+        if not config.blob_store_enabled:
+            await file_io.run(shutil.rmtree, blob_store.root, ignore_errors=True)
+
+
 # Create FastMCP server
 mcp = FastMCP(
     name="Foxit PDF API MCP Server",
     version=__version__,
+    lifespan=lifespan,
+    middleware=[
+        DeadlineMiddleware(config.tool_deadline, config.bulk_tool_deadline),
+        CancellationMiddleware(collector),
+    ],
 )
 
 # Import tools to register them (tools use @mcp.tool() decorator)
@@ -46,3 +148,12 @@ from .tools import pdf_analysis  # noqa: E402, F401
 
 # PDF forms tools
 from .tools import pdf_forms  # noqa: E402, F401
+
+# Local document index tools
+from .tools import document_index  # noqa: E402, F401
+
+# Client usage and health tools
+from .tools import diagnostics  # noqa: E402, F401
+
+# Document content resources
+from .resources import documents  # noqa: E402, F401
@@ -0,0 +1,38 @@
+"""Client usage and health tools for Foxit PDF API MCP Server."""
+
+import json
+
+from ..server import client, loop_monitor, mcp
+
+
+@mcp.tool()
+async def get_api_usage_stats() -> str:
+    """Report how API traffic is spread across credential sets and regions.
+
+    Use this tool to check whether throughput is limited by one account's quota
+    (throttled counts and back-off time per credential) or by a slow or failing
+    region (latency and health per base URL), and which API paths are currently
+    failing fast because their circuit breaker is open. Hedging stats show how
+    often slow status polls and downloads were duplicated and the duplicate won;
+    coalesced operations show how many identical concurrent calls shared a task.
+    With FOXIT_LOOP_MONITOR_ENABLED, event-loop lag shows whether latency comes
+    from the server itself blocking its event loop rather than from the API.
+
+    Returns:
+        JSON string with per-credential usage and throttling, per-region latency
+        and health, circuit breaker states, hedging and coalescing counts, and
+        the event-loop lag histogram
+    """
+    return json.dumps(
+        {
+            "success": True,
+            "credentials": client.credentials.stats(),
+            "endpoints": client.endpoints.stats(),
+            "circuitBreakers": client.breakers.stats(),
+            "hedging": client.hedging.stats(),
+            "coalescedOperations": client.operations.stats(),
+            "trackedDocuments": len(client.documents),
+            "eventLoop": loop_monitor.stats(),
+        },
+        indent=2,
+    )
@@ -0,0 +1,258 @@
+"""Local document index tools: index and query results without re-downloading."""
+
+import asyncio
+import json
+import mmap
+from pathlib import Path
+from typing import Optional, Union
+
+from ..client import file_io
+from ..server import blob_store, client, mcp, structure_index, text_index
+from ..utils import fetch_blob
+
+
+def _error_payload(error: Exception, default_code: str) -> str:
+    return json.dumps(
+        {
+            "success": False,
+            "error": str(error),
+            "code": getattr(error, "code", default_code),
+            **({"taskId": getattr(error, "task_id")} if hasattr(error, "task_id") else {}),
+        }
+    )
+
+
+@mcp.tool()
+async def index_structural_analysis(
+    documentId: str,
+    zipPath: Optional[str] = None,
+) -> str:
+    """Build a local, queryable index from a pdf_structural_analysis result.
+
+    The analysis ZIP is downloaded once (or read from zipPath if it was already
+    downloaded), and its JSON element tree is flattened into an on-disk index keyed
+    by element type, page and bounding box. Use query_structural_index afterwards
+    instead of loading the whole JSON tree into context.
+
+    Re-indexing the same documentId replaces the previous index.
+
+    Workflow:
+    1. Upload PDF using upload_document tool
+    2. Run pdf_structural_analysis
+    3. Call this tool with the resultDocumentId
+    4. Query elements with query_structural_index
+
+    Args:
+        document_id: resultDocumentId of the pdf_structural_analysis task (used as index ID)
+        zip_path: Local path to an already-downloaded analysis ZIP (skips the download)
+
+    Returns:
+        JSON string with index summary (element count, page count, element types)
+    """
+    try:
+        if zipPath:
+            info = await asyncio.to_thread(
+                structure_index.build_from_zip, documentId, Path(zipPath), zipPath
+            )
+        else:
+            archive = await fetch_blob(client, blob_store, documentId)
+            try:
+                info = await asyncio.to_thread(
+                    structure_index.build_from_zip,
+                    documentId,
+                    Path(archive["path"]),
+                    f"document:{documentId}",
+                )
+            finally:
+                await file_io.run(blob_store.release, archive)
+
+        return json.dumps(
+            {
+                "success": True,
+                "indexId": info["indexId"],
+                "elementCount": info["elementCount"],
+                "pageCount": info["pageCount"],
+                "typeCounts": info["typeCounts"],
+                "message": (
+                    f"Indexed {info['elementCount']} elements. Query them with "
+                    f"query_structural_index using indexId '{info['indexId']}'"
+                ),
+            }
+        )
+    except Exception as error:
+        return _error_payload(error, "INDEX_FAILED")
+
+
+@mcp.tool()
+async def query_structural_index(
+    indexId: str,
+    types: Optional[list[str]] = None,
+    pageStart: Optional[int] = None,
+    pageEnd: Optional[int] = None,
+    minLevel: Optional[int] = None,
+    maxLevel: Optional[int] = None,
+    bbox: Optional[list[float]] = None,
+    textContains: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> str:
+    """Query a local structural analysis index built by index_structural_analysis.
+
+    Returns only the matching elements, in document order, without re-downloading
+    or re-parsing the analysis result.
+
+    Examples:
+    - Tables on pages 10-20: types=["table"], pageStart=10, pageEnd=20
+    - Headings up to level 2: types=["title", "head"], maxLevel=2
+    - Elements in the top half of page 1: pageStart=1, pageEnd=1, bbox=[0, 0, 612, 396]
+
+    Args:
+        index_id: Index ID returned by index_structural_analysis
+        types: Element types to include (title, head, paragraph, table, image, form, ...)
+        page_start: First page to include (1-based)
+        page_end: Last page to include (inclusive)
+        min_level: Minimum heading level
+        max_level: Maximum heading level; elements without a level (e.g. titles) are kept
+        bbox: Region [x0, y0, x1, y1]; returns elements whose bounding box intersects it
+        text_contains: Case-insensitive text the element must contain
+        limit: Maximum number of elements to return (default: 100)
+        offset: Number of matching elements to skip, for paging (default: 0)
+
+    Returns:
+        JSON string with total match count and the matching elements
+    """
+    try:
+        if await asyncio.to_thread(structure_index.get_info, indexId) is None:
+            raise ValueError(
+                f"No structural index '{indexId}'. Build it with index_structural_analysis first."
+            )
+
+        total, elements = await asyncio.to_thread(
+            structure_index.query,
+            indexId,
+            types=types,
+            page_start=pageStart,
+            page_end=pageEnd,
+            min_level=minLevel,
+            max_level=maxLevel,
+            bbox=bbox,
+            text_contains=textContains,
+            limit=limit,
+            offset=offset,
+        )
+
+        return json.dumps(
+            {
+                "success": True,
+                "indexId": indexId,
+                "total": total,
+                "offset": offset,
+                "count": len(elements),
+                "elements": elements,
+            }
+        )
+    except Exception as error:
+        return _error_payload(error, "QUERY_FAILED")
+
+
+@mcp.tool()
+async def index_text_document(
+    documentId: str,
+    textPath: Optional[str] = None,
+    refresh: bool = False,
+) -> str:
+    """Add a pdf_to_text result to the local full-text search index.
+
+    The text is split into pages and indexed with page-level postings. Indexing is
+    incremental: a documentId that is already indexed is skipped without downloading,
+    and content identical to something already indexed (same SHA-256 hash) is linked
+    to the existing entries instead of being tokenized again.
+
+    Workflow:
+    1. Convert PDFs with pdf_to_text
+    2. Call this tool with each resultDocumentId
+    3. Search across everything indexed with search_text_index
+
+    Args:
+        document_id: resultDocumentId of a pdf_to_text task (or any UTF-8 text document)
+        text_path: Local path to the already-downloaded text (skips the download)
+        refresh: Re-read the text even if this documentId is already indexed
+
+    Returns:
+        JSON string with content hash, page count and whether indexing was skipped
+    """
+    try:
+        if not textPath and not refresh and await asyncio.to_thread(
+            text_index.is_indexed, documentId
+        ):
+            return json.dumps(
+                {
+                    "success": True,
+                    "documentId": documentId,
+                    "skipped": True,
+                    "message": f"Document {documentId} is already indexed",
+                }
+            )
+
+        content: Union[bytes, mmap.mmap]
+        if textPath:
+            content = await file_io.run(Path(textPath).read_bytes)
+            result = await asyncio.to_thread(text_index.ingest, documentId, content, textPath)
+        else:
+            blob = await fetch_blob(client, blob_store, documentId)
+            try:
+                with blob_store.mapped(blob) as content:
+                    result = await asyncio.to_thread(
+                        text_index.ingest, documentId, content, f"document:{documentId}"
+                    )
+            finally:
+                await file_io.run(blob_store.release, blob)
+
+        return json.dumps(
+            {
+                "success": True,
+                **result,
+                "message": (
+                    f"Content of {documentId} was already indexed"
+                    if result["skipped"]
+                    else f"Indexed {result['pageCount']} page(s) of {documentId}"
+                ),
+            }
+        )
+    except Exception as error:
+        return _error_payload(error, "INDEX_FAILED")
+
+
+@mcp.tool()
+async def search_text_index(
+    query: str,
+    documentIds: Optional[list[str]] = None,
+    limit: int = 10,
+) -> str:
+    """Search text indexed with index_text_document.
+
+    Returns pages ranked by relevance (BM25), each with the documentIds it belongs
+    to, the page number and a short snippet around the first match. No documents
+    are downloaded.
+
+    Args:
+        query: Words to search for
+        document_ids: Restrict the search to these documentIds (default: all indexed text)
+        limit: Maximum number of hits to return (default: 10)
+
+    Returns:
+        JSON string with ranked hits
+    """
+    try:
+        hits = await asyncio.to_thread(text_index.search, query, documentIds, limit)
+
+        return json.dumps(
+            {
+                "success": True,
+                "query": query,
+                "count": len(hits),
+                "hits": hits,
+            }
+        )
+    except Exception as error:
+        return _error_payload(error, "SEARCH_FAILED")
@@ -1,12 +1,22 @@
-"""Document lifecycle tools: upload, download, delete."""
+"""Document lifecycle tools: upload, download, delete, and remote cleanup."""
 
-import base64
 import json
+import time
 from pathlib import Path
-from typing import Optional
+from typing import IO, Any, Optional
 from urllib.parse import urlparse
 
-from ..server import client, mcp
+from ..client import file_io
+from ..config import config
+from ..server import blob_store, client, collector, mcp, prefetcher, properties_cache
+from ..utils import (
+    ContentTooLargeError,
+    download_to_path,
+    download_via_store,
+    extract_zip_stream,
+    spool_base64,
+)
+from ..utils.bulk_transfer import download_files, find_files, summarize, upload_files
 
 
 def _error_payload(error: Exception, default_code: str) -> str:
@@ -38,7 +48,7 @@ async def upload_document(
     - Text files
     - HTML files
 
-    Maximum file size: 100MB
+    Maximum file size: 100MB (checked before anything is sent)
 
     Input options (choose one):
     1. resource_uri: MCP resource URI (recommended, e.g., file:///path/to/file.pdf)
@@ -54,11 +64,11 @@ async def upload_document(
     Returns:
         JSON string with success status, documentId, and message
     """
+    file_stream: Optional[IO[bytes]] = None
     try:
-        file_buffer: bytes
         actual_file_name: str
 
-        # Option 1: Read from file:// resource URI
+        # Option 1: Stream from file:// resource URI
         if resourceUri:
             try:
                 if resourceUri.startswith("file://"):
@@ -66,7 +76,8 @@ async def upload_document(
                     # parsed.path is URL-decoded and uses forward slashes
                     file_path = parsed.path.lstrip("/") if parsed.netloc else parsed.path
                     path = Path(file_path)
-                    file_buffer = path.read_bytes()
+                    size = (await file_io.run(path.stat)).st_size
+                    file_stream = await file_io.run(open, path, "rb")
                     actual_file_name = fileName or path.name
                 else:
                     raise ValueError(
@@ -78,20 +89,25 @@ async def upload_document(
                     f"Failed to read resource: {str(e)}. "
                     "Try using fileContent (base64) instead."
                 )
+            if size > config.max_upload_bytes:
+                raise ContentTooLargeError(
+                    f"File is {size} bytes; the upload limit is {config.max_upload_bytes} bytes"
+                )
 
-        # Option 2: Decode base64 content
+        # Option 2: Decode base64 content into a spool that overflows to disk
         elif fileContent:
             if not fileName:
                 raise ValueError("fileName is required when using fileContent")
-            file_buffer = base64.b64decode(fileContent)
+            file_stream = await file_io.run(spool_base64, fileContent, config.max_upload_bytes)
             actual_file_name = fileName
 
         # No valid input provided
         else:
             raise ValueError("Must provide either resourceUri or fileContent")
 
-        # Upload to API
-        response = await client.upload_document(file_buffer, actual_file_name)
+        # Upload to API, streaming the content
+        assert file_stream is not None
+        response = await client.upload_document(file_stream, actual_file_name)
 
         return json.dumps(
             {
@@ -107,6 +123,67 @@ async def upload_document(
 
     except Exception as error:
         return _error_payload(error, "UPLOAD_FAILED")
+    finally:
+        if file_stream is not None:
+            await file_io.run(file_stream.close)
+
+
+@mcp.tool()
+async def bulk_upload_documents(
+    directory: Optional[str] = None,
+    pattern: Optional[str] = None,
+    recursive: bool = False,
+    concurrency: Optional[int] = None,
+    manifestPath: Optional[str] = None,
+) -> str:
+    """
+    Upload many local files in one call.
+
+    Files are selected by directory and/or glob pattern and uploaded concurrently,
+    each streamed from disk. A file that fails is reported in the manifest and does
+    not abort the rest of the batch.
+
+    Examples:
+    - All PDFs in a folder: directory="/scans", pattern="*.pdf"
+    - PDFs in a folder tree: directory="/scans", pattern="*.pdf", recursive=True
+    - A path pattern: pattern="/scans/2024-*/**/*.pdf"
+
+    Args:
+        directory: Directory whose files should be uploaded
+        pattern: Glob pattern, relative to directory if given, otherwise a path pattern
+        recursive: Include files in subdirectories of directory
+        concurrency: Maximum uploads in flight (default: FOXIT_BULK_CONCURRENCY or 8)
+        manifest_path: Optional path to also write the manifest to as JSON
+
+    Returns:
+        JSON string with a manifest of path -> documentId, size and SHA-256 per file,
+        plus per-file errors
+    """
+    try:
+        paths = await file_io.run(find_files, directory, pattern, recursive)
+        if not paths:
+            raise ValueError("No files matched the given directory/pattern")
+
+        items = await upload_files(client, paths, concurrency or config.bulk_concurrency)
+        summary = summarize(items)
+
+        if manifestPath:
+            await file_io.write_text(Path(manifestPath), json.dumps(items, indent=2))
+
+        return json.dumps(
+            {
+                "success": True,
+                **summary,
+                "documents": items,
+                "message": (
+                    f"Uploaded {summary['succeeded']} of {summary['total']} file(s)"
+                    + (f", {summary['failed']} failed" if summary["failed"] else "")
+                ),
+            }
+        )
+
+    except Exception as error:
+        return _error_payload(error, "UPLOAD_FAILED")
 
 
 @mcp.tool()
@@ -114,6 +191,7 @@ async def download_document(
     documentId: str,
     outputPath: str,
     filename: Optional[str] = None,
+    extractZip: bool = False,
 ) -> str:
     """
     Download a document from Foxit PDF API.
@@ -122,31 +200,61 @@ async def download_document(
     - Previously uploaded documents
     - Documents generated from PDF operations (using resultDocumentId from task completion)
 
-    The document will be saved to the specified output path.
+    The document will be saved to the specified output path. Documents downloaded
+    before are served from a local cache instead of the network.
+
+    ZIP results (pdf_split, pdf_to_image, pdf_structural_analysis) can be extracted
+    while they download by setting extractZip. outputPath is then the directory the
+    entries are written to, and the response lists every extracted file with its
+    size and SHA-256 hash.
 
     Args:
         document_id: The document ID to download (from upload or operation result)
         output_path: Absolute path where the downloaded file should be saved
+            (target directory when extract_zip is set)
         filename: Optional filename to use when downloading (defaults to documentId)
+        extract_zip: Extract a ZIP result into output_path instead of saving the archive
 
     Returns:
         JSON string with success status and file information
     """
     try:
-        # Download from API
-        content = await client.download_document(documentId, filename)
+        if extractZip:
+            target_dir = Path(outputPath)
+            entries = await extract_zip_stream(
+                client.iter_document(documentId, filename), target_dir
+            )
+
+            return json.dumps(
+                {
+                    "success": True,
+                    "documentId": documentId,
+                    "outputPath": str(target_dir),
+                    "size": sum(entry["size"] for entry in entries),
+                    "entryCount": len(entries),
+                    "entries": entries,
+                    "message": (
+                        f"Extracted {len(entries)} file(s) from document archive "
+                        f"to {str(target_dir)}"
+                    ),
+                }
+            )
 
-        # Write to output path
         output = Path(outputPath)
-        output.parent.mkdir(parents=True, exist_ok=True)
-        output.write_bytes(content)
+        if config.blob_store_enabled:
+            # Serve from the local blob store, waiting for a prefetch still in progress
+            await prefetcher.wait(documentId)
+            info = await download_via_store(client, blob_store, documentId, output, filename)
+        else:
+            info = await download_to_path(client, documentId, output, filename)
 
         return json.dumps(
             {
                 "success": True,
                 "documentId": documentId,
                 "outputPath": str(output),
-                "size": len(content),
+                "size": info["size"],
+                "sha256": info["sha256"],
                 "message": f"Document downloaded successfully to {str(output)}",
             }
         )
@@ -155,6 +263,74 @@ async def download_document(
         return _error_payload(error, "DOWNLOAD_FAILED")
 
 
+@mcp.tool()
+async def bulk_download_documents(
+    documents: Optional[list[dict[str, Any]]] = None,
+    documentIds: Optional[list[str]] = None,
+    targetDirectory: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    manifestPath: Optional[str] = None,
+) -> str:
+    """
+    Download many documents in one call.
+
+    Documents are downloaded concurrently, with each one streamed straight to disk.
+    A document that fails is reported in the manifest and does not abort the rest of
+    the batch.
+
+    Input options (choose one):
+    1. documents: [{documentId, outputPath, filename?}, ...] for explicit destinations
+    2. documentIds + targetDirectory: each saved as targetDirectory/<documentId>
+
+    Args:
+        documents: Items with documentId, outputPath and optional filename
+        document_ids: Document IDs to save into target_directory
+        target_directory: Directory for document_ids downloads
+        concurrency: Maximum downloads in flight (default: FOXIT_BULK_CONCURRENCY or 8)
+        manifest_path: Optional path to also write the manifest to as JSON
+
+    Returns:
+        JSON string with a manifest of documentId -> path, size and SHA-256,
+        plus per-document errors
+    """
+    try:
+        targets: list[tuple[str, Path, Optional[str]]] = []
+        for item in documents or []:
+            if not item.get("documentId") or not item.get("outputPath"):
+                raise ValueError("Each documents item needs documentId and outputPath")
+            targets.append((item["documentId"], Path(item["outputPath"]), item.get("filename")))
+        if documentIds:
+            if not targetDirectory:
+                raise ValueError("targetDirectory is required when using documentIds")
+            targets.extend(
+                (document_id, Path(targetDirectory) / document_id, None)
+                for document_id in documentIds
+            )
+        if not targets:
+            raise ValueError("Must provide either documents or documentIds")
+
+        items = await download_files(client, targets, concurrency or config.bulk_concurrency)
+        summary = summarize(items)
+
+        if manifestPath:
+            await file_io.write_text(Path(manifestPath), json.dumps(items, indent=2))
+
+        return json.dumps(
+            {
+                "success": True,
+                **summary,
+                "documents": items,
+                "message": (
+                    f"Downloaded {summary['succeeded']} of {summary['total']} document(s)"
+                    + (f", {summary['failed']} failed" if summary["failed"] else "")
+                ),
+            }
+        )
+
+    except Exception as error:
+        return _error_payload(error, "DOWNLOAD_FAILED")
+
+
 @mcp.tool()
 async def delete_document(documentId: str) -> str:
     """
@@ -171,6 +347,7 @@ async def delete_document(documentId: str) -> str:
     """
     try:
         await client.delete_document(documentId)
+        properties_cache.discard(documentId)
 
         return json.dumps(
             {
@@ -182,3 +359,108 @@ async def delete_document(documentId: str) -> str:
 
     except Exception as error:
         return _error_payload(error, "DELETE_FAILED")
+
+
+@mcp.tool()
+async def pin_document(documentId: str) -> str:
+    """
+    Protect a document from automatic cleanup.
+
+    When document cleanup is enabled, uploaded and generated documents are deleted
+    from cloud storage once they expire or are superseded by a later step. Pin any
+    document that is still needed; pinned documents are never collected.
+
+    Args:
+        document_id: The document ID to keep
+
+    Returns:
+        JSON string with success status
+    """
+    client.documents.pin(documentId)
+    await collector.save()
+    return json.dumps(
+        {
+            "success": True,
+            "documentId": documentId,
+            "pinned": True,
+            "message": f"Document {documentId} pinned",
+        }
+    )
+
+
+@mcp.tool()
+async def unpin_document(documentId: str) -> str:
+    """
+    Allow a pinned document to be cleaned up again.
+
+    Args:
+        document_id: The document ID to release
+
+    Returns:
+        JSON string with success status
+    """
+    if client.documents.unpin(documentId) is None:
+        return _error_payload(
+            ValueError(f"Document {documentId} is not tracked"), "UNPIN_FAILED"
+        )
+    await collector.save()
+    return json.dumps(
+        {
+            "success": True,
+            "documentId": documentId,
+            "pinned": False,
+            "message": f"Document {documentId} unpinned",
+        }
+    )
+
+
+@mcp.tool()
+async def list_tracked_documents() -> str:
+    """
+    List the remote documents this server has created.
+
+    Each entry shows its origin (upload or the operation that produced it), the
+    task and input documents it came from, its age, and whether it is pinned,
+    superseded, or queued for deletion.
+
+    Returns:
+        JSON string with tracked documents, oldest first
+    """
+    now = time.time()
+    documents = [
+        {**doc, "ageSeconds": round(now - doc["createdAt"])} for doc in client.documents.all()
+    ]
+    return json.dumps(
+        {
+            "success": True,
+            "count": len(documents),
+            "cleanupEnabled": config.gc_enabled,
+            "documents": documents,
+        }
+    )
+
+
+@mcp.tool()
+async def collect_documents() -> str:
+    """
+    Delete expired and superseded documents now.
+
+    Runs the same cleanup as the background collector: unpinned documents older
+    than the configured TTL, intermediates superseded by a later step, and
+    documents queued for deletion are removed from cloud storage. Documents that
+    running tasks still read are skipped.
+
+    Returns:
+        JSON string with deleted document IDs and any failures
+    """
+    try:
+        result = await collector.collect()
+        return json.dumps(
+            {
+                "success": True,
+                **result,
+                "message": f"Deleted {len(result['deleted'])} document(s)",
+            }
+        )
+    except Exception as error:
+        return _error_payload(error, "COLLECT_FAILED")
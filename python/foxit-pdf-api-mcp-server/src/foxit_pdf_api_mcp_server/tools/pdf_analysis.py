@@ -3,8 +3,9 @@
 import json
 from typing import Optional
 
+from ..config import config
 from ..server import client, mcp
-from ..utils import execute_and_wait
+from ..utils import execute_and_wait, run_sharded
 
 
 def _error_payload(error: Exception, default_code: str) -> str:
@@ -84,6 +85,7 @@ async def pdf_ocr(
     languages: Optional[list[str]] = None,
     pageRanges: Optional[str] = None,
     password: Optional[str] = None,
+    shardPages: Optional[int] = None,
 ) -> str:
     """Perform OCR (Optical Character Recognition) on a PDF document.
 
@@ -115,16 +117,46 @@ async def pdf_ocr(
     2. Call this tool with language configuration
     3. Download searchable PDF using download_document tool
 
+    For long scans, set shardPages to OCR chunks of that many pages in parallel;
+    the chunks are merged back into one PDF in page order. Cannot be combined
+    with pageRanges.
+
     Args:
         document_id: Document ID of the PDF to OCR
         languages: Language codes using standard format (e.g., ["en-US", "es-ES"], default: ["en-US"])
         page_ranges: Pages to OCR (e.g., "1-5,10", default: all pages)
         password: Password if PDF is password-protected
+        shardPages: Pages per chunk for sharded OCR (default: not sharded)
 
     Returns:
         JSON string with OCR result and download information
     """
     try:
+        if shardPages:
+            if pageRanges:
+                raise ValueError("pageRanges cannot be combined with shardPages")
+            sharded = await run_sharded(
+                client,
+                "pdf_ocr",
+                documentId,
+                shardPages,
+                args={"config": {"languages": languages}},
+                password=password,
+                concurrency=config.shard_concurrency,
+                max_attempts=config.shard_max_attempts,
+            )
+            return json.dumps(
+                {
+                    "success": True,
+                    **sharded,
+                    "languages": languages or ["en-US"],
+                    "message": (
+                        f"OCR completed in {sharded['shards']} chunks. Download searchable "
+                        f"PDF using documentId: {sharded['resultDocumentId']}"
+                    ),
+                }
+            )
+
         result = await execute_and_wait(
             client,
             lambda: client.pdf_ocr(
@@ -3,8 +3,9 @@
 import json
 from typing import Optional
 
+from ..config import config
 from ..server import client, mcp
-from ..utils import execute_and_wait
+from ..utils import execute_and_wait, run_sharded
 
 
 def _error_payload(error: Exception, default_code: str) -> str:
@@ -19,7 +20,11 @@ def _error_payload(error: Exception, default_code: str) -> str:
 
 
 @mcp.tool()
-async def pdf_to_word(documentId: str, password: Optional[str] = None) -> str:
+async def pdf_to_word(
+    documentId: str,
+    password: Optional[str] = None,
+    shardPages: Optional[int] = None,
+) -> str:
     """
     Convert PDF to Microsoft Word format.
 
@@ -39,14 +44,42 @@ async def pdf_to_word(documentId: str, password: Optional[str] = None) -> str:
     3. Wait for conversion to complete
     4. Download result using download_document tool with the returned documentId
 
+    For long documents, set shardPages to convert chunks of that many pages in
+    parallel. Word documents cannot be merged, so the result is then one Word
+    document per chunk, in page order (partDocumentIds).
+
     Args:
         documentId: Document ID of the uploaded PDF file
         password: Password if PDF is password-protected
+        shardPages: Pages per chunk for sharded conversion (default: not sharded)
 
     Returns:
         JSON string with success status, taskId, and resultDocumentId
+        (or, when sharded, shards, taskIds and partDocumentIds)
     """
     try:
+        if shardPages:
+            sharded = await run_sharded(
+                client,
+                "pdf_to_word",
+                documentId,
+                shardPages,
+                password=password,
+                concurrency=config.shard_concurrency,
+                max_attempts=config.shard_max_attempts,
+            )
+            if sharded["resultDocumentId"]:
+                message = (
+                    "PDF converted to Word successfully. Download using documentId: "
+                    f"{sharded['resultDocumentId']}"
+                )
+            else:
+                message = (
+                    f"PDF converted to Word in {sharded['shards']} chunks. Download each "
+                    "document in partDocumentIds, in order"
+                )
+            return json.dumps({"success": True, **sharded, "message": message})
+
         result = await execute_and_wait(client, lambda: client.pdf_to_word(documentId, password))
 
         return json.dumps(
@@ -150,6 +183,7 @@ async def pdf_to_ppt(documentId: str, password: Optional[str] = None) -> str:
 async def pdf_to_text(
     documentId: str,
     password: Optional[str] = None,
+    shardPages: Optional[int] = None,
 ) -> str:
     """
     Convert PDF to plain text format.
@@ -164,14 +198,40 @@ async def pdf_to_text(
 
     Maximum file size: 100MB
 
+    For long documents, set shardPages to convert chunks of that many pages in
+    parallel; the chunk texts are concatenated in page order into one result.
+
     Args:
         documentId: Document ID of the uploaded PDF file
         password: Password if PDF is password-protected
+        shardPages: Pages per chunk for sharded conversion (default: not sharded)
 
     Returns:
         JSON string with success status, taskId, and resultDocumentId
+        (taskIds and shards when sharded)
     """
     try:
+        if shardPages:
+            sharded = await run_sharded(
+                client,
+                "pdf_to_text",
+                documentId,
+                shardPages,
+                password=password,
+                concurrency=config.shard_concurrency,
+                max_attempts=config.shard_max_attempts,
+            )
+            return json.dumps(
+                {
+                    "success": True,
+                    **sharded,
+                    "message": (
+                        f"PDF converted to text in {sharded['shards']} chunks. Download "
+                        f"using documentId: {sharded['resultDocumentId']}"
+                    ),
+                }
+            )
+
         result = await execute_and_wait(client, lambda: client.pdf_to_text(documentId, password))
 
         return json.dumps(
@@ -1,10 +1,17 @@
 """PDF Forms tools for Foxit PDF API MCP Server."""
 
 import json
+from pathlib import Path
 from typing import Any, Optional
 
-from ..server import client, mcp
+from ..client import file_io
+from ..config import config
+from ..server import client, collector, mcp
 from ..utils import execute_and_wait
+from ..utils.form_fill import FormFillRunner, load_records, write_zip
+
+# Failed records listed in a bulk fill response; the result log has all of them
+MAX_REPORTED_FAILURES = 100
 
 
 def _error_payload(error: Exception, default_code: str) -> str:
@@ -162,3 +169,120 @@ async def import_pdf_form_data(
         )
     except Exception as error:
         return _error_payload(error, "IMPORT_FORM_FAILED")
+
+
+@mcp.tool()
+async def bulk_import_pdf_form_data(
+    documentId: str,
+    recordsPath: str,
+    outputDirectory: Optional[str] = None,
+    outputZip: Optional[str] = None,
+    recordKey: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    password: Optional[str] = None,
+    resume: bool = True,
+) -> str:
+    """Fill one PDF form template with every record of a CSV or JSONL file.
+
+    Use this instead of calling import_pdf_form_data once per record. The
+    template is uploaded once; records are imported concurrently and each
+    filled form is streamed to disk as soon as it is ready.
+
+    Records file:
+    - JSONL (any extension but .csv): one form data object per line, as for
+      import_pdf_form_data
+    - CSV: one record per row, column headers are field names; dotted headers
+      such as "name.first" become nested fields
+
+    Output options (choose one):
+    1. output_directory: Filled forms are saved as <key>.pdf in this directory
+    2. output_zip: Filled forms are collected in a ZIP archive at this path
+
+    Each filled form is named after the record's recordKey field value, or
+    record-000001.pdf, record-000002.pdf, ... in file order. One result per
+    record, including the error of each failed record, is appended to
+    results.jsonl next to the filled forms (<output_zip>.parts/ until the
+    archive is written).
+
+    Resuming: a failed record does not stop the others. Calling the tool again
+    with the same arguments skips records already filled and retries failed
+    ones. Records not started before the call's time budget ran out are
+    reported as "remaining" and are filled by the next call. The ZIP archive
+    is written, with results.jsonl, once no records remain; the .parts
+    directory is kept while any record has failed, so a later call can retry
+    them.
+
+    Workflow:
+    1. Upload the blank PDF form once using upload_document tool
+    2. Call this tool with its documentId and the records file
+    3. Call again while "remaining" or "failed" is non-zero
+
+    Args:
+        document_id: Document ID of the PDF form template
+        records_path: Local CSV or JSONL file with one record of form data each
+        output_directory: Directory to save filled forms to
+        output_zip: ZIP archive to collect filled forms in
+        record_key: Field whose value names each filled form (default: record number)
+        concurrency: Maximum imports in flight (default: FOXIT_BULK_CONCURRENCY or 8)
+        password: Password if the template is password-protected
+        resume: Skip records filled by an earlier call (default: True); False starts over
+
+    Returns:
+        JSON string with counts of filled, failed, skipped and remaining records,
+        the output location, and the first failed records with their errors
+    """
+    try:
+        if bool(outputDirectory) == bool(outputZip):
+            raise ValueError("Must provide exactly one of outputDirectory or outputZip")
+        records = await file_io.run(load_records, Path(recordsPath).expanduser(), recordKey)
+        if not records:
+            raise ValueError(f"No records found in {recordsPath}")
+
+        zip_path = Path(outputZip).expanduser() if outputZip else None
+        output_dir = (
+            zip_path.with_name(zip_path.name + ".parts")
+            if zip_path
+            else Path(outputDirectory or "").expanduser()
+        )
+        runner = FormFillRunner(
+            client,
+            documentId,
+            records,
+            output_dir,
+            concurrency=concurrency or config.bulk_concurrency,
+            password=password,
+        )
+        try:
+            summary, failures = await runner.run(resume)
+        finally:
+            # Saved results were queued for deletion; delete them outside this call's deadline
+            collector.collect_requested()
+
+        output = {"outputDirectory": str(output_dir), "resultsPath": str(runner.results_path)}
+        if zip_path and not summary["remaining"]:
+            # The archive includes results.jsonl; the directory stays while records failed
+            await write_zip(zip_path, output_dir, remove_directory=not summary["failed"])
+            output = {"outputZip": str(zip_path), **(output if summary["failed"] else {})}
+
+        message = f"Filled {summary['succeeded']} of {summary['total']} form(s)"
+        if summary["skipped"]:
+            message += f", {summary['skipped']} already filled"
+        if summary["failed"]:
+            message += f", {summary['failed']} failed"
+        if summary["remaining"]:
+            message += f", {summary['remaining']} not started in time"
+        if summary["failed"] or summary["remaining"]:
+            message += "; call again with the same arguments to continue"
+
+        return json.dumps(
+            {
+                "success": True,
+                "templateDocumentId": documentId,
+                **summary,
+                **output,
+                "failures": failures[:MAX_REPORTED_FAILURES],
+                "message": message,
+            }
+        )
+    except Exception as error:
+        return _error_payload(error, "IMPORT_FORM_FAILED")
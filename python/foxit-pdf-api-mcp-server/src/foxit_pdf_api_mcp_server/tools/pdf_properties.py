@@ -1,11 +1,14 @@
 """PDF Properties tools for Foxit PDF API MCP Server."""
 
 import json
-from typing import Optional
+from typing import Any, Optional
 
-from ..server import client, mcp
+from ..server import client, mcp, properties_cache
 from ..utils import execute_and_wait
 
+# Per-page entries returned by one call unless pageLimit says otherwise
+DEFAULT_PAGE_LIMIT = 100
+
 
 def _error_payload(error: Exception, default_code: str) -> str:
     return json.dumps(
@@ -18,11 +21,99 @@ def _error_payload(error: Exception, default_code: str) -> str:
     )
 
 
+def _find_page_list(data: dict[str, Any]) -> Optional[tuple[str, ...]]:
+    """Find the per-page list: the longest list of objects under a key naming pages."""
+    best: Optional[tuple[str, ...]] = None
+    best_length = 0
+    stack: list[tuple[tuple[str, ...], dict[str, Any]]] = [((), data)]
+    while stack:
+        path, node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict):
+                stack.append(((*path, key), value))
+            elif (
+                isinstance(value, list)
+                and "page" in key.lower()
+                and all(isinstance(item, dict) for item in value)
+                and len(value) > best_length
+            ):
+                best, best_length = (*path, key), len(value)
+    return best
+
+
+def _get_path(data: Any, path: tuple[str, ...]) -> Any:
+    for key in path:
+        data = data[key]
+    return data
+
+
+def _set_path(data: dict[str, Any], path: tuple[str, ...], value: Any) -> dict[str, Any]:
+    """Copy data with the value at path replaced, leaving the original untouched."""
+    copy = dict(data)
+    copy[path[0]] = value if len(path) == 1 else _set_path(data[path[0]], path[1:], value)
+    return copy
+
+
+def _resolve_field(data: dict[str, Any], field: str) -> Optional[tuple[str, ...]]:
+    """
+    Resolve a field name to its path in the properties.
+
+    A dotted path ("docInfo.pageCount") is used as given. A bare name that is
+    not a top-level key matches the shallowest nested key of that name.
+    """
+    path = tuple(field.split("."))
+    node: Any = data
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            break
+        node = node[key]
+    else:
+        return path
+
+    level: list[tuple[tuple[str, ...], dict[str, Any]]] = [((), data)]
+    while level:
+        for prefix, node in level:
+            if field in node:
+                return (*prefix, field)
+        level = [
+            ((*prefix, key), value)
+            for prefix, node in level
+            for key, value in node.items()
+            if isinstance(value, dict)
+        ]
+    return None
+
+
+def _project(data: dict[str, Any], fields: list[str]) -> tuple[dict[str, Any], list[str]]:
+    """
+    Keep only the given fields, in their original nesting.
+
+    Returns:
+        Projected properties and the fields that were not found
+    """
+    projected: dict[str, Any] = {}
+    missing = []
+    for field in fields:
+        path = _resolve_field(data, field)
+        if path is None:
+            missing.append(field)
+            continue
+        node = projected
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = _get_path(data, path)
+    return projected, missing
+
+
 @mcp.tool()
 async def get_pdf_properties(
     documentId: str,
     includeExtendedInfo: Optional[bool] = None,
     includePageInfo: Optional[bool] = None,
+    fields: Optional[list[str]] = None,
+    pageOffset: int = 0,
+    pageLimit: Optional[int] = None,
+    refresh: bool = False,
 ) -> str:
     """Extract comprehensive properties and metadata from a PDF document.
 
@@ -41,6 +132,15 @@ async def get_pdf_properties(
     Configuration options:
     - includeExtendedInfo: Get detailed metadata (fonts, signatures, encryption details)
     - includePageInfo: Include per-page information (dimensions, rotation, scan detection)
+    - fields: Return only these properties, e.g. ["pageCount", "encryption", "fonts"]
+    - pageOffset / pageLimit: Return a window of the per-page information
+
+    Results can be large for long documents, so ask only for what you need.
+    The full result is cached on the server: further pages, other fields and
+    repeated calls for the same document and options do not start a new task.
+    Per-page information is returned at most 100 pages at a time by default;
+    the "pagination" part of the response gives the total page entries and the
+    nextPageOffset to pass for the next window.
 
     Use cases:
     - Verify PDF structure before processing
@@ -54,34 +154,67 @@ async def get_pdf_properties(
     2. Call this tool with documentId
     3. Receive JSON data with all properties
     4. No download needed - data is returned directly
+    5. For more per-page information, call again with pageOffset=nextPageOffset
 
     Args:
         document_id: Document ID of the PDF to analyze
         include_extended_info: Include detailed metadata (fonts, signatures, encryption, etc.). Default: True
         include_page_info: Include per-page information (dimensions, rotation, scan detection). Default: True
+        fields: Property names to return; a bare name also matches nested keys, and dotted
+            paths (e.g. "docInfo.pageCount") select exactly. Default: all properties
+        page_offset: Index of the first per-page entry to return. Default: 0
+        page_limit: Most per-page entries to return; 0 returns only their count. Default: 100
+        refresh: Ignore the cached result and analyze the document again. Default: False
 
     Returns:
         JSON string containing PDF properties and metadata
     """
     try:
-        result = await execute_and_wait(
-            client,
-            lambda: client.get_pdf_properties(
-                documentId,
-                {
-                    "includeExtendedInfo": True
-                    if includeExtendedInfo is None
-                    else includeExtendedInfo,
-                    "includePageInfo": True if includePageInfo is None else includePageInfo,
-                },
-            ),
+        if pageOffset < 0 or (pageLimit is not None and pageLimit < 0):
+            raise ValueError("pageOffset and pageLimit must not be negative")
+        options = (
+            True if includeExtendedInfo is None else includeExtendedInfo,
+            True if includePageInfo is None else includePageInfo,
         )
 
+        result = None if refresh else properties_cache.get(documentId, *options)
+        cached = result is not None
+        if result is None:
+            result = await execute_and_wait(
+                client,
+                lambda: client.get_pdf_properties(
+                    documentId,
+                    {"includeExtendedInfo": options[0], "includePageInfo": options[1]},
+                ),
+            )
+            properties_cache.put(documentId, *options, value=result)
+
+        properties = result.get("resultData")
+        payload: dict[str, Any] = {"success": True, "taskId": result["taskId"], "cached": cached}
+        if isinstance(properties, dict):
+            page_path = _find_page_list(properties)
+            if page_path is not None:
+                pages = _get_path(properties, page_path)
+                limit = DEFAULT_PAGE_LIMIT if pageLimit is None else pageLimit
+                window = pages[pageOffset : pageOffset + limit]
+                properties = _set_path(properties, page_path, window)
+                end = pageOffset + len(window)
+                payload["pagination"] = {
+                    "field": ".".join(page_path),
+                    "total": len(pages),
+                    "offset": pageOffset,
+                    "returned": len(window),
+                    **({"nextPageOffset": end} if end < len(pages) else {}),
+                }
+            if fields:
+                properties, missing = _project(properties, fields)
+                if missing:
+                    payload["missingFields"] = missing
+
         return json.dumps(
             {
-                "success": True,
-                "taskId": result["taskId"],
-                "properties": result.get("resultData"),
+                **payload,
+                "properties": properties,
                 "message": "PDF properties extracted successfully",
             }
         )
@@ -1,5 +1,25 @@
 """Utilities exported by this package."""
 
+from .base64_spool import ContentTooLargeError, spool_base64
+from .blob_store import BlobInfo, BlobStore
+from .downloads import DownloadInfo, download_to_path, download_via_store, fetch_blob
+from .sharding import ShardedResult, run_sharded
 from .task_poller import execute_and_wait, poll_task_until_complete
+from .zip_extract import ZipEntryInfo, extract_zip_stream
 
-__all__ = ["poll_task_until_complete", "execute_and_wait"]
+__all__ = [
+    "poll_task_until_complete",
+    "execute_and_wait",
+    "DownloadInfo",
+    "download_to_path",
+    "download_via_store",
+    "fetch_blob",
+    "BlobInfo",
+    "BlobStore",
+    "ZipEntryInfo",
+    "extract_zip_stream",
+    "ShardedResult",
+    "run_sharded",
+    "ContentTooLargeError",
+    "spool_base64",
+]
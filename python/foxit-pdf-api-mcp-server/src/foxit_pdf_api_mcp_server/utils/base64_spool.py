@@ -0,0 +1,99 @@
+"""Incremental decoding of base64 upload content into a spooled temporary file."""
+
+import base64
+import binascii
+import tempfile
+from typing import IO
+
+# Decoded content kept in memory before the spool moves to disk
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+# Encoded characters decoded per step (a multiple of 4)
+DECODE_CHUNK_CHARS = 4 * 1024 * 1024
+
+# Characters ignored in the encoded text, e.g. MIME line breaks
+_WHITESPACE = " \t\r\n"
+_STRIP_WHITESPACE = str.maketrans("", "", _WHITESPACE)
+
+
+class ContentTooLargeError(ValueError):
+    """Decoded content would exceed the upload size limit."""
+
+    code = "FILE_TOO_LARGE"
+
+
+def decoded_size(encoded: str) -> int:
+    """
+    Get the decoded size of base64 text without decoding it.
+
+    Args:
+        encoded: Base64 text, optionally with whitespace
+
+    Returns:
+        Size in bytes of the decoded content
+
+    Raises:
+        ValueError: If the text cannot be valid base64
+    """
+    length = len(encoded) - sum(encoded.count(char) for char in _WHITESPACE)
+    if length % 4:
+        raise ValueError("fileContent is not valid base64: length is not a multiple of 4")
+    # Padding may itself be split by whitespace, e.g. "QQ=\n="
+    tail = encoded.rstrip(_WHITESPACE)[-64:].translate(_STRIP_WHITESPACE)
+    padding = tail[-2:].count("=")
+    return length // 4 * 3 - padding
+
+
+def spool_base64(
+    encoded: str,
+    max_size: int,
+    memory_size: int = SPOOL_MEMORY_BYTES,
+) -> IO[bytes]:
+    """
+    Decode base64 text step by step into a spooled temporary file.
+
+    The size limit is checked from the encoded length before anything is
+    decoded. Content up to memory_size stays in memory; larger content
+    overflows to a temporary file, so the decoded bytes never sit in memory
+    next to the encoded text in full.
+
+    Args:
+        encoded: Base64 text, optionally with whitespace
+        max_size: Largest decoded size accepted, in bytes
+        memory_size: Decoded bytes kept in memory before spilling to disk
+
+    Returns:
+        Binary file positioned at the start of the decoded content; the
+        caller must close it
+
+    Raises:
+        ContentTooLargeError: If the decoded content would exceed max_size
+        ValueError: If the text is not valid base64
+    """
+    size = decoded_size(encoded)
+    if size > max_size:
+        raise ContentTooLargeError(
+            f"File is {size} bytes after decoding; the upload limit is {max_size} bytes"
+        )
+
+    spool = tempfile.SpooledTemporaryFile(max_size=memory_size)
+    try:
+        carry = ""
+        for start in range(0, len(encoded), DECODE_CHUNK_CHARS):
+            piece = carry + encoded[start : start + DECODE_CHUNK_CHARS].translate(
+                _STRIP_WHITESPACE
+            )
+            usable = len(piece) - len(piece) % 4
+            try:
+                spool.write(base64.b64decode(piece[:usable], validate=True))
+            except binascii.Error as e:
+                raise ValueError(f"fileContent is not valid base64: {e}") from e
+            carry = piece[usable:]
+        spool.seek(0)
+        return spool
+    except BaseException:
+        spool.close()
+        raise
+
+
+__all__ = ["ContentTooLargeError", "decoded_size", "spool_base64"]
@@ -0,0 +1,345 @@
+"""Content-addressed local store for downloaded documents.
+
+Each distinct content is stored once, named by its SHA-256 hash, and indexed
+by every documentId it was downloaded as. The store keeps to a byte budget by
+evicting the least recently used content; content held by a caller is not
+evicted until it is released. Hits are delivered to a destination by reflink
+where the filesystem supports it, else by copy, so the destination is a file
+of its own that the caller owns. Stored files are read-only.
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional, TypedDict, Union
+
+from ..client import file_io
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Linux FICLONE ioctl: share extents between files on copy-on-write filesystems
+_FICLONE = 0x40049409
+
+# Mode of stored files
+_READ_ONLY = 0o444
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs (last_access);
+CREATE TABLE IF NOT EXISTS blob_documents (
+    document_id TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blob_documents_sha256 ON blob_documents (sha256);
+"""
+
+
+class BlobInfo(TypedDict):
+    """A stored content blob."""
+
+    sha256: str
+    size: int
+    path: str
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """Clone source into target without copying data, if the filesystem allows."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        target.unlink(missing_ok=True)
+        return False
+
+
+class BlobStore:
+    """SQLite-indexed blob directory with a byte budget and LRU eviction."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the blobs and their index (created on first use)
+            max_bytes: Total size of stored content kept before evicting
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Hold counts by sha256 of content in use, which trim() skips
+        self._holds: dict[str, int] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._init_lock:
+            if not self._initialized:
+                (self.root / "tmp").mkdir(parents=True, exist_ok=True)
+                with sqlite3.connect(self.root / "index.sqlite3") as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                self._initialized = True
+        conn = sqlite3.connect(self.root / "index.sqlite3")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def _drop(self, conn: sqlite3.Connection, sha256: str) -> None:
+        conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+        conn.execute("DELETE FROM blob_documents WHERE sha256 = ?", (sha256,))
+        path = self._blob_path(sha256)
+        try:
+            # Read-only files cannot be deleted on Windows
+            path.chmod(0o644)
+        except OSError:
+            pass
+        path.unlink(missing_ok=True)
+
+    def _hold(self, sha256: str) -> None:
+        self._holds[sha256] = self._holds.get(sha256, 0) + 1
+
+    def lookup(self, document_id: str, hold: bool = False) -> Optional[BlobInfo]:
+        """
+        Find the stored content of a document and mark it recently used.
+
+        Content whose file was changed anyway (e.g. after its mode was reset)
+        no longer matches its hash and is dropped.
+
+        Args:
+            document_id: Document ID
+            hold: Keep the content from eviction until release() is called
+
+        Returns:
+            Blob info, or None if the document is not stored
+        """
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute(
+                        "SELECT b.sha256, b.size, b.mtime_ns FROM blob_documents d "
+                        "JOIN blobs b ON b.sha256 = d.sha256 WHERE d.document_id = ?",
+                        (document_id,),
+                    ).fetchone()
+                    if row is None:
+                        return None
+
+                    path = self._blob_path(row["sha256"])
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        stat = None
+                    if (
+                        stat is None
+                        or stat.st_size != row["size"]
+                        or stat.st_mtime_ns != row["mtime_ns"]
+                    ):
+                        self._drop(conn, row["sha256"])
+                        return None
+
+                    conn.execute(
+                        "UPDATE blobs SET last_access = ? WHERE sha256 = ?",
+                        (time.time(), row["sha256"]),
+                    )
+                    if hold:
+                        self._hold(row["sha256"])
+            finally:
+                conn.close()
+        return BlobInfo(sha256=row["sha256"], size=row["size"], path=str(path))
+
+    def _commit(
+        self, document_id: str, temp_path: Path, sha256: str, size: int, hold: bool
+    ) -> BlobInfo:
+        path = self._blob_path(sha256)
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    if path.exists():
+                        # Same content already stored under another documentId
+                        temp_path.unlink(missing_ok=True)
+                    else:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        temp_path.chmod(_READ_ONLY)
+                        temp_path.replace(path)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?)",
+                        (sha256, size, path.stat().st_mtime_ns, time.time()),
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO blob_documents VALUES (?, ?)",
+                        (document_id, sha256),
+                    )
+                    if hold:
+                        self._hold(sha256)
+            finally:
+                conn.close()
+        return BlobInfo(sha256=sha256, size=size, path=str(path))
+
+    async def ingest(
+        self,
+        document_id: str,
+        chunks: AsyncIterator[bytes],
+        max_size: Optional[int] = None,
+        hold: bool = False,
+    ) -> BlobInfo:
+        """
+        Store streamed content as the content of a document.
+
+        Args:
+            document_id: Document ID the content belongs to
+            chunks: Content chunks (e.g. client.iter_document(document_id))
+            max_size: Abort with ValueError once the content exceeds this size
+            hold: Keep the content from eviction until release() is called
+
+        Returns:
+            Info of the stored blob
+        """
+        await file_io.run((self.root / "tmp").mkdir, parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_name = await file_io.run(tempfile.mkstemp, dir=self.root / "tmp")
+        temp_path = Path(temp_name)
+        try:
+            async with file_io.AsyncFile(os.fdopen(fd, "wb")) as output:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise ValueError(f"Document {document_id} exceeds {max_size} bytes")
+                    await output.write(chunk)
+                    digest.update(chunk)
+            return await file_io.run(
+                self._commit, document_id, temp_path, digest.hexdigest(), size, hold
+            )
+        except BaseException:
+            await file_io.run(temp_path.unlink, missing_ok=True)
+            raise
+
+    def _materialize(self, blob: BlobInfo, output_path: Path) -> None:
+        source = Path(blob["path"])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = output_path.with_name(output_path.name + ".part")
+        partial_path.unlink(missing_ok=True)
+        # Never a hardlink: the destination would share the blob's mode, and
+        # eviction or an edit of either name would reach the other
+        if not _reflink(source, partial_path):
+            shutil.copyfile(source, partial_path)
+        partial_path.replace(output_path)
+
+    async def materialize(self, blob: BlobInfo, output_path: Path) -> None:
+        """
+        Place a copy of stored content at output_path.
+
+        The copy is a reflink where the filesystem supports it, so it takes no
+        extra space until one side changes.
+
+        Args:
+            blob: Blob from lookup() or ingest()
+            output_path: Destination file path
+        """
+        await file_io.run(self._materialize, blob, output_path)
+
+    @contextmanager
+    def mapped(self, blob: BlobInfo) -> Iterator[Union[mmap.mmap, bytes]]:
+        """
+        Memory-map stored content read-only for local processing.
+
+        Args:
+            blob: Blob from lookup() or ingest()
+
+        Yields:
+            Read-only memory map of the content (b"" for empty content,
+            which cannot be mapped)
+        """
+        if blob["size"] == 0:
+            yield b""
+            return
+        with open(blob["path"], "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapping
+            finally:
+                mapping.close()
+
+    def release(self, blob: BlobInfo) -> None:
+        """
+        Let go of content held by lookup() or ingest(), then trim the store.
+
+        Args:
+            blob: Blob returned with hold=True
+        """
+        with self._write_lock:
+            count = self._holds.get(blob["sha256"], 0) - 1
+            if count > 0:
+                self._holds[blob["sha256"]] = count
+            else:
+                self._holds.pop(blob["sha256"], None)
+        self.trim()
+
+    def trim(self) -> int:
+        """
+        Evict least recently used content until the store fits its budget.
+
+        Content that is held is skipped, so the store may stay over budget
+        until it is released.
+
+        Returns:
+            Number of bytes evicted
+        """
+        evicted = 0
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    total = conn.execute(
+                        "SELECT COALESCE(SUM(size), 0) FROM blobs"
+                    ).fetchone()[0]
+                    if total <= self.max_bytes:
+                        return 0
+                    for row in conn.execute(
+                        "SELECT sha256, size FROM blobs ORDER BY last_access"
+                    ).fetchall():
+                        if total - evicted <= self.max_bytes:
+                            break
+                        if row["sha256"] in self._holds:
+                            continue
+                        self._drop(conn, row["sha256"])
+                        evicted += row["size"]
+            finally:
+                conn.close()
+        return evicted
+
+    def stats(self) -> dict[str, int]:
+        """Get blob count, documents indexed and bytes stored."""
+        conn = self._connect()
+        try:
+            blobs, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()
+            documents = conn.execute("SELECT COUNT(*) FROM blob_documents").fetchone()[0]
+        finally:
+            conn.close()
+        return {"blobs": blobs, "documents": documents, "bytes": size, "maxBytes": self.max_bytes}
+
+
+__all__ = ["BlobInfo", "BlobStore"]
@@ -0,0 +1,211 @@
+"""Concurrent bulk transfers between local files and Foxit PDF API."""
+
+import asyncio
+import glob
+import hashlib
+from pathlib import Path
+from typing import IO, Any, Optional, TypedDict
+
+from ..client import file_io
+from ..client.foxit_client import FoxitPDFClient
+from .downloads import download_to_path
+
+
+class BulkUploadItem(TypedDict, total=False):
+    """Manifest record for one file of a bulk upload."""
+
+    path: str
+    documentId: str
+    size: int
+    sha256: str
+    error: str
+    code: str
+
+
+class BulkDownloadItem(TypedDict, total=False):
+    """Manifest record for one document of a bulk download."""
+
+    documentId: str
+    path: str
+    size: int
+    sha256: str
+    error: str
+    code: str
+
+
+class _HashingReader:
+    """Binary file wrapper that hashes content as the upload streams it."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        self._file = file
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self.digest.update(data)
+        self.size += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        position = self._file.seek(offset, whence)
+        if position == 0:
+            # The body is being (re)sent from the start
+            self.digest = hashlib.sha256()
+            self.size = 0
+        return position
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+
+def find_files(
+    directory: Optional[str] = None,
+    pattern: Optional[str] = None,
+    recursive: bool = False,
+) -> list[Path]:
+    """
+    Resolve a directory and/or glob pattern to a sorted list of files.
+
+    Args:
+        directory: Directory to take files from
+        pattern: Glob pattern; relative to directory when both are given
+            (e.g. "*.pdf"), otherwise a path pattern (e.g. "/scans/**/*.pdf")
+        recursive: Include files in subdirectories of directory
+
+    Returns:
+        Matching regular files, sorted by path
+
+    Raises:
+        ValueError: If neither directory nor pattern is given, or directory is missing
+    """
+    if directory:
+        root = Path(directory).expanduser()
+        if not root.is_dir():
+            raise ValueError(f"Directory not found: {directory}")
+        glob_pattern = pattern or "*"
+        matches = root.rglob(glob_pattern) if recursive else root.glob(glob_pattern)
+    elif pattern:
+        matches = (
+            Path(match)
+            for match in glob.iglob(str(Path(pattern).expanduser()), recursive=True)
+        )
+    else:
+        raise ValueError("Must provide either directory or pattern")
+
+    return sorted(path for path in matches if path.is_file())
+
+
+async def _upload_one(
+    client: FoxitPDFClient, path: Path, semaphore: asyncio.Semaphore
+) -> BulkUploadItem:
+    async with semaphore:
+        try:
+            async with await file_io.open_file(path) as file:
+                reader = _HashingReader(file.file)
+                response = await client.upload_document(reader, path.name)
+            return BulkUploadItem(
+                path=str(path),
+                documentId=response["documentId"],
+                size=reader.size,
+                sha256=reader.digest.hexdigest(),
+            )
+        except Exception as error:
+            return BulkUploadItem(
+                path=str(path),
+                error=str(error),
+                code=getattr(error, "code", "UPLOAD_FAILED"),
+            )
+
+
+async def upload_files(
+    client: FoxitPDFClient, paths: list[Path], concurrency: int
+) -> list[BulkUploadItem]:
+    """
+    Upload files concurrently, streaming each from disk.
+
+    A failing file is reported in its manifest entry and does not stop the batch.
+
+    Args:
+        client: Foxit PDF client instance
+        paths: Files to upload
+        concurrency: Maximum uploads in flight
+
+    Returns:
+        One manifest entry per path, in the same order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return list(await asyncio.gather(*(_upload_one(client, path, semaphore) for path in paths)))
+
+
+async def _download_one(
+    client: FoxitPDFClient,
+    document_id: str,
+    output_path: Path,
+    filename: Optional[str],
+    semaphore: asyncio.Semaphore,
+) -> BulkDownloadItem:
+    async with semaphore:
+        try:
+            info = await download_to_path(client, document_id, output_path, filename)
+            return BulkDownloadItem(
+                documentId=document_id,
+                path=info["path"],
+                size=info["size"],
+                sha256=info["sha256"],
+            )
+        except Exception as error:
+            return BulkDownloadItem(
+                documentId=document_id,
+                path=str(output_path),
+                error=str(error),
+                code=getattr(error, "code", "DOWNLOAD_FAILED"),
+            )
+
+
+async def download_files(
+    client: FoxitPDFClient,
+    targets: list[tuple[str, Path, Optional[str]]],
+    concurrency: int,
+) -> list[BulkDownloadItem]:
+    """
+    Download documents concurrently, streaming each straight to disk.
+
+    A failing document is reported in its manifest entry and does not stop the batch.
+
+    Args:
+        client: Foxit PDF client instance
+        targets: (documentId, output path, optional download filename) per document
+        concurrency: Maximum downloads (and so connections) in flight
+
+    Returns:
+        One manifest entry per target, in the same order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return list(
+        await asyncio.gather(
+            *(
+                _download_one(client, document_id, path, filename, semaphore)
+                for document_id, path, filename in targets
+            )
+        )
+    )
+
+
+def summarize(items: list[Any]) -> dict[str, int]:
+    """Count succeeded and failed manifest entries."""
+    failed = sum(1 for item in items if "error" in item)
+    return {"total": len(items), "succeeded": len(items) - failed, "failed": failed}
+
+
+__all__ = [
+    "BulkDownloadItem",
+    "BulkUploadItem",
+    "download_files",
+    "find_files",
+    "summarize",
+    "upload_files",
+]
@@ -0,0 +1,278 @@
+"""Background collection of expired and superseded remote documents."""
+
+import asyncio
+import contextvars
+import logging
+import time
+from pathlib import Path
+from typing import Optional, Sequence, TypedDict
+
+from ..client import file_io
+from ..client.document_registry import CallDocuments, write_state
+from ..client.foxit_client import FoxitAPIError, FoxitPDFClient
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionResult(TypedDict):
+    """Outcome of one collection sweep."""
+
+    deleted: list[str]
+    failed: dict[str, str]
+    remaining: int
+
+
+class DocumentCollector:
+    """
+    Deletes documents from the client's registry once they are no longer needed.
+
+    Deletions run concurrently but are started no faster than the configured
+    rate, so cleanup never competes with real work for the API quota. With
+    delete_expired off, background sweeps only stop tracking documents older
+    than ttl, which keeps the registry bounded without deleting anything.
+    """
+
+    def __init__(
+        self,
+        client: FoxitPDFClient,
+        ttl: float,
+        superseded_grace: float,
+        interval: float,
+        concurrency: int,
+        deletes_per_second: float,
+        state_path: Optional[Path] = None,
+        delete_expired: bool = True,
+    ) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            client: Foxit PDF client whose document registry is collected
+            ttl: Maximum age in seconds of any unpinned document
+            superseded_grace: Seconds a superseded intermediate is kept
+            interval: Seconds between background sweeps
+            concurrency: Maximum concurrent delete requests
+            deletes_per_second: Maximum rate at which delete requests are started
+            state_path: File the registry is persisted to between runs
+            delete_expired: Delete expired and superseded documents on each sweep,
+                rather than only forgetting expired ones
+        """
+        self.client = client
+        self.ttl = ttl
+        self.superseded_grace = superseded_grace
+        self.interval = interval
+        self.concurrency = concurrency
+        self.deletes_per_second = deletes_per_second
+        self.state_path = state_path
+        self.delete_expired = delete_expired
+        # Loaded documents whose endpoint or credential is no longer configured
+        self._unroutable: set[str] = set()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._sweep_lock = asyncio.Lock()
+        self._save_lock = asyncio.Lock()
+        self._cleanups: set[asyncio.Task[None]] = set()
+
+    async def _delete(
+        self,
+        document_id: str,
+        semaphore: asyncio.Semaphore,
+        start_at: float,
+    ) -> Optional[str]:
+        async with semaphore:
+            delay = start_at - asyncio.get_running_loop().time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self.client.delete_document(document_id)
+            except FoxitAPIError as error:
+                if error.status_code == 404:
+                    # Already gone remotely; nothing left to collect
+                    self.client.documents.forget(document_id)
+                    return None
+                return str(error)
+        return None
+
+    async def collect(self, requested_only: bool = False) -> CollectionResult:
+        """
+        Delete every collectable document now.
+
+        Args:
+            requested_only: Only delete documents explicitly queued for deletion,
+                ignoring age and supersession
+
+        Returns:
+            IDs deleted, failures by ID, and how many documents are still tracked
+        """
+        async with self._sweep_lock:
+            if requested_only:
+                candidates = self.client.documents.collectable(
+                    time.time(), float("inf"), float("inf")
+                )
+            else:
+                candidates = self.client.documents.collectable(
+                    time.time(), self.ttl, self.superseded_grace
+                )
+            candidates = [doc for doc in candidates if doc["documentId"] not in self._unroutable]
+            semaphore = asyncio.Semaphore(self.concurrency)
+            start = asyncio.get_running_loop().time()
+            spacing = 1.0 / self.deletes_per_second
+
+            errors = await asyncio.gather(
+                *(
+                    self._delete(doc["documentId"], semaphore, start + i * spacing)
+                    for i, doc in enumerate(candidates)
+                )
+            )
+
+            deleted = [
+                doc["documentId"]
+                for doc, error in zip(candidates, errors)
+                if error is None
+            ]
+            failed = {
+                doc["documentId"]: error
+                for doc, error in zip(candidates, errors)
+                if error is not None
+            }
+            await self.save()
+
+        if deleted or failed:
+            logger.info("Collected %d documents, %d failed", len(deleted), len(failed))
+        return CollectionResult(
+            deleted=deleted, failed=failed, remaining=len(self.client.documents)
+        )
+
+    def abandon(self, call: CallDocuments) -> None:
+        """
+        Clean up after a cancelled tool call, in the background.
+
+        The API has no way to cancel a running task, so unfinished tasks of the
+        call are polled until they end (at most the client's default timeout),
+        then its uploads and results are deleted. Its tasks stop being shared, so
+        no later identical request attaches to a result about to be deleted.
+        Tasks that other calls were coalesced onto are left alone, including
+        ones another call attaches to before the cleanup runs. This runs
+        whether or not background collection is enabled.
+
+        Args:
+            call: Record of the call from track_call()
+        """
+        if not call.uploads and not call.tasks:
+            return
+        shared = {task_id for task_id in call.tasks if self.client.operations.is_shared(task_id)}
+        unshared = [task_id for task_id in call.tasks if task_id not in shared]
+        for task_id in unshared:
+            self.client.operations.finished(task_id)
+        running = self.client.documents.abandon(call, shared)
+        self._spawn_cleanup(running, unshared)
+
+    def collect_requested(self) -> None:
+        """
+        Delete the documents queued with request_delete, in the background.
+
+        Deletions are rate limited like any sweep and are not bound by the
+        deadline of the calling tool. This runs whether or not background
+        collection is enabled.
+        """
+        self._spawn_cleanup([])
+
+    def _spawn_cleanup(self, task_ids: list[str], abandoned: Sequence[str] = ()) -> None:
+        # A fresh context, so the calling tool's deadline does not cut the cleanup short
+        cleanup = asyncio.create_task(
+            self._clean_up_requested(task_ids, abandoned), context=contextvars.Context()
+        )
+        self._cleanups.add(cleanup)
+        cleanup.add_done_callback(self._cleanups.discard)
+
+    async def _clean_up_requested(self, task_ids: list[str], abandoned: Sequence[str]) -> None:
+        try:
+            await asyncio.gather(*(self._wait_for_task(task_id) for task_id in task_ids))
+            for task_id in abandoned:
+                # A caller already waiting on the submission attaches only once it returns
+                if self.client.operations.is_shared(task_id):
+                    self.client.documents.keep_results(task_id)
+            await self.collect(requested_only=True)
+        except Exception:
+            logger.exception("Cleanup of queued documents failed")
+
+    async def _wait_for_task(self, task_id: str) -> None:
+        deadline = asyncio.get_running_loop().time() + self.client.default_timeout
+        while asyncio.get_running_loop().time() < deadline:
+            try:
+                task = await self.client.get_task_status(task_id)
+            except FoxitAPIError:
+                return
+            if task.get("status") in ("COMPLETED", "FAILED"):
+                return
+            await asyncio.sleep(self.client.poll_interval)
+
+    async def sweep(self) -> None:
+        """
+        Run one background sweep.
+
+        Tasks nobody polled for longer than ttl stop holding their inputs in
+        use. Then expired documents are deleted, or with delete_expired off,
+        only dropped from the registry.
+        """
+        cutoff = time.time() - self.ttl
+        self.client.documents.expire_tasks(cutoff)
+        if self.delete_expired:
+            await self.collect()
+        elif self.client.documents.expire(cutoff):
+            await self.save()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Document collection failed")
+
+    def load(self) -> None:
+        """Restore documents tracked by a previous run, with the routes they were created on."""
+        if self.state_path is not None:
+            try:
+                self.client.documents.load(self.state_path)
+            except (OSError, ValueError, KeyError):
+                logger.warning("Ignoring unreadable document registry %s", self.state_path)
+        self._unroutable = set(self.client.restore_routes())
+        if self._unroutable:
+            # Deleting them with another account would fail as not found and drop the record
+            logger.warning(
+                "Not collecting %d documents created with an endpoint or credential "
+                "that is no longer configured",
+                len(self._unroutable),
+            )
+
+    async def save(self) -> None:
+        """Persist tracked documents so a restart can still collect them."""
+        if self.state_path is not None:
+            # Serialized on the loop, where the registry is changed; written off it
+            state = self.client.documents.dumps()
+            async with self._save_lock:
+                try:
+                    await file_io.run(write_state, self.state_path, state)
+                except OSError:
+                    logger.warning("Could not save document registry %s", self.state_path)
+
+    def start(self) -> None:
+        """Start background sweeps."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background sweeps and persist the registry."""
+        for cleanup in list(self._cleanups):
+            cleanup.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
+
+
+__all__ = ["CollectionResult", "DocumentCollector"]
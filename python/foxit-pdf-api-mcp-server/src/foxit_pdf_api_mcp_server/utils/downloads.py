@@ -0,0 +1,114 @@
+"""Streaming document downloads to local files."""
+
+import hashlib
+from pathlib import Path
+from typing import Optional, TypedDict
+
+from ..client import file_io
+from ..client.foxit_client import FoxitPDFClient
+from .blob_store import BlobInfo, BlobStore
+
+
+class DownloadInfo(TypedDict):
+    """Result of a document downloaded to a local file."""
+
+    path: str
+    size: int
+    sha256: str
+
+
+async def download_to_path(
+    client: FoxitPDFClient,
+    document_id: str,
+    output_path: Path,
+    filename: Optional[str] = None,
+) -> DownloadInfo:
+    """Stream a document to a local file, hashing it as it is written.
+
+    The file is written next to its destination and renamed into place once
+    complete, so a failed download never leaves a partial file at output_path.
+
+    Args:
+        client: Foxit PDF client instance
+        document_id: Document ID to download
+        output_path: Destination file path
+        filename: Optional filename for download
+
+    Returns:
+        Download info with path, size and SHA-256 hash
+    """
+    await file_io.run(output_path.parent.mkdir, parents=True, exist_ok=True)
+    partial_path = output_path.with_name(output_path.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        async with await file_io.open_file(partial_path, "wb") as output:
+            async for chunk in client.iter_document(document_id, filename):
+                await output.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        await file_io.run(partial_path.replace, output_path)
+    except BaseException:
+        await file_io.run(partial_path.unlink, missing_ok=True)
+        raise
+
+    return DownloadInfo(path=str(output_path), size=size, sha256=digest.hexdigest())
+
+
+async def fetch_blob(
+    client: FoxitPDFClient,
+    blob_store: BlobStore,
+    document_id: str,
+    filename: Optional[str] = None,
+) -> BlobInfo:
+    """Get a document's content from the blob store, downloading it on a miss.
+
+    The blob is held, so no trim() evicts it while it is used. Call
+    blob_store.release() once it has been used; that also trims the store.
+
+    Args:
+        client: Foxit PDF client instance
+        blob_store: Local blob store
+        document_id: Document ID to fetch
+        filename: Optional filename for download
+
+    Returns:
+        Info of the stored blob
+    """
+    blob = await file_io.run(blob_store.lookup, document_id, hold=True)
+    if blob is None:
+        blob = await blob_store.ingest(
+            document_id, client.iter_document(document_id, filename), hold=True
+        )
+    return blob
+
+
+async def download_via_store(
+    client: FoxitPDFClient,
+    blob_store: BlobStore,
+    document_id: str,
+    output_path: Path,
+    filename: Optional[str] = None,
+) -> DownloadInfo:
+    """Place a document at output_path, serving it from the blob store when possible.
+
+    Args:
+        client: Foxit PDF client instance
+        blob_store: Local blob store
+        document_id: Document ID to download
+        output_path: Destination file path
+        filename: Optional filename for download
+
+    Returns:
+        Download info with path, size and SHA-256 hash
+    """
+    blob = await fetch_blob(client, blob_store, document_id, filename)
+    try:
+        await blob_store.materialize(blob, output_path)
+    finally:
+        await file_io.run(blob_store.release, blob)
+    return DownloadInfo(path=str(output_path), size=blob["size"], sha256=blob["sha256"])
+
+
+__all__ = ["DownloadInfo", "download_to_path", "download_via_store", "fetch_blob"]
@@ -0,0 +1,352 @@
+"""Bulk form filling: one uploaded template, many records of form data."""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Optional, TypedDict
+
+from ..client import file_io
+from ..client.deadline import remaining
+from ..client.foxit_client import FoxitPDFClient
+from ..types.api import TaskResponse
+from .downloads import download_to_path
+from .task_poller import execute_and_wait
+
+logger = logging.getLogger(__name__)
+
+# Per-record result log kept in the output directory, which resumed runs read
+RESULTS_NAME = "results.jsonl"
+
+# Characters not allowed in output file names derived from record keys
+_UNSAFE_NAME = re.compile(r"[^\w.-]+")
+
+
+class FormRecord(TypedDict):
+    """One record of form data and the file name stem of its filled form."""
+
+    record: int
+    key: str
+    formData: dict[str, Any]
+
+
+class FormFillItem(TypedDict, total=False):
+    """Result log entry for one record."""
+
+    record: int
+    key: str
+    path: str
+    size: int
+    sha256: str
+    error: str
+    code: str
+    seconds: float
+
+
+class FormFillSummary(TypedDict):
+    """Outcome counts and throughput of a bulk form fill run."""
+
+    total: int
+    succeeded: int
+    failed: int
+    skipped: int
+    remaining: int
+    seconds: float
+    perSecond: float
+
+
+def _nest(row: dict[str, Any]) -> dict[str, Any]:
+    """Turn dotted column names ("name.first") into nested form data."""
+    nested: dict[str, Any] = {}
+    for column, value in row.items():
+        node = nested
+        *parents, leaf = column.split(".")
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return nested
+
+
+def load_records(path: Path, key_field: Optional[str] = None) -> list[FormRecord]:
+    """
+    Read form data records from a CSV file or a JSONL file.
+
+    A ".csv" file has one record per row, with column headers as field names;
+    dotted headers ("name.first") become nested fields. Any other file is read
+    as JSONL with one form data object per line. Records are numbered from 1 in
+    file order, skipping blank JSONL lines.
+
+    Args:
+        path: Records file
+        key_field: Field whose value names each record's output file
+            (default: the record number)
+
+    Returns:
+        Records in file order
+
+    Raises:
+        ValueError: If a record is malformed, lacks key_field, or two records
+            map to the same output file
+    """
+    rows: list[tuple[str, Any]] = []
+    with open(path, encoding="utf-8-sig", newline="") as records_file:
+        if path.suffix.lower() == ".csv":
+            # Row 1 holds the headers
+            rows = [
+                (f"row {row_number}", _nest(row))
+                for row_number, row in enumerate(csv.DictReader(records_file), start=2)
+            ]
+        else:
+            for line_number, line in enumerate(records_file, start=1):
+                if line.strip():
+                    try:
+                        rows.append((f"line {line_number}", json.loads(line)))
+                    except json.JSONDecodeError as error:
+                        raise ValueError(f"{path.name} line {line_number}: {error}") from error
+
+    records: list[FormRecord] = []
+    keys: set[str] = set()
+    for number, (where, form_data) in enumerate(rows, start=1):
+        if not isinstance(form_data, dict):
+            raise ValueError(f"{path.name} {where}: a record must be a JSON object")
+        if key_field is None:
+            key = f"record-{number:06d}"
+        elif form_data.get(key_field) in (None, ""):
+            raise ValueError(f"{path.name} {where}: missing {key_field}")
+        else:
+            key = _UNSAFE_NAME.sub("_", str(form_data[key_field])).strip("._") or "_"
+        if key in keys:
+            raise ValueError(f"{path.name} {where}: duplicate output name {key}")
+        keys.add(key)
+        records.append(FormRecord(record=number, key=key, formData=form_data))
+    return records
+
+
+def _load_done(results_path: Path, records: list[FormRecord]) -> set[int]:
+    """Get the records whose latest result succeeded and whose output still exists."""
+    if not results_path.exists():
+        return set()
+    latest: dict[int, dict[str, Any]] = {}
+    with open(results_path, encoding="utf-8") as results:
+        for line in results:
+            try:
+                entry = json.loads(line)
+                latest[int(entry["record"])] = entry
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by an interrupted run
+                continue
+    done = set()
+    for record in records:
+        entry = latest.get(record["record"])
+        if (
+            entry is not None
+            and "error" not in entry
+            and entry.get("key") == record["key"]
+            and os.path.exists(entry.get("path", ""))
+        ):
+            done.add(record["record"])
+    return done
+
+
+def _append_line(file: IO[bytes], text: str) -> None:
+    file.write(text.encode("utf-8") + b"\n")
+    file.flush()
+
+
+def _write_zip(zip_path: Path, directory: Path) -> None:
+    """Write every file in directory into a new ZIP archive at zip_path."""
+    partial = zip_path.with_name(zip_path.name + ".partial")
+    with zipfile.ZipFile(partial, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(directory.iterdir()):
+            if path.is_file():
+                archive.write(path, path.name)
+    os.replace(partial, zip_path)
+
+
+class FormFillRunner:
+    """
+    Fills one uploaded form template with every record of a records file.
+
+    Records are imported concurrently, each filled form is streamed to
+    <key>.pdf in the output directory, and one result per record is appended
+    to results.jsonl there. A record that fails is logged and does not stop the
+    others. Identical records in flight at the same time share one import.
+    Running again with the same output resumes: records whose filled
+    form is already there are skipped and failed ones are retried. Workers stop
+    taking new records when the call's deadline would cut them short, leaving
+    them for the next run. Saved result documents are queued for deletion;
+    DocumentCollector.collect_requested() deletes them.
+    """
+
+    def __init__(
+        self,
+        client: FoxitPDFClient,
+        template_id: str,
+        records: list[FormRecord],
+        output_dir: Path,
+        concurrency: int = 8,
+        password: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            client: Foxit PDF client instance
+            template_id: Document ID of the uploaded form template
+            records: Records from load_records()
+            output_dir: Directory for filled forms and the result log
+            concurrency: Records imported concurrently
+            password: Password of the template, if protected
+        """
+        self.client = client
+        self.template_id = template_id
+        self.records = records
+        self.output_dir = output_dir
+        self.results_path = output_dir / RESULTS_NAME
+        self.concurrency = concurrency
+        self.password = password
+        self._slowest = 0.0
+        # Imports in flight by form data, and the records still using each result
+        self._imports: dict[str, asyncio.Task[TaskResponse]] = {}
+        self._users: dict[str, int] = {}
+
+    def _import(self, form_key: str, form_data: dict[str, Any]) -> asyncio.Task[TaskResponse]:
+        """Get the import of form_data, starting it unless an identical record did."""
+        if form_key not in self._imports:
+            self._imports[form_key] = asyncio.ensure_future(
+                execute_and_wait(
+                    self.client,
+                    lambda: self.client.import_pdf_form_data(
+                        self.template_id, form_data, self.password
+                    ),
+                )
+            )
+        self._users[form_key] = self._users.get(form_key, 0) + 1
+        return self._imports[form_key]
+
+    def _release(self, form_key: str, result: Optional[TaskResponse]) -> None:
+        """Drop a record's use of an import, queueing its result once nobody needs it."""
+        self._users[form_key] -= 1
+        if self._users[form_key]:
+            return
+        del self._users[form_key], self._imports[form_key]
+        if result is None:
+            return
+        result_document_id = result.get("resultDocumentId")
+        # Deleted by collect_requested() once the run is over, unless another call
+        # attached to the same task and may still need it
+        if result_document_id and not self.client.operations.is_shared(result["taskId"]):
+            self.client.documents.request_delete(result_document_id)
+
+    async def _fill(self, record: FormRecord) -> FormFillItem:
+        started = time.monotonic()
+        item = FormFillItem(record=record["record"], key=record["key"])
+        form_key = json.dumps(record["formData"], sort_keys=True, default=str)
+        result: Optional[TaskResponse] = None
+        try:
+            result = await self._import(form_key, record["formData"])
+            result_document_id = result.get("resultDocumentId")
+            if not result_document_id:
+                raise ValueError("Form data import returned no document")
+            info = await download_to_path(
+                self.client, result_document_id, self.output_dir / f"{record['key']}.pdf"
+            )
+            item["path"] = info["path"]
+            item["size"] = info["size"]
+            item["sha256"] = info["sha256"]
+        except Exception as error:
+            item["error"] = str(error)
+            item["code"] = getattr(error, "code", "IMPORT_FORM_FAILED")
+        finally:
+            self._release(form_key, result)
+        item["seconds"] = round(time.monotonic() - started, 3)
+        self._slowest = max(self._slowest, item["seconds"])
+        return item
+
+    def _out_of_time(self) -> bool:
+        # Do not start a record the call's deadline would cut short
+        left = remaining()
+        return left is not None and left <= self._slowest
+
+    async def run(self, resume: bool = True) -> tuple[FormFillSummary, list[FormFillItem]]:
+        """
+        Fill every record not done yet.
+
+        Args:
+            resume: Skip records done by an earlier run; False starts over
+
+        Returns:
+            Counts for this run and the failed records' log entries
+        """
+        await file_io.run(self.output_dir.mkdir, parents=True, exist_ok=True)
+        done = await file_io.run(_load_done, self.results_path, self.records) if resume else set()
+        pending = iter([record for record in self.records if record["record"] not in done])
+        failures: list[FormFillItem] = []
+        succeeded = 0
+        started = time.monotonic()
+
+        async with await file_io.open_file(self.results_path, "ab" if resume else "wb") as log:
+
+            async def worker() -> None:
+                nonlocal succeeded
+                for record in pending:
+                    if self._out_of_time():
+                        return
+                    item = await self._fill(record)
+                    if "error" in item:
+                        failures.append(item)
+                    else:
+                        succeeded += 1
+                    await file_io.run(_append_line, log.file, json.dumps(item))
+                    processed = succeeded + len(failures)
+                    if processed % 100 == 0:
+                        logger.info("Filled %d of %d forms", processed, len(self.records))
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        seconds = time.monotonic() - started
+        processed = succeeded + len(failures)
+        failures.sort(key=lambda item: item["record"])
+        return (
+            FormFillSummary(
+                total=len(self.records),
+                succeeded=succeeded,
+                failed=len(failures),
+                skipped=len(done),
+                remaining=len(self.records) - len(done) - processed,
+                seconds=round(seconds, 3),
+                perSecond=round(processed / seconds, 3) if seconds > 0 else 0.0,
+            ),
+            failures,
+        )
+
+
+async def write_zip(zip_path: Path, directory: Path, remove_directory: bool) -> None:
+    """
+    Pack the files of an output directory into a ZIP archive, replacing it atomically.
+
+    Args:
+        zip_path: Archive to write
+        directory: Directory whose files are packed
+        remove_directory: Delete the directory once the archive is written
+    """
+    await file_io.run(_write_zip, zip_path, directory)
+    if remove_directory:
+        await file_io.run(shutil.rmtree, directory)
+
+
+__all__ = [
+    "FormFillItem",
+    "FormFillRunner",
+    "FormFillSummary",
+    "FormRecord",
+    "RESULTS_NAME",
+    "load_records",
+    "write_zip",
+]
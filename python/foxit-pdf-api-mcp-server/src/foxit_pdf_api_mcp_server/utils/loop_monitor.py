@@ -0,0 +1,132 @@
+"""Event-loop lag monitoring and capture of blocking callbacks.
+
+A sampler task sleeps for a fixed interval and records how late it wakes up:
+that delay is time the loop spent running something else without yielding.
+Delays go into a histogram. A watchdog thread watches the sampler's
+heartbeat; when the loop has not come back for longer than the threshold,
+it logs the stack of the event loop thread while the blocking call is
+still running, which names the code that blocked.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the lag histogram buckets, in milliseconds
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LoopLagMonitor:
+    """Samples event-loop scheduling delay and logs the stack of long stalls."""
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            threshold: Loop stall, in seconds, after which the stack is logged
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self._task: Optional[asyncio.Task[None]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self._samples = 0
+        self._total = 0.0
+        self._max = 0.0
+        self.stalls = 0
+
+    def _record(self, lag: float) -> None:
+        lag_ms = lag * 1000
+        index = next(
+            (i for i, bound in enumerate(LAG_BUCKETS_MS) if lag_ms <= bound), len(LAG_BUCKETS_MS)
+        )
+        self._counts[index] += 1
+        self._samples += 1
+        self._total += lag
+        self._max = max(self._max, lag)
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self._record(max(0.0, now - expected))
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stopped.wait(self.threshold / 4):
+            stalled_for = time.monotonic() - self._heartbeat - self.interval
+            if stalled_for <= self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            # Report each stall once, while it is still going on
+            reported = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(stack unavailable)\n"
+            logger.warning(
+                "Event loop blocked for %.0f ms; loop thread stack:\n%s",
+                stalled_for * 1000,
+                stack,
+            )
+
+    def start(self) -> None:
+        """Start sampling on the running loop and start the watchdog thread."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="foxit-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop sampling and the watchdog thread."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def stats(self) -> dict[str, Any]:
+        """Get the lag histogram (cumulative counts per upper bound) and summary."""
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip([*map(str, LAG_BUCKETS_MS), "+Inf"], self._counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "enabled": self._task is not None,
+            "samples": self._samples,
+            "meanLagMs": round(self._total / self._samples * 1000, 2) if self._samples else 0.0,
+            "maxLagMs": round(self._max * 1000, 1),
+            "stalls": self.stalls,
+            "thresholdMs": round(self.threshold * 1000),
+            "lagBucketsMs": buckets,
+        }
+
+
+__all__ = ["LAG_BUCKETS_MS", "LoopLagMonitor"]
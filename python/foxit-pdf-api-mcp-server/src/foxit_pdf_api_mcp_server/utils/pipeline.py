@@ -0,0 +1,172 @@
+"""Configured sequences of single-document operations, run without an MCP client."""
+
+import json
+from pathlib import Path
+from typing import Any, Optional, TypedDict
+
+from ..client.foxit_client import FoxitPDFClient
+from ..types.api import TaskResponse
+from .task_poller import execute_and_wait
+
+# Client operations that take one input document as their first argument,
+# mapped to the file extension of their result document
+RESULT_EXTENSIONS: dict[str, str] = {
+    "pdf_from_word": ".pdf",
+    "pdf_from_excel": ".pdf",
+    "pdf_from_ppt": ".pdf",
+    "pdf_from_html": ".pdf",
+    "pdf_from_text": ".pdf",
+    "pdf_from_image": ".pdf",
+    "pdf_to_word": ".docx",
+    "pdf_to_excel": ".xlsx",
+    "pdf_to_ppt": ".pptx",
+    "pdf_to_html": ".html",
+    "pdf_to_text": ".txt",
+    "pdf_to_image": ".zip",
+    "pdf_split": ".zip",
+    "pdf_extract": ".pdf",
+    "pdf_compress": ".pdf",
+    "pdf_flatten": ".pdf",
+    "pdf_linearize": ".pdf",
+    "pdf_manipulate": ".pdf",
+    "pdf_protect": ".pdf",
+    "pdf_remove_password": ".pdf",
+    "pdf_watermark": ".pdf",
+    "pdf_ocr": ".pdf",
+    "get_pdf_properties": ".json",
+    "pdf_structural_analysis": ".zip",
+    "export_pdf_form_data": ".json",
+    "import_pdf_form_data": ".pdf",
+}
+
+
+class PipelineStep(TypedDict, total=False):
+    """One step of a pipeline: a client operation and its keyword arguments."""
+
+    operation: str
+    args: dict[str, Any]
+
+
+class PipelineResult(TypedDict):
+    """Outcome of running a pipeline on one document."""
+
+    taskIds: list[str]
+    documentIds: list[str]
+    result: TaskResponse
+
+
+def load_pipeline(source: str) -> list[PipelineStep]:
+    """
+    Load and validate pipeline steps.
+
+    Args:
+        source: Path to a JSON file, or an inline JSON array of steps such as
+            [{"operation": "pdf_ocr"}, {"operation": "pdf_compress",
+            "args": {"compression_level": "MEDIUM"}}]
+
+    Returns:
+        Validated steps
+
+    Raises:
+        ValueError: If the pipeline is empty or names an unsupported operation
+    """
+    text = source if source.lstrip().startswith("[") else Path(source).read_text()
+    steps = json.loads(text)
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("Pipeline must be a non-empty JSON array of steps")
+
+    for step in steps:
+        operation = step.get("operation") if isinstance(step, dict) else None
+        if operation not in RESULT_EXTENSIONS:
+            raise ValueError(
+                f"Unsupported pipeline operation: {operation!r}. "
+                f"Supported: {', '.join(sorted(RESULT_EXTENSIONS))}"
+            )
+        if not isinstance(step.get("args", {}), dict):
+            raise ValueError(f"Arguments of {operation} must be a JSON object")
+    return steps
+
+
+def result_extension(steps: list[PipelineStep]) -> str:
+    """Get the file extension of a pipeline's final result."""
+    return RESULT_EXTENSIONS[steps[-1]["operation"]]
+
+
+async def run_operation(
+    client: FoxitPDFClient,
+    operation: str,
+    document_id: str,
+    args: Optional[dict[str, Any]] = None,
+) -> TaskResponse:
+    """
+    Run one client operation on a document and wait for it to complete.
+
+    Args:
+        client: Foxit PDF client instance
+        operation: Client operation name (a key of RESULT_EXTENSIONS)
+        document_id: Input document ID
+        args: Keyword arguments for the client method
+
+    Returns:
+        Completed task response
+    """
+    if operation not in RESULT_EXTENSIONS:
+        raise ValueError(f"Unsupported operation: {operation}")
+    method = getattr(client, operation)
+    return await execute_and_wait(client, lambda: method(document_id, **(args or {})))
+
+
+async def run_pipeline(
+    client: FoxitPDFClient,
+    document_id: str,
+    steps: list[PipelineStep],
+    created: Optional[list[str]] = None,
+) -> PipelineResult:
+    """
+    Run pipeline steps in order, feeding each result into the next step.
+
+    Args:
+        client: Foxit PDF client instance
+        document_id: Input document ID for the first step
+        steps: Steps to run
+        created: List that each result document ID is appended to as soon as
+            its step completes, so a caller can clean up after a later step fails
+
+    Returns:
+        Task IDs, every result document ID produced, and the final task response
+
+    Raises:
+        ValueError: If an intermediate step produces no result document
+    """
+    task_ids: list[str] = []
+    document_ids: list[str] = []
+    current = document_id
+    result: Optional[TaskResponse] = None
+
+    for index, step in enumerate(steps):
+        result = await run_operation(client, step["operation"], current, step.get("args"))
+        task_ids.append(result["taskId"])
+        result_document_id = result.get("resultDocumentId")
+        if result_document_id:
+            document_ids.append(result_document_id)
+            if created is not None:
+                created.append(result_document_id)
+            current = result_document_id
+        elif index < len(steps) - 1:
+            raise ValueError(
+                f"Step {step['operation']} produced no document for the next step"
+            )
+
+    assert result is not None
+    return PipelineResult(taskIds=task_ids, documentIds=document_ids, result=result)
+
+
+__all__ = [
+    "PipelineResult",
+    "PipelineStep",
+    "RESULT_EXTENSIONS",
+    "load_pipeline",
+    "result_extension",
+    "run_operation",
+    "run_pipeline",
+]
@@ -0,0 +1,78 @@
+"""In-memory cache of JSON task results, by document and request options."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class ResultCache:
+    """
+    Keeps recent task results so repeated reads of one document's data reuse them.
+
+    Documents never change once created, so a result stays valid for as long
+    as its document exists; ttl only bounds how long memory is held. Entries
+    are keyed by (documentId, *options). At most max_entries are kept, and the
+    least recently used entry is evicted first.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Most results kept at once
+            ttl: Seconds a result is kept after it was stored
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document_id: str, *options: Hashable) -> Optional[Any]:
+        """
+        Get a cached result.
+
+        Args:
+            document_id: Document the result belongs to
+            *options: Request options the result was produced with
+
+        Returns:
+            The cached result, or None when absent or expired
+        """
+        key = (document_id, *options)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, document_id: str, *options: Hashable, value: Any) -> None:
+        """
+        Store a result, evicting the least recently used ones past max_entries.
+
+        Args:
+            document_id: Document the result belongs to
+            *options: Request options the result was produced with
+            value: Result to cache
+        """
+        key = (document_id, *options)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, document_id: str) -> None:
+        """Drop every cached result of a document, e.g. after it was deleted."""
+        for key in [key for key in self._entries if key[0] == document_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        """Get entry count and hit/miss counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+__all__ = ["ResultCache"]
@@ -0,0 +1,140 @@
+"""Background prefetching of completed task results into the local blob store."""
+
+import asyncio
+import contextvars
+import logging
+from typing import Optional
+
+from ..client import file_io
+from ..client.deadline import remaining
+from ..client.foxit_client import FoxitPDFClient
+from ..types.api import TaskResponse
+from .blob_store import BlobInfo, BlobStore
+
+logger = logging.getLogger(__name__)
+
+
+class _Prefetch:
+    """One result document being streamed into the blob store."""
+
+    def __init__(self, document_id: str) -> None:
+        self.document_id = document_id
+        self.task: Optional[asyncio.Task[BlobInfo]] = None
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class ResultPrefetcher:
+    """
+    Streams completed results into the blob store before anyone asks for them.
+
+    Register schedule() as a client result listener. A later download of the
+    same document waits for the prefetch already under way and is then served
+    from the store. Results larger than max_document_bytes are abandoned, and
+    prefetches still running after ttl seconds are cancelled. Finished
+    prefetches are ordinary blob store entries, subject to its byte budget.
+    """
+
+    def __init__(
+        self,
+        client: FoxitPDFClient,
+        blob_store: BlobStore,
+        max_document_bytes: int,
+        ttl: float,
+        concurrency: int,
+    ) -> None:
+        """
+        Initialize the prefetcher.
+
+        Args:
+            client: Foxit PDF client instance
+            blob_store: Store prefetched results are written to
+            max_document_bytes: Largest result that is prefetched
+            ttl: Seconds a prefetch may run before it is cancelled
+            concurrency: Maximum prefetch downloads in flight
+        """
+        self.client = client
+        self.blob_store = blob_store
+        self.max_document_bytes = max_document_bytes
+        self.ttl = ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._entries: dict[str, _Prefetch] = {}
+
+    def schedule(self, task: TaskResponse) -> None:
+        """
+        Start prefetching the result document of a completed task.
+
+        Args:
+            task: Completed task response
+        """
+        document_id = task.get("resultDocumentId")
+        if not document_id or document_id in self._entries:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        entry = _Prefetch(document_id)
+        # A fresh context, so the deadline of the call that saw the task complete
+        # does not bound a download that later calls share
+        entry.task = loop.create_task(self._download(entry), context=contextvars.Context())
+        entry.task.add_done_callback(lambda _: self._finished(entry))
+        entry.expiry = loop.call_later(self.ttl, self._discard, document_id)
+        self._entries[document_id] = entry
+
+    async def _download(self, entry: _Prefetch) -> BlobInfo:
+        async with self._semaphore:
+            blob = await file_io.run(self.blob_store.lookup, entry.document_id)
+            if blob is None:
+                blob = await self.blob_store.ingest(
+                    entry.document_id,
+                    self.client.iter_document(entry.document_id),
+                    max_size=self.max_document_bytes,
+                )
+                await file_io.run(self.blob_store.trim)
+            return blob
+
+    def _finished(self, entry: _Prefetch) -> None:
+        if entry.expiry is not None:
+            entry.expiry.cancel()
+        if self._entries.get(entry.document_id) is entry:
+            del self._entries[entry.document_id]
+        if entry.task is not None and not entry.task.cancelled():
+            error = entry.task.exception()
+            if error is not None:
+                logger.info("Prefetch of %s failed: %s", entry.document_id, error)
+
+    def _discard(self, document_id: str) -> None:
+        """Cancel a prefetch that is taking too long."""
+        entry = self._entries.pop(document_id, None)
+        if entry is not None and entry.task is not None:
+            entry.task.cancel()
+
+    async def wait(self, document_id: str) -> None:
+        """
+        Wait for a running prefetch of document_id, if there is one.
+
+        Afterwards the document is in the blob store if the prefetch succeeded.
+        Prefetch errors are not raised; the caller falls back to downloading.
+        The wait ends at the call's deadline at the latest, leaving the
+        prefetch running for later calls.
+
+        Args:
+            document_id: Result document ID
+        """
+        entry = self._entries.get(document_id)
+        if entry is not None and entry.task is not None:
+            # asyncio.wait leaves the prefetch running if the caller is cancelled
+            # or runs out of time
+            left = remaining()
+            await asyncio.wait([entry.task], timeout=None if left is None else max(0.0, left))
+
+    async def close(self) -> None:
+        """Cancel every running prefetch."""
+        tasks = [entry.task for entry in self._entries.values() if entry.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["ResultPrefetcher"]
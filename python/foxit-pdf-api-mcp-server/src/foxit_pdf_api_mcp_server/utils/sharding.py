@@ -0,0 +1,281 @@
+"""Page-sharded execution of an operation on a large PDF.
+
+The input is split into chunks of pages with pdf_split, the operation runs on
+every chunk in parallel (each chunk retried on its own), and the chunk results
+are reassembled in page order: PDFs are merged with pdf_merge, text is
+concatenated. Other results (e.g. Word documents, which the API cannot merge)
+are returned as ordered parts.
+"""
+
+import asyncio
+import inspect
+import logging
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, TypedDict
+
+from ..client import file_io
+from ..client.deadline import remaining
+from ..client.foxit_client import FoxitAPIError, FoxitPDFClient
+from ..types.api import TaskResponse
+from .bulk_transfer import upload_files
+from .pipeline import RESULT_EXTENSIONS, run_operation
+from .task_poller import execute_and_wait
+from .zip_extract import extract_zip_stream
+
+logger = logging.getLogger(__name__)
+
+# How chunk results are reassembled, by result extension
+_MERGE_PDF = ".pdf"
+_CONCATENATE = ".txt"
+
+# Separator written between concatenated chunk texts, as the API writes between pages
+_PAGE_BREAK = b"\f"
+
+# Error codes of failures that may pass on retry; HTTP 429 and 5xx responses also do
+_TRANSIENT_CODES = frozenset({"TIMEOUT", "TASK_TIMEOUT", "REQUEST_FAILED"})
+
+
+class ShardedResult(TypedDict):
+    """Outcome of a sharded operation."""
+
+    shards: int
+    taskIds: list[str]
+    retries: int
+    resultDocumentId: Optional[str]
+    partDocumentIds: list[str]
+
+
+def _natural_key(name: str) -> list[Any]:
+    """Sort key that orders "part_10.pdf" after "part_9.pdf"."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def _is_transient(error: FoxitAPIError) -> bool:
+    """Whether a failed chunk is worth retrying (not a validation, auth or open circuit error)."""
+    if error.code in _TRANSIENT_CODES:
+        return True
+    return error.status_code is not None and (error.status_code == 429 or error.status_code >= 500)
+
+
+async def _split(
+    client: FoxitPDFClient,
+    document_id: str,
+    pages_per_shard: int,
+    password: Optional[str],
+    work_dir: Path,
+    concurrency: int,
+    created: list[str],
+) -> list[str]:
+    """Split a document into page chunks and upload each chunk, in page order."""
+    split = await execute_and_wait(
+        client,
+        lambda: client.pdf_split(
+            document_id, "BY_PAGE_COUNT", {"pageCount": pages_per_shard}, password
+        ),
+    )
+    archive_id = split.get("resultDocumentId")
+    if not archive_id:
+        raise FoxitAPIError(message="pdf_split produced no result", code="SHARD_SPLIT_FAILED")
+    created.append(archive_id)
+
+    entries = await extract_zip_stream(client.iter_document(archive_id), work_dir / "chunks")
+    paths = [
+        Path(entry["path"])
+        for entry in sorted(entries, key=lambda entry: _natural_key(entry["name"]))
+        if entry["name"].lower().endswith(".pdf")
+    ]
+    if not paths:
+        raise FoxitAPIError(message="pdf_split produced no chunks", code="SHARD_SPLIT_FAILED")
+
+    uploads = await upload_files(client, paths, concurrency)
+    # Chunk uploads are intermediates too, even if a sibling upload failed
+    created.extend(item["documentId"] for item in uploads if "documentId" in item)
+    for item in uploads:
+        if "error" in item:
+            raise FoxitAPIError(
+                message=f"Uploading chunk {Path(item['path']).name} failed: {item['error']}",
+                code=item.get("code", "UPLOAD_FAILED"),
+            )
+    return [item["documentId"] for item in uploads]
+
+
+async def _run_shard(
+    client: FoxitPDFClient,
+    operation: str,
+    document_id: str,
+    args: Optional[dict[str, Any]],
+    max_attempts: int,
+    semaphore: asyncio.Semaphore,
+) -> tuple[TaskResponse, int]:
+    """
+    Run the operation on one chunk, retrying it alone; returns the result and attempts.
+
+    Only transient failures are retried, and retries stop once the call's deadline
+    has passed or would pass during the backoff.
+    """
+    async with semaphore:
+        attempt = 1
+        while True:
+            try:
+                return await run_operation(client, operation, document_id, args), attempt
+            except FoxitAPIError as error:
+                delay = client.poll_interval * attempt
+                left = remaining()
+                # No retry the call's deadline would cut short anyway
+                if (
+                    attempt >= max_attempts
+                    or not _is_transient(error)
+                    or (left is not None and left <= delay)
+                ):
+                    raise
+                logger.warning(
+                    "%s failed on chunk %s (attempt %d/%d): %s",
+                    operation,
+                    document_id,
+                    attempt,
+                    max_attempts,
+                    error,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+async def _concatenate(
+    client: FoxitPDFClient, document_ids: list[str], work_dir: Path, file_name: str
+) -> str:
+    """Download text results in order into one file, a page break apart, and upload it."""
+    path = work_dir / file_name
+    async with await file_io.open_file(path, "wb") as output:
+        last = _PAGE_BREAK
+        for document_id in document_ids:
+            # A chunk text that already ends with a page break gets no second one
+            if not last.endswith(_PAGE_BREAK):
+                await output.write(_PAGE_BREAK)
+            async for chunk in client.iter_document(document_id):
+                if chunk:
+                    await output.write(chunk)
+                    last = chunk
+    async with await file_io.open_file(path) as file:
+        response = await client.upload_document(file.file, file_name)
+    return response["documentId"]
+
+
+async def run_sharded(
+    client: FoxitPDFClient,
+    operation: str,
+    document_id: str,
+    pages_per_shard: int,
+    args: Optional[dict[str, Any]] = None,
+    password: Optional[str] = None,
+    concurrency: int = 4,
+    max_attempts: int = 3,
+    cleanup: bool = True,
+) -> ShardedResult:
+    """
+    Run an operation on a large PDF as parallel page chunks and reassemble it.
+
+    The whole run is bound by the call's deadline (tools calling this get the
+    bulk tool budget), and a chunk is not retried past it.
+
+    Args:
+        client: Foxit PDF client instance
+        operation: Client operation name (a key of RESULT_EXTENSIONS)
+        document_id: Input PDF document ID
+        pages_per_shard: Pages per chunk
+        args: Keyword arguments for the operation, applied to every chunk
+        password: Password of the input PDF, used to split it and to open every chunk
+        concurrency: Chunks processed at the same time
+        max_attempts: Attempts per chunk before the whole operation fails
+        cleanup: Delete the split archive, chunk uploads and merged chunk results
+
+    Returns:
+        Task IDs, retry count, and either the reassembled result document or the
+        ordered chunk result documents
+
+    Raises:
+        FoxitAPIError: If splitting fails, or a chunk fails on every attempt
+    """
+    if operation not in RESULT_EXTENSIONS:
+        raise ValueError(f"Unsupported operation: {operation}")
+    if pages_per_shard <= 0:
+        raise ValueError("pages_per_shard must be positive")
+
+    extension = RESULT_EXTENSIONS[operation]
+    intermediates: list[str] = []
+    work_dir = Path(await file_io.run(tempfile.mkdtemp, prefix="foxit-shards-"))
+    try:
+        chunk_ids = await _split(
+            client, document_id, pages_per_shard, password, work_dir, concurrency, intermediates
+        )
+
+        # Chunks of a protected PDF keep its password
+        chunk_args = dict(args or {})
+        if password and "password" in inspect.signature(getattr(client, operation)).parameters:
+            chunk_args["password"] = password
+
+        semaphore = asyncio.Semaphore(concurrency)
+        shards = [
+            asyncio.ensure_future(
+                _run_shard(client, operation, chunk_id, chunk_args, max_attempts, semaphore)
+            )
+            for chunk_id in chunk_ids
+        ]
+        try:
+            outcomes = await asyncio.gather(*shards)
+        except BaseException:
+            # One chunk failed for good: stop the rest, and clean up what finished
+            for shard in shards:
+                shard.cancel()
+            await asyncio.gather(*shards, return_exceptions=True)
+            for shard in shards:
+                if not shard.cancelled() and shard.exception() is None:
+                    part_id = shard.result()[0].get("resultDocumentId")
+                    if part_id:
+                        intermediates.append(part_id)
+            raise
+
+        task_ids = [result["taskId"] for result, _ in outcomes]
+        part_ids = [result.get("resultDocumentId") or "" for result, _ in outcomes]
+        if not all(part_ids):
+            raise FoxitAPIError(
+                message=f"{operation} produced no document for a chunk",
+                code="SHARD_FAILED",
+            )
+
+        result_id: Optional[str] = None
+        if len(part_ids) == 1:
+            result_id = part_ids[0]
+        elif extension == _MERGE_PDF:
+            intermediates.extend(part_ids)
+            merged = await execute_and_wait(
+                client,
+                lambda: client.pdf_merge([{"documentId": part} for part in part_ids]),
+            )
+            task_ids.append(merged["taskId"])
+            result_id = merged.get("resultDocumentId")
+        elif extension == _CONCATENATE:
+            intermediates.extend(part_ids)
+            result_id = await _concatenate(
+                client, part_ids, work_dir, f"{document_id}{extension}"
+            )
+
+        return ShardedResult(
+            shards=len(chunk_ids),
+            taskIds=task_ids,
+            retries=sum(attempts - 1 for _, attempts in outcomes),
+            resultDocumentId=result_id,
+            partDocumentIds=[] if result_id else part_ids,
+        )
+    finally:
+        await file_io.run(shutil.rmtree, work_dir, ignore_errors=True)
+        if cleanup and intermediates:
+            await asyncio.gather(
+                *(client.delete_document(doc_id) for doc_id in intermediates),
+                return_exceptions=True,
+            )
+
+
+__all__ = ["ShardedResult", "run_sharded"]
@@ -0,0 +1,380 @@
+"""On-disk index over pdf_structural_analysis results.
+
+The structural analysis ZIP contains one large JSON tree of document elements
+(titles, headings, paragraphs, tables, images, ...). This module flattens that
+tree into rows keyed by element type, page and bounding box in a SQLite
+database, so later lookups never need the archive or the JSON again.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Iterator, Optional, TypedDict
+
+# Keys the Extract schema (and close variants) use for element attributes
+_TYPE_KEYS = ("type", "Type", "elementType", "category")
+_PAGE_KEYS = ("page", "pageNumber", "pageNum", "Page")
+_PAGE_INDEX_KEYS = ("pageIndex", "page_index")
+_BBOX_KEYS = ("bbox", "BBox", "boundingBox", "bounds", "Bounds", "rect")
+_LEVEL_KEYS = ("level", "Level", "headingLevel")
+_TEXT_KEYS = ("text", "Text", "content")
+
+# Longest text kept inline per element; full content stays in the archive
+_MAX_TEXT_LENGTH = 4000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS structure_indexes (
+    index_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    element_count INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS structure_elements (
+    index_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    page INTEGER,
+    level INTEGER,
+    x0 REAL, y0 REAL, x1 REAL, y1 REAL,
+    text TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (index_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_structure_type_page
+    ON structure_elements (index_id, type, page);
+CREATE INDEX IF NOT EXISTS idx_structure_page
+    ON structure_elements (index_id, page);
+"""
+
+
+class StructureIndexInfo(TypedDict):
+    """Summary of one indexed structural analysis result."""
+
+    indexId: str
+    source: str
+    elementCount: int
+    pageCount: int
+    typeCounts: dict[str, int]
+    createdAt: float
+
+
+class StructureElement(TypedDict):
+    """One indexed document element."""
+
+    seq: int
+    type: str
+    page: Optional[int]
+    level: Optional[int]
+    bbox: Optional[list[float]]
+    text: Optional[str]
+    data: dict[str, Any]
+
+
+def _first(node: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    for key in keys:
+        if key in node:
+            return node[key]
+    return None
+
+
+def _page_of(node: dict[str, Any]) -> Optional[int]:
+    page = _first(node, _PAGE_KEYS)
+    if isinstance(page, int) and not isinstance(page, bool):
+        return page
+    page_index = _first(node, _PAGE_INDEX_KEYS)
+    if isinstance(page_index, int) and not isinstance(page_index, bool):
+        return page_index + 1
+    return None
+
+
+def _bbox_of(node: dict[str, Any]) -> Optional[tuple[float, float, float, float]]:
+    bbox = _first(node, _BBOX_KEYS)
+    if isinstance(bbox, list) and len(bbox) == 4 and all(
+        isinstance(v, (int, float)) for v in bbox
+    ):
+        x0, y0, x1, y1 = (float(v) for v in bbox)
+    elif isinstance(bbox, dict):
+        try:
+            if "width" in bbox:
+                x0, y0 = float(bbox["x"]), float(bbox["y"])
+                x1, y1 = x0 + float(bbox["width"]), y0 + float(bbox["height"])
+            else:
+                x0, y0 = float(bbox["left"]), float(bbox["top"])
+                x1, y1 = float(bbox["right"]), float(bbox["bottom"])
+        except (KeyError, TypeError, ValueError):
+            return None
+    else:
+        return None
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def _iter_elements(
+    root: Any,
+) -> Iterator[tuple[str, Optional[int], Optional[int], Any, Optional[str], dict[str, Any]]]:
+    """Walk the analysis tree depth-first, yielding typed elements in document order."""
+    # Iterative walk: analysis trees for long documents nest deeper than the recursion limit
+    stack: list[tuple[Any, Optional[int]]] = [(root, None)]
+    while stack:
+        node, inherited_page = stack.pop()
+
+        if isinstance(node, list):
+            stack.extend((child, inherited_page) for child in reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        page = _page_of(node) or inherited_page
+        element_type = _first(node, _TYPE_KEYS)
+        if isinstance(element_type, str):
+            level = _first(node, _LEVEL_KEYS)
+            text = _first(node, _TEXT_KEYS)
+            scalars = {
+                key: value
+                for key, value in node.items()
+                if not isinstance(value, (dict, list)) or key in _BBOX_KEYS
+            }
+            yield (
+                element_type.lower(),
+                page,
+                level if isinstance(level, int) and not isinstance(level, bool) else None,
+                _bbox_of(node),
+                text[:_MAX_TEXT_LENGTH] if isinstance(text, str) else None,
+                scalars,
+            )
+
+        stack.extend(
+            (child, page) for child in reversed(list(node.values()))
+            if isinstance(child, (dict, list))
+        )
+
+
+def _find_analysis_json(archive: zipfile.ZipFile) -> zipfile.ZipInfo:
+    candidates = [
+        info for info in archive.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(".json")
+    ]
+    if not candidates:
+        raise ValueError("Structural analysis archive does not contain a JSON file")
+    # The analysis tree is by far the largest JSON member
+    return max(candidates, key=lambda info: info.file_size)
+
+
+class StructureIndex:
+    """SQLite-backed index of structural analysis elements."""
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            db_path: SQLite database file (created on first use)
+        """
+        self.db_path = db_path
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._init_lock:
+            if not self._initialized:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                self._initialized = True
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def build_from_zip(self, index_id: str, zip_path: Path, source: str) -> StructureIndexInfo:
+        """
+        Index the analysis JSON inside a structural analysis ZIP.
+
+        The JSON member is decoded straight from the archive and discarded once
+        its elements are written. Re-indexing an existing index_id replaces it.
+
+        Args:
+            index_id: Key for the index (normally the analysis resultDocumentId)
+            zip_path: Path to the structural analysis ZIP
+            source: Description of where the archive came from
+
+        Returns:
+            Summary of the new index
+        """
+        with zipfile.ZipFile(zip_path) as archive:
+            with archive.open(_find_analysis_json(archive)) as member:
+                tree = json.load(member)
+
+        rows = (
+            (
+                index_id,
+                seq,
+                element_type,
+                page,
+                level,
+                *(bbox or (None, None, None, None)),
+                text,
+                json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+            )
+            for seq, (element_type, page, level, bbox, text, data) in enumerate(
+                _iter_elements(tree)
+            )
+        )
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM structure_elements WHERE index_id = ?", (index_id,))
+                conn.executemany(
+                    "INSERT INTO structure_elements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                element_count, page_count = conn.execute(
+                    "SELECT COUNT(*), COALESCE(MAX(page), 0) FROM structure_elements "
+                    "WHERE index_id = ?",
+                    (index_id,),
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO structure_indexes VALUES (?, ?, ?, ?, ?)",
+                    (index_id, source, element_count, page_count, time.time()),
+                )
+        finally:
+            conn.close()
+
+        info = self.get_info(index_id)
+        assert info is not None
+        return info
+
+    def get_info(self, index_id: str) -> Optional[StructureIndexInfo]:
+        """
+        Get the summary of an index.
+
+        Args:
+            index_id: Index key
+
+        Returns:
+            Index summary, or None if the index does not exist
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM structure_indexes WHERE index_id = ?", (index_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            type_counts = {
+                element_type: count
+                for element_type, count in conn.execute(
+                    "SELECT type, COUNT(*) FROM structure_elements WHERE index_id = ? "
+                    "GROUP BY type ORDER BY type",
+                    (index_id,),
+                )
+            }
+        finally:
+            conn.close()
+
+        return StructureIndexInfo(
+            indexId=row["index_id"],
+            source=row["source"],
+            elementCount=row["element_count"],
+            pageCount=row["page_count"],
+            typeCounts=type_counts,
+            createdAt=row["created_at"],
+        )
+
+    def query(
+        self,
+        index_id: str,
+        types: Optional[list[str]] = None,
+        page_start: Optional[int] = None,
+        page_end: Optional[int] = None,
+        min_level: Optional[int] = None,
+        max_level: Optional[int] = None,
+        bbox: Optional[list[float]] = None,
+        text_contains: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[int, list[StructureElement]]:
+        """
+        Query indexed elements.
+
+        Args:
+            index_id: Index key
+            types: Element types to include (e.g. ["table"], ["title", "head"])
+            page_start: First page to include (1-based)
+            page_end: Last page to include (1-based, inclusive)
+            min_level: Minimum heading level
+            max_level: Maximum heading level; elements without a level are kept
+            bbox: Region [x0, y0, x1, y1]; elements intersecting it are returned
+            text_contains: Case-insensitive substring the element text must contain
+            limit: Maximum number of elements to return
+            offset: Number of matching elements to skip
+
+        Returns:
+            Total number of matches and the requested page of elements in document order
+        """
+        clauses = ["index_id = ?"]
+        params: list[Any] = [index_id]
+
+        if types:
+            clauses.append(f"type IN ({', '.join('?' for _ in types)})")
+            params.extend(t.lower() for t in types)
+        if page_start is not None:
+            clauses.append("page >= ?")
+            params.append(page_start)
+        if page_end is not None:
+            clauses.append("page <= ?")
+            params.append(page_end)
+        if min_level is not None:
+            clauses.append("level >= ?")
+            params.append(min_level)
+        if max_level is not None:
+            # Elements without a level (e.g. titles) are not below any heading level
+            clauses.append("(level IS NULL OR level <= ?)")
+            params.append(max_level)
+        if bbox is not None:
+            if len(bbox) != 4:
+                raise ValueError("bbox must be [x0, y0, x1, y1]")
+            clauses.append("x0 <= ? AND x1 >= ? AND y0 <= ? AND y1 >= ?")
+            params.extend(
+                [max(bbox[0], bbox[2]), min(bbox[0], bbox[2]),
+                 max(bbox[1], bbox[3]), min(bbox[1], bbox[3])]
+            )
+        if text_contains:
+            clauses.append("text LIKE ? ESCAPE '\\'")
+            escaped = (
+                text_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            params.append(f"%{escaped}%")
+
+        where = " AND ".join(clauses)
+        conn = self._connect()
+        try:
+            (total,) = conn.execute(
+                f"SELECT COUNT(*) FROM structure_elements WHERE {where}", params
+            ).fetchone()
+            rows = conn.execute(
+                f"SELECT * FROM structure_elements WHERE {where} ORDER BY seq LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return total, [
+            StructureElement(
+                seq=row["seq"],
+                type=row["type"],
+                page=row["page"],
+                level=row["level"],
+                bbox=None if row["x0"] is None else [row["x0"], row["y0"], row["x1"], row["y1"]],
+                text=row["text"],
+                data=json.loads(row["data"]),
+            )
+            for row in rows
+        ]
+
+
+__all__ = ["StructureElement", "StructureIndex", "StructureIndexInfo"]
@@ -3,6 +3,7 @@
 import asyncio
 from typing import Any, Awaitable, Callable, Mapping, Optional
 
+from ..client import deadline
 from ..client.foxit_client import FoxitAPIError, FoxitPDFClient
 from ..types.api import TaskResponse
 
@@ -14,6 +15,9 @@ async def poll_task_until_complete(
 ) -> TaskResponse:
 	"""Poll a task until completion or timeout.
 
+	Polling also stops when the deadline of the current call (see
+	client.deadline) runs out, whichever comes first.
+
 	Args:
 		client: Foxit PDF client instance
 		task_id: Task ID to poll
@@ -23,7 +27,8 @@ async def poll_task_until_complete(
 		Completed task response
 
 	Raises:
-		FoxitAPIError: If task fails or times out
+		FoxitAPIError: If task fails or times out (code DEADLINE_EXCEEDED when
+			the call's deadline ran out first)
 	"""
 	timeout_seconds = timeout or client.default_timeout
 	poll_interval = client.poll_interval
@@ -54,6 +59,16 @@ async def poll_task_until_complete(
 			error.task_id = task_id  # type: ignore[attr-defined]
 			raise error
 
+		left = deadline.remaining()
+		if left is not None and left <= poll_interval:
+			# The next poll would come too late to be used
+			error = FoxitAPIError(
+				message=f"Deadline exceeded while waiting for task {task_id}",
+				code="DEADLINE_EXCEEDED",
+			)
+			error.task_id = task_id  # type: ignore[attr-defined]
+			raise error
+
 		await asyncio.sleep(poll_interval)
 
 
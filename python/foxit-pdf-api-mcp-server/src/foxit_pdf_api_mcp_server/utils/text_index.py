@@ -0,0 +1,316 @@
+"""Incremental full-text index over pdf_to_text results.
+
+Text is stored once per content hash with page-level postings, so the same
+text reached through several documentIds is indexed a single time, and
+re-ingesting unchanged content is a no-op. Pages are split on form feeds,
+which pdf_to_text emits between pages.
+"""
+
+import hashlib
+import math
+import mmap
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Optional, TypedDict, Union
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PAGE_SEPARATOR = "\f"
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+_SNIPPET_RADIUS = 80
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS text_contents (
+    content_hash TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL,
+    token_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS text_documents (
+    document_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    source TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_text_documents_hash ON text_documents (content_hash);
+CREATE TABLE IF NOT EXISTS text_pages (
+    content_hash TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    token_count INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (content_hash, page)
+);
+CREATE TABLE IF NOT EXISTS text_postings (
+    term TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, content_hash, page)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_text_postings_hash ON text_postings (content_hash);
+"""
+
+
+class TextIngestResult(TypedDict):
+    """Outcome of ingesting one text document."""
+
+    documentId: str
+    contentHash: str
+    pageCount: int
+    skipped: bool
+
+
+class TextSearchHit(TypedDict):
+    """One ranked page-level search hit."""
+
+    documentIds: list[str]
+    contentHash: str
+    page: int
+    score: float
+    snippet: str
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _snippet(text: str, terms: set[str]) -> str:
+    lowered = text.lower()
+    positions = [
+        match.start()
+        for term in terms
+        if (match := re.search(rf"\b{re.escape(term)}\b", lowered)) is not None
+    ]
+    center = min(positions) if positions else 0
+    start = max(0, center - _SNIPPET_RADIUS)
+    end = min(len(text), center + _SNIPPET_RADIUS)
+    snippet = " ".join(text[start:end].split())
+    return f"{'…' if start > 0 else ''}{snippet}{'…' if end < len(text) else ''}"
+
+
+class TextIndex:
+    """SQLite-backed inverted index with page-level postings."""
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            db_path: SQLite database file (created on first use)
+        """
+        self.db_path = db_path
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        # Serializes writers so concurrent ingests of the same content cannot race
+        self._write_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._init_lock:
+            if not self._initialized:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                self._initialized = True
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def is_indexed(self, document_id: str) -> bool:
+        """Check whether a documentId has been ingested."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM text_documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def ingest(
+        self, document_id: str, content: Union[bytes, mmap.mmap], source: str
+    ) -> TextIngestResult:
+        """
+        Add or update the text of a document.
+
+        Content whose hash is already indexed is not tokenized again; the
+        documentId is simply pointed at the existing postings.
+
+        Args:
+            document_id: Document ID the text belongs to
+            content: UTF-8 text, pages separated by form feeds (bytes or a memory map)
+            source: Description of where the text came from
+
+        Returns:
+            Ingest result, with skipped=True when no re-indexing was needed
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    previous = conn.execute(
+                        "SELECT content_hash FROM text_documents WHERE document_id = ?",
+                        (document_id,),
+                    ).fetchone()
+                    existing = conn.execute(
+                        "SELECT page_count FROM text_contents WHERE content_hash = ?",
+                        (content_hash,),
+                    ).fetchone()
+
+                    if existing is None:
+                        page_count = self._index_content(conn, content_hash, content)
+                    else:
+                        page_count = existing["page_count"]
+
+                    conn.execute(
+                        "INSERT OR REPLACE INTO text_documents VALUES (?, ?, ?, ?)",
+                        (document_id, content_hash, source, time.time()),
+                    )
+                    if previous is not None and previous["content_hash"] != content_hash:
+                        self._drop_orphan(conn, previous["content_hash"])
+            finally:
+                conn.close()
+
+        return TextIngestResult(
+            documentId=document_id,
+            contentHash=content_hash,
+            pageCount=page_count,
+            skipped=existing is not None,
+        )
+
+    def _index_content(
+        self, conn: sqlite3.Connection, content_hash: str, content: Union[bytes, mmap.mmap]
+    ) -> int:
+        pages = str(content, "utf-8-sig", "replace").split(_PAGE_SEPARATOR)
+        # A trailing form feed ends the last page rather than starting a new one
+        if len(pages) > 1 and not pages[-1].strip():
+            pages.pop()
+
+        total_tokens = 0
+        for page_number, page_text in enumerate(pages, start=1):
+            counts = Counter(tokenize(page_text))
+            token_count = sum(counts.values())
+            total_tokens += token_count
+            conn.execute(
+                "INSERT INTO text_pages VALUES (?, ?, ?, ?)",
+                (content_hash, page_number, token_count, page_text),
+            )
+            conn.executemany(
+                "INSERT INTO text_postings VALUES (?, ?, ?, ?)",
+                ((term, content_hash, page_number, tf) for term, tf in counts.items()),
+            )
+
+        conn.execute(
+            "INSERT INTO text_contents VALUES (?, ?, ?, ?)",
+            (content_hash, len(pages), total_tokens, time.time()),
+        )
+        return len(pages)
+
+    def _drop_orphan(self, conn: sqlite3.Connection, content_hash: str) -> None:
+        still_used = conn.execute(
+            "SELECT 1 FROM text_documents WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone()
+        if still_used is None:
+            for table in ("text_postings", "text_pages", "text_contents"):
+                conn.execute(f"DELETE FROM {table} WHERE content_hash = ?", (content_hash,))
+
+    def search(
+        self,
+        query: str,
+        document_ids: Optional[list[str]] = None,
+        limit: int = 10,
+    ) -> list[TextSearchHit]:
+        """
+        Rank indexed pages against a query using BM25.
+
+        Args:
+            query: Free-text query
+            document_ids: Restrict the search to these documents
+            limit: Maximum number of hits to return
+
+        Returns:
+            Hits ordered by descending score
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        conn = self._connect()
+        try:
+            hash_filter = ""
+            params: list[Any] = []
+            if document_ids:
+                hash_filter = (
+                    " AND p.content_hash IN (SELECT content_hash FROM text_documents "
+                    f"WHERE document_id IN ({', '.join('?' for _ in document_ids)}))"
+                )
+                params = list(document_ids)
+
+            page_total, avg_length = conn.execute(
+                "SELECT COUNT(*), COALESCE(AVG(token_count), 0) FROM text_pages p "
+                f"WHERE 1 = 1{hash_filter}",
+                params,
+            ).fetchone()
+            if not page_total:
+                return []
+
+            scores: dict[tuple[str, int], float] = {}
+            for term in terms:
+                postings = conn.execute(
+                    "SELECT p.content_hash, p.page, p.tf, t.token_count "
+                    "FROM text_postings p JOIN text_pages t "
+                    "ON t.content_hash = p.content_hash AND t.page = p.page "
+                    f"WHERE p.term = ?{hash_filter}",
+                    [term, *params],
+                ).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (page_total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for content_hash, page, tf, length in postings:
+                    norm = _K1 * (1 - _B + _B * length / (avg_length or 1))
+                    key = (content_hash, page)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+            hits: list[TextSearchHit] = []
+            for (content_hash, page), score in ranked:
+                (text,) = conn.execute(
+                    "SELECT text FROM text_pages WHERE content_hash = ? AND page = ?",
+                    (content_hash, page),
+                ).fetchone()
+                owners = [
+                    row["document_id"]
+                    for row in conn.execute(
+                        "SELECT document_id FROM text_documents WHERE content_hash = ? "
+                        "ORDER BY document_id",
+                        (content_hash,),
+                    )
+                    if not document_ids or row["document_id"] in document_ids
+                ]
+                hits.append(
+                    TextSearchHit(
+                        documentIds=owners,
+                        contentHash=content_hash,
+                        page=page,
+                        score=round(score, 4),
+                        snippet=_snippet(text, terms),
+                    )
+                )
+        finally:
+            conn.close()
+
+        return hits
+
+
+__all__ = ["TextIndex", "TextIngestResult", "TextSearchHit", "tokenize"]
@@ -0,0 +1,379 @@
+"""Streaming extraction of ZIP archives returned by Foxit PDF API operations.
+
+Entries are parsed from their local file headers as the download arrives, so
+extraction overlaps with the transfer instead of waiting for the whole archive.
+Entries that cannot be decoded from the stream alone (encrypted entries, other
+compression methods, or stored entries whose size is only known from a trailing
+data descriptor) switch the extractor to a temporary spool file, which is then
+read through the central directory with :mod:`zipfile`. All disk access runs
+on the shared file I/O pool.
+"""
+
+import asyncio
+import hashlib
+import struct
+import tempfile
+import zipfile
+import zlib
+from pathlib import Path, PurePosixPath
+from typing import IO, AsyncIterable, AsyncIterator, Optional, TypedDict
+
+from ..client import file_io
+
+_LOCAL_HEADER_SIG = b"PK\x03\x04"
+_END_OF_CENTRAL_DIR_SIG = b"PK\x05\x06"
+_DATA_DESCRIPTOR_SIG = b"PK\x07\x08"
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_ZIP64_EXTRA_ID = 0x0001
+_ZIP64_LIMIT = 0xFFFFFFFF
+
+_FLAG_ENCRYPTED = 0x0001
+_FLAG_DATA_DESCRIPTOR = 0x0008
+_FLAG_UTF8 = 0x0800
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ZipEntryInfo(TypedDict):
+    """Manifest record for one extracted archive entry."""
+
+    name: str
+    path: str
+    size: int
+    sha256: str
+
+
+class _StreamBuffer:
+    """Accumulates streamed chunks and serves exact-size reads from them."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        self._chunks: AsyncIterator[bytes] = chunks.__aiter__()
+        self._buffer = bytearray()
+        self._eof = False
+        # Absolute archive offset of the first buffered byte
+        self.offset = 0
+
+    async def _fill(self, size: int) -> bool:
+        while len(self._buffer) < size and not self._eof:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._eof = True
+        return len(self._buffer) >= size
+
+    async def peek(self, size: int) -> bytes:
+        await self._fill(size)
+        return bytes(self._buffer[:size])
+
+    async def read_exact(self, size: int) -> bytes:
+        if not await self._fill(size):
+            raise ValueError("ZIP archive ended unexpectedly")
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.offset += size
+        return data
+
+    async def read_some(self, max_size: int) -> bytes:
+        if not await self._fill(1):
+            raise ValueError("ZIP archive ended unexpectedly")
+        data = bytes(self._buffer[:max_size])
+        del self._buffer[:max_size]
+        self.offset += len(data)
+        return data
+
+    def unread(self, data: bytes) -> None:
+        self._buffer[:0] = data
+        self.offset -= len(data)
+
+    async def remaining(self) -> AsyncIterator[bytes]:
+        if self._buffer:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            yield data
+        while not self._eof:
+            try:
+                yield await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._eof = True
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class _EntryWriter:
+    """Writes one entry through the file I/O pool while keeping its chunks in order."""
+
+    def __init__(self, name: str, path: Path) -> None:
+        self.name = name
+        self.path = path
+        self._file: Optional[IO[bytes]] = None
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._pending: Optional[asyncio.Future[None]] = None
+
+    async def write(self, data: bytes) -> None:
+        # Only one write per entry is in flight; other entries proceed in parallel
+        if self._pending is not None:
+            await self._pending
+        self._pending = asyncio.ensure_future(file_io.run(self._write_sync, data))
+
+    async def close(self) -> ZipEntryInfo:
+        if self._pending is not None:
+            await self._pending
+        await file_io.run(self._close_sync)
+        return ZipEntryInfo(
+            name=self.name,
+            path=str(self.path),
+            size=self._size,
+            sha256=self._hash.hexdigest(),
+        )
+
+    async def discard(self) -> None:
+        if self._pending is not None:
+            try:
+                await self._pending
+            except Exception:
+                pass
+        if self._file is not None:
+            await file_io.run(self._file.close)
+
+    def _open(self) -> IO[bytes]:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "wb")
+        return self._file
+
+    def _write_sync(self, data: bytes) -> None:
+        self._open().write(data)
+        self._hash.update(data)
+        self._size += len(data)
+
+    def _close_sync(self) -> None:
+        self._open().close()
+
+
+def _resolve_entry_path(target_dir: Path, name: str) -> Path:
+    """Map an archive entry name to a path inside target_dir, rejecting traversal."""
+    parts = PurePosixPath(name.replace("\\", "/")).parts
+    if parts and parts[0] == "/":
+        raise ValueError(f"Unsafe ZIP entry name: {name}")
+
+    parts = tuple(part for part in parts if part != ".")
+    if not parts or ".." in parts:
+        raise ValueError(f"Unsafe ZIP entry name: {name}")
+
+    return target_dir.joinpath(*parts)
+
+
+def _parse_zip64_extra(extra: bytes, comp_size: int, uncomp_size: int) -> tuple[int, int, bool]:
+    """Read 64-bit sizes from a local header's ZIP64 extra field, if present."""
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, data_size = struct.unpack_from("<HH", extra, pos)
+        if header_id == _ZIP64_EXTRA_ID:
+            data = extra[pos + 4 : pos + 4 + data_size]
+            values = [v[0] for v in struct.iter_unpack("<Q", data[: len(data) // 8 * 8])]
+            if uncomp_size == _ZIP64_LIMIT and values:
+                uncomp_size = values.pop(0)
+            if comp_size == _ZIP64_LIMIT and values:
+                comp_size = values.pop(0)
+            return comp_size, uncomp_size, True
+        pos += 4 + data_size
+    return comp_size, uncomp_size, False
+
+
+async def _copy_stored(reader: _StreamBuffer, size: int, writer: Optional[_EntryWriter]) -> None:
+    remaining = size
+    while remaining:
+        chunk = await reader.read_some(min(remaining, _CHUNK_SIZE))
+        remaining -= len(chunk)
+        if writer is not None:
+            await writer.write(chunk)
+
+
+async def _inflate(
+    reader: _StreamBuffer,
+    comp_size: Optional[int],
+    writer: Optional[_EntryWriter],
+) -> None:
+    """Inflate a deflated entry; without comp_size, stop at the end of the deflate stream."""
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    remaining = comp_size
+
+    while not decompressor.eof:
+        if remaining is not None and remaining <= 0:
+            break
+        max_read = _CHUNK_SIZE if remaining is None else min(remaining, _CHUNK_SIZE)
+        chunk = await reader.read_some(max_read)
+
+        data = decompressor.decompress(chunk, _CHUNK_SIZE)
+        if writer is not None and data:
+            await writer.write(data)
+        # Bound the inflated output held in memory for highly compressible entries
+        while decompressor.unconsumed_tail and not decompressor.eof:
+            data = decompressor.decompress(decompressor.unconsumed_tail, _CHUNK_SIZE)
+            if writer is not None and data:
+                await writer.write(data)
+
+        if decompressor.unused_data:
+            reader.unread(decompressor.unused_data)
+            chunk = chunk[: len(chunk) - len(decompressor.unused_data)]
+        if remaining is not None:
+            remaining -= len(chunk)
+
+    tail = decompressor.flush()
+    if writer is not None and tail:
+        await writer.write(tail)
+    if not decompressor.eof:
+        raise ValueError("Deflate stream ended before its declared size")
+
+
+async def _skip_data_descriptor(reader: _StreamBuffer, zip64: bool) -> None:
+    if await reader.peek(4) == _DATA_DESCRIPTOR_SIG:
+        await reader.read_exact(4)
+    # CRC-32 followed by compressed and uncompressed sizes
+    await reader.read_exact(4 + (16 if zip64 else 8))
+
+
+def _extract_member(
+    archive: zipfile.ZipFile, info: zipfile.ZipInfo, target_dir: Path
+) -> Optional[ZipEntryInfo]:
+    """Extract one member of a spooled archive (runs on the file I/O pool)."""
+    path = _resolve_entry_path(target_dir, info.filename)
+    if info.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+        return None
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with archive.open(info) as source, open(path, "wb") as output:
+        while chunk := source.read(_CHUNK_SIZE):
+            output.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+
+    return ZipEntryInfo(name=info.filename, path=str(path), size=size, sha256=digest.hexdigest())
+
+
+async def _extract_from_spool(
+    reader: _StreamBuffer,
+    target_dir: Path,
+    start_offset: int,
+) -> list[ZipEntryInfo]:
+    """Spool the rest of the archive to disk and extract entries at or after start_offset."""
+    async with file_io.AsyncFile(await file_io.run(tempfile.TemporaryFile)) as spool:
+        # Entries before start_offset were already extracted; leave that region sparse
+        await spool.seek(start_offset)
+        async for chunk in reader.remaining():
+            await spool.write(chunk)
+        await file_io.run(spool.file.flush)
+
+        with await file_io.run(zipfile.ZipFile, spool.file) as archive:
+            members = [info for info in archive.infolist() if info.header_offset >= start_offset]
+            results = await asyncio.gather(
+                *(file_io.run(_extract_member, archive, info, target_dir) for info in members)
+            )
+
+    return [entry for entry in results if entry is not None]
+
+
+async def extract_zip_stream(
+    chunks: AsyncIterable[bytes],
+    target_dir: Path,
+) -> list[ZipEntryInfo]:
+    """Extract a streamed ZIP archive into a directory.
+
+    Args:
+        chunks: Archive content, in order
+        target_dir: Directory to extract entries into
+
+    Returns:
+        Manifest of extracted files in archive order, with sizes and SHA-256 hashes
+
+    Raises:
+        ValueError: If the archive is truncated or contains unsafe entry names
+        zipfile.BadZipFile: If the content is not a valid ZIP archive
+    """
+    reader = _StreamBuffer(chunks)
+    writers: list[_EntryWriter] = []
+    closing: list[asyncio.Future[ZipEntryInfo]] = []
+    spooled: list[ZipEntryInfo] = []
+
+    try:
+        await file_io.run(target_dir.mkdir, parents=True, exist_ok=True)
+
+        while True:
+            signature = await reader.peek(4)
+            if signature != _LOCAL_HEADER_SIG:
+                # Central directory reached (or an empty archive): all entries seen
+                if writers or signature == _END_OF_CENTRAL_DIR_SIG:
+                    break
+                # Unexpected prefix before the first entry; let zipfile sort it out
+                spooled = await _extract_from_spool(reader, target_dir, reader.offset)
+                break
+
+            header_offset = reader.offset
+            header = await reader.read_exact(_LOCAL_HEADER.size)
+            (
+                _signature,
+                _version,
+                flags,
+                method,
+                _mod_time,
+                _mod_date,
+                _crc,
+                comp_size,
+                uncomp_size,
+                name_length,
+                extra_length,
+            ) = _LOCAL_HEADER.unpack(header)
+            raw_name = await reader.read_exact(name_length)
+            extra = await reader.read_exact(extra_length)
+            comp_size, uncomp_size, zip64 = _parse_zip64_extra(extra, comp_size, uncomp_size)
+
+            has_descriptor = bool(flags & _FLAG_DATA_DESCRIPTOR)
+            streamable = not flags & _FLAG_ENCRYPTED and (
+                method == zipfile.ZIP_DEFLATED
+                or (method == zipfile.ZIP_STORED and not has_descriptor)
+            )
+            if not streamable:
+                reader.unread(header + raw_name + extra)
+                spooled = await _extract_from_spool(reader, target_dir, header_offset)
+                break
+
+            name = raw_name.decode("utf-8" if flags & _FLAG_UTF8 else "cp437")
+            path = _resolve_entry_path(target_dir, name)
+            writer: Optional[_EntryWriter] = None
+            if name.endswith("/"):
+                await file_io.run(path.mkdir, parents=True, exist_ok=True)
+            else:
+                writer = _EntryWriter(name, path)
+                writers.append(writer)
+
+            if method == zipfile.ZIP_STORED:
+                await _copy_stored(reader, comp_size, writer)
+            else:
+                await _inflate(reader, None if has_descriptor else comp_size, writer)
+
+            if has_descriptor:
+                await _skip_data_descriptor(reader, zip64)
+
+            if writer is not None:
+                closing.append(asyncio.ensure_future(writer.close()))
+
+        streamed = list(await asyncio.gather(*closing))
+    except BaseException:
+        for future in closing:
+            future.cancel()
+        await asyncio.gather(*(writer.discard() for writer in writers), return_exceptions=True)
+        raise
+    finally:
+        await reader.aclose()
+
+    return streamed + spooled
+
+
+__all__ = ["ZipEntryInfo", "extract_zip_stream"]
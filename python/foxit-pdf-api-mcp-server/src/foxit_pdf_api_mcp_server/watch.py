@@ -0,0 +1,260 @@
+"""Hot-folder mode: run a configured pipeline on every new file dropped into watched directories."""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .client import FoxitPDFClient, file_io
+from .utils import download_to_path
+from .utils.pipeline import PipelineStep, result_extension, run_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+class HotFolderWatcher:
+    """
+    Watches directories and pushes each new, stable file through a pipeline.
+
+    Directories are polled rather than subscribed to, so the watcher works the
+    same on local disks and network shares. A file is picked up once its size
+    and modification time stop changing for stable_seconds. Outcomes are appended
+    to a JSONL progress file; on restart, files already recorded as done (same
+    path, size and modification time) are skipped. A file that fails is retried
+    when it changes or the watcher restarts.
+
+    Results mirror the layout of the watched directory under the output
+    directory and keep the whole source file name, so "a/x.pdf" and "b/x.pdf",
+    or "x.pdf" and "x.tiff", never overwrite each other's result. With several
+    watched directories, each gets a subdirectory named after it.
+    """
+
+    def __init__(
+        self,
+        client: FoxitPDFClient,
+        directories: list[Path],
+        steps: list[PipelineStep],
+        output_dir: Path,
+        workers: int = 4,
+        poll_interval: float = 2.0,
+        stable_seconds: float = 5.0,
+        state_path: Optional[Path] = None,
+        recursive: bool = False,
+        cleanup: bool = True,
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            client: Foxit PDF client instance
+            directories: Directories to watch, with distinct names
+            steps: Pipeline run on each file
+            output_dir: Directory results are written to, outside every watched directory
+            workers: Number of files processed concurrently
+            poll_interval: Seconds between directory scans
+            stable_seconds: Seconds a file must stay unchanged before it is processed
+            state_path: Progress file (default: output_dir/.foxit-watch-state.jsonl)
+            recursive: Also watch subdirectories
+            cleanup: Delete the remote documents of a file once its result is saved
+        """
+        self.client = client
+        self.directories = directories
+        self.steps = steps
+        self.output_dir = output_dir
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stable_seconds = stable_seconds
+        self.state_path = state_path or output_dir / ".foxit-watch-state.jsonl"
+        self.recursive = recursive
+        self.cleanup = cleanup
+
+        self._done: set[str] = set()
+        self._queued: set[str] = set()
+        self._failed: set[str] = set()
+        # Last observed (size, mtime_ns) per path and when it was first seen that way
+        self._observed: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._queue: asyncio.Queue[tuple[Path, str, Path]] = asyncio.Queue()
+
+    @staticmethod
+    def _file_key(path: Path, signature: tuple[int, int]) -> str:
+        return f"{path.resolve()}|{signature[0]}|{signature[1]}"
+
+    def _output_path(self, directory: Path, path: Path) -> Path:
+        """Get where the result of a file found in a watched directory is saved."""
+        relative = path.relative_to(directory)
+        base = self.output_dir / directory.name if len(self.directories) > 1 else self.output_dir
+        return base / relative.parent / (relative.name + result_extension(self.steps))
+
+    def _check_directories(self) -> None:
+        names: set[str] = set()
+        output_dir = self.output_dir.resolve()
+        for directory in self.directories:
+            if not directory.is_dir():
+                raise ValueError(f"Watch directory not found: {directory}")
+            # Results written inside a watched directory would be picked up as new files
+            if output_dir.is_relative_to(directory.resolve()):
+                raise ValueError(f"Output directory {self.output_dir} is inside {directory}")
+            if directory.name in names:
+                raise ValueError(f"Watch directories must have distinct names: {directory.name}")
+            names.add(directory.name)
+
+    def _load_state(self) -> set[str]:
+        done: set[str] = set()
+        if not self.state_path.exists():
+            return done
+        with open(self.state_path, encoding="utf-8") as state:
+            for line in state:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Partially written last line after a crash
+                if record.get("status") == "done":
+                    done.add(record["key"])
+        return done
+
+    def _append_record(self, record: dict[str, Any]) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, "a", encoding="utf-8") as state:
+            state.write(json.dumps(record) + "\n")
+
+    async def _record(self, record: dict[str, Any]) -> None:
+        await file_io.run(self._append_record, record)
+
+    def _list_files(self) -> list[tuple[Path, Path, tuple[int, int], str]]:
+        """List (watched directory, path, (size, mtime_ns), key) of candidate files."""
+        files = []
+        for directory in self.directories:
+            candidates = directory.rglob("*") if self.recursive else directory.glob("*")
+            for path in candidates:
+                # Skip hidden and partially written files (e.g. ".upload.tmp", "x.part")
+                if path.name.startswith(".") or path.suffix in (".part", ".tmp"):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if not path.is_file():
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                files.append((directory, path, signature, self._file_key(path, signature)))
+        return files
+
+    async def _scan(self) -> None:
+        # Directory listings and stats of network shares can be slow; keep them off the loop
+        files = await file_io.run(self._list_files)
+        now = time.monotonic()
+        seen: set[Path] = set()
+
+        for directory, path, signature, key in files:
+            seen.add(path)
+            previous = self._observed.get(path)
+            if previous is None or previous[0] != signature:
+                self._observed[path] = (signature, now)
+                continue
+
+            if (
+                now - previous[1] >= self.stable_seconds
+                and key not in self._done
+                and key not in self._queued
+                and key not in self._failed
+            ):
+                self._queued.add(key)
+                self._queue.put_nowait((path, key, self._output_path(directory, path)))
+
+        for path in set(self._observed) - seen:
+            del self._observed[path]
+
+    async def _process(self, path: Path, key: str, output_path: Path) -> None:
+        started = time.monotonic()
+        created: list[str] = []
+        try:
+            async with await file_io.open_file(path) as file:
+                upload = await self.client.upload_document(file.file, path.name)
+            created.append(upload["documentId"])
+
+            outcome = await run_pipeline(self.client, upload["documentId"], self.steps, created)
+
+            result = outcome["result"]
+            result_document_id = result.get("resultDocumentId")
+            if result_document_id:
+                await download_to_path(self.client, result_document_id, output_path)
+            else:
+                await file_io.write_text(
+                    output_path, json.dumps(result.get("resultData"), indent=2)
+                )
+
+            self._done.add(key)
+            await self._record(
+                {
+                    "key": key,
+                    "path": str(path),
+                    "status": "done",
+                    "output": str(output_path),
+                    "taskIds": outcome["taskIds"],
+                    "seconds": round(time.monotonic() - started, 3),
+                    "finishedAt": time.time(),
+                }
+            )
+            logger.info("Processed %s -> %s", path, output_path)
+        except Exception as error:
+            self._failed.add(key)
+            await self._record(
+                {
+                    "key": key,
+                    "path": str(path),
+                    "status": "failed",
+                    "error": str(error),
+                    "code": getattr(error, "code", "PIPELINE_FAILED"),
+                    "finishedAt": time.time(),
+                }
+            )
+            logger.error("Failed to process %s: %s", path, error)
+        finally:
+            self._queued.discard(key)
+            if self.cleanup:
+                await asyncio.gather(
+                    *(self.client.delete_document(doc_id) for doc_id in created),
+                    return_exceptions=True,
+                )
+
+    async def _worker(self) -> None:
+        while True:
+            path, key, output_path = await self._queue.get()
+            try:
+                await self._process(path, key, output_path)
+            finally:
+                self._queue.task_done()
+
+    async def run(self) -> None:
+        """Watch until cancelled."""
+        await file_io.run(self._check_directories)
+        await file_io.run(self.output_dir.mkdir, parents=True, exist_ok=True)
+        self._done |= await file_io.run(self._load_state)
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        try:
+            while True:
+                await self._scan()
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def run_watcher(watcher: HotFolderWatcher) -> None:
+    """Run a watcher until interrupted, then close the client."""
+    print(
+        f"Watching {', '.join(str(d) for d in watcher.directories)} -> {watcher.output_dir}",
+        file=sys.stderr,
+    )
+    try:
+        await watcher.run()
+    finally:
+        await watcher.client.close()
+
+
+__all__ = ["HotFolderWatcher", "run_watcher"]
@@ -0,0 +1,67 @@
+"""Tests for incremental base64 decoding."""
+
+import base64
+import os
+
+import pytest
+
+from foxit_pdf_api_mcp_server.utils import base64_spool
+from foxit_pdf_api_mcp_server.utils.base64_spool import (
+    ContentTooLargeError,
+    decoded_size,
+    spool_base64,
+)
+
+
+@pytest.mark.parametrize(
+    "encoded, size",
+    [
+        ("", 0),
+        ("QQ==", 1),
+        ("QUI=", 2),
+        ("QUJD", 3),
+        ("QUJD\r\nQQ==\r\n", 4),
+        # Padding split by a line break
+        ("QUJDQQ=\n=", 4),
+        ("  QUJD QUI= \t", 5),
+    ],
+)
+def test_decoded_size(encoded: str, size: int) -> None:
+    assert decoded_size(encoded) == size
+    assert decoded_size(encoded) == len(base64.b64decode("".join(encoded.split())))
+
+
+def test_decoded_size_rejects_bad_length() -> None:
+    with pytest.raises(ValueError, match="multiple of 4"):
+        decoded_size("QUJDQ")
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 1000, 1001, 1002])
+def test_spool_round_trip_across_decode_steps(size: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Steps that cut through line breaks and 4-character groups
+    monkeypatch.setattr(base64_spool, "DECODE_CHUNK_CHARS", 10)
+    data = os.urandom(size)
+    encoded = base64.encodebytes(data).decode("ascii")
+
+    with spool_base64(encoded, max_size=size) as spool:
+        assert spool.read() == data
+
+
+def test_spool_spills_to_disk_past_memory_size() -> None:
+    data = os.urandom(64 * 1024)
+
+    with spool_base64(base64.b64encode(data).decode("ascii"), 1 << 20, memory_size=1024) as spool:
+        assert spool.read() == data
+
+
+def test_spool_rejects_too_large_content_before_decoding() -> None:
+    # Not valid base64, so decoding it would fail with a different error
+    with pytest.raises(ContentTooLargeError) as caught:
+        spool_base64("!!!!" * 4, max_size=11)
+    assert caught.value.code == "FILE_TOO_LARGE"
+
+
+@pytest.mark.parametrize("encoded", ["QUJ!", "QQ==QUJD", "Q===\n"])
+def test_spool_rejects_invalid_base64(encoded: str) -> None:
+    with pytest.raises(ValueError, match="not valid base64"):
+        spool_base64(encoded, max_size=100)
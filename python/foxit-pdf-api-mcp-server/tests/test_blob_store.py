@@ -0,0 +1,156 @@
+"""Tests for the local content-addressed blob store."""
+
+import fcntl
+import hashlib
+import itertools
+import os
+import shutil
+import stat
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from foxit_pdf_api_mcp_server.utils import blob_store as blob_store_module
+from foxit_pdf_api_mcp_server.utils.blob_store import BlobStore
+
+
+async def _chunks(data: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), 3):
+        yield data[start : start + 3]
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> BlobStore:
+    # Strictly increasing access times, so LRU order never depends on clock resolution
+    clock = itertools.count(1000)
+    monkeypatch.setattr(time, "time", lambda: float(next(clock)))
+    return BlobStore(tmp_path / "store", max_bytes=20)
+
+
+async def test_ingest_and_lookup(store: BlobStore) -> None:
+    blob = await store.ingest("doc-1", _chunks(b"hello world"))
+
+    assert blob["size"] == 11
+    assert blob["sha256"] == hashlib.sha256(b"hello world").hexdigest()
+    assert Path(blob["path"]).read_bytes() == b"hello world"
+    assert stat.S_IMODE(os.stat(blob["path"]).st_mode) == 0o444
+    assert store.lookup("doc-1") == blob
+    assert store.lookup("doc-2") is None
+
+
+async def test_same_content_is_stored_once(store: BlobStore) -> None:
+    first = await store.ingest("doc-1", _chunks(b"same"))
+    second = await store.ingest("doc-2", _chunks(b"same"))
+
+    assert first == second
+    assert store.stats() == {"blobs": 1, "documents": 2, "bytes": 4, "maxBytes": 20}
+
+
+async def test_trim_evicts_least_recently_used(store: BlobStore) -> None:
+    await store.ingest("a", _chunks(b"a" * 8))
+    await store.ingest("b", _chunks(b"b" * 8))
+    assert store.lookup("a") is not None
+    await store.ingest("c", _chunks(b"c" * 8))
+
+    assert store.trim() == 8
+    assert store.lookup("b") is None
+    assert store.lookup("a") is not None
+    assert store.lookup("c") is not None
+
+
+async def test_held_content_survives_trim_until_released(store: BlobStore) -> None:
+    held = await store.ingest("a", _chunks(b"a" * 12), hold=True)
+    other = await store.ingest("b", _chunks(b"b" * 12))
+
+    # "a" is least recently used but held, so "b" goes instead
+    assert store.trim() == 12
+    assert Path(held["path"]).exists()
+    assert not Path(other["path"]).exists()
+
+    again = store.lookup("a", hold=True)
+    assert again is not None
+    store.release(held)
+    newer = await store.ingest("c", _chunks(b"c" * 12))
+    # Still held once
+    assert store.trim() == 12
+    assert Path(held["path"]).exists()
+    assert not Path(newer["path"]).exists()
+
+    store.release(again)
+    await store.ingest("d", _chunks(b"d" * 12))
+    assert store.trim() == 12
+    assert not Path(held["path"]).exists()
+
+
+async def test_changed_blob_is_dropped_on_lookup(store: BlobStore) -> None:
+    blob = await store.ingest("doc-1", _chunks(b"original"))
+    path = Path(blob["path"])
+    path.chmod(0o644)
+    path.write_bytes(b"tampered content")
+
+    assert store.lookup("doc-1") is None
+    assert not path.exists()
+
+
+async def test_materialize_copies_when_reflink_fails(
+    store: BlobStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(*args: object) -> None:
+        raise OSError("reflink not supported")
+
+    monkeypatch.setattr(fcntl, "ioctl", fail)
+    blob = await store.ingest("doc-1", _chunks(b"content"))
+    output = tmp_path / "out" / "doc.pdf"
+
+    await store.materialize(blob, output)
+
+    assert output.read_bytes() == b"content"
+    result = os.stat(output)
+    assert result.st_ino != os.stat(blob["path"]).st_ino
+    assert result.st_nlink == 1
+    assert stat.S_IMODE(result.st_mode) & 0o200
+    assert not output.with_name("doc.pdf.part").exists()
+
+
+async def test_materialize_uses_reflink_when_available(
+    store: BlobStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def clone(source: Path, target: Path) -> bool:
+        target.write_bytes(source.read_bytes())
+        return True
+
+    def no_copy(*args: object) -> None:
+        raise AssertionError("copied instead of reflinking")
+
+    monkeypatch.setattr(blob_store_module, "_reflink", clone)
+    monkeypatch.setattr(shutil, "copyfile", no_copy)
+    blob = await store.ingest("doc-1", _chunks(b"content"))
+    output = tmp_path / "doc.pdf"
+
+    await store.materialize(blob, output)
+
+    assert output.read_bytes() == b"content"
+
+
+async def test_eviction_leaves_materialized_file_alone(store: BlobStore, tmp_path: Path) -> None:
+    blob = await store.ingest("doc-1", _chunks(b"x" * 16))
+    output = tmp_path / "doc.pdf"
+    await store.materialize(blob, output)
+    mode = stat.S_IMODE(os.stat(output).st_mode)
+
+    await store.ingest("doc-2", _chunks(b"y" * 16))
+    store.trim()
+
+    assert store.lookup("doc-1") is None
+    assert output.read_bytes() == b"x" * 16
+    assert stat.S_IMODE(os.stat(output).st_mode) == mode
+
+
+async def test_ingest_rejects_oversized_content(store: BlobStore) -> None:
+    with pytest.raises(ValueError, match="exceeds"):
+        await store.ingest("doc-1", _chunks(b"x" * 30), max_size=10)
+
+    assert store.lookup("doc-1") is None
+    assert list((store.root / "tmp").iterdir()) == []
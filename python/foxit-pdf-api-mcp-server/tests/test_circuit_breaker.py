@@ -0,0 +1,134 @@
+"""Tests for the per-path circuit breakers."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from foxit_pdf_api_mcp_server.client import circuit_breaker
+from foxit_pdf_api_mcp_server.client.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreakers,
+    path_template,
+)
+
+KEY = "POST /api/documents/ocr/pdf-ocr"
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def breakers(clock: SimpleNamespace) -> CircuitBreakers:
+    return CircuitBreakers(failure_threshold=3, cooldown=30.0, half_open_probes=1)
+
+
+def _state(breakers: CircuitBreakers, key: str = KEY) -> str:
+    return str(next(stats["state"] for stats in breakers.stats() if stats["key"] == key))
+
+
+def _fail(breakers: CircuitBreakers, times: int, key: str = KEY) -> None:
+    for _ in range(times):
+        assert breakers.before_call(key) is None
+        breakers.after_call(key, False)
+
+
+@pytest.mark.parametrize(
+    "method, path, key",
+    [
+        ("GET", "/api/tasks/abc123", "GET /api/tasks/{taskId}"),
+        (
+            "GET",
+            "api/documents/doc-1/download?filename=a.pdf",
+            "GET /api/documents/{documentId}/download",
+        ),
+        ("DELETE", "/api/documents/doc-1", "DELETE /api/documents/{documentId}"),
+        ("POST", "/api/documents/upload", "POST /api/documents/upload"),
+    ],
+)
+def test_path_template(method: str, path: str, key: str) -> None:
+    assert path_template(method, path) == key
+
+
+def test_opens_after_consecutive_failures(breakers: CircuitBreakers) -> None:
+    _fail(breakers, 2)
+    breakers.before_call(KEY)
+    breakers.after_call(KEY, True)
+    # A success resets the count
+    _fail(breakers, 2)
+    assert _state(breakers) == CLOSED
+
+    _fail(breakers, 1)
+
+    assert _state(breakers) == OPEN
+    assert breakers.before_call(KEY) == 30.0
+
+
+def test_open_breaker_rejects_until_cooldown_passes(
+    breakers: CircuitBreakers, clock: SimpleNamespace
+) -> None:
+    _fail(breakers, 3)
+
+    clock.now += 20
+    assert breakers.before_call(KEY) == pytest.approx(10.0)
+    assert breakers.stats()[0]["retryInSeconds"] == 10.0
+    assert breakers.stats()[0]["rejected"] == 1
+
+    clock.now += 10
+    assert breakers.before_call(KEY) is None
+    assert _state(breakers) == HALF_OPEN
+
+
+def test_half_open_allows_one_probe_and_closes_on_success(
+    breakers: CircuitBreakers, clock: SimpleNamespace
+) -> None:
+    _fail(breakers, 3)
+    clock.now += 30
+
+    assert breakers.before_call(KEY) is None
+    # The probe slot is taken
+    assert breakers.before_call(KEY) == 0.0
+    breakers.after_call(KEY, True)
+
+    assert _state(breakers) == CLOSED
+    assert breakers.stats()[0]["consecutiveFailures"] == 0
+    assert breakers.before_call(KEY) is None
+
+
+def test_failed_probe_opens_for_another_cooldown(
+    breakers: CircuitBreakers, clock: SimpleNamespace
+) -> None:
+    _fail(breakers, 3)
+    clock.now += 30
+
+    assert breakers.before_call(KEY) is None
+    breakers.after_call(KEY, False)
+
+    assert _state(breakers) == OPEN
+    assert breakers.before_call(KEY) == 30.0
+
+
+def test_abandoned_probe_frees_its_slot(breakers: CircuitBreakers, clock: SimpleNamespace) -> None:
+    _fail(breakers, 3)
+    clock.now += 30
+
+    assert breakers.before_call(KEY) is None
+    breakers.after_call(KEY, None)
+
+    assert _state(breakers) == HALF_OPEN
+    assert breakers.before_call(KEY) is None
+
+
+def test_breakers_are_independent(breakers: CircuitBreakers) -> None:
+    other = "POST /api/documents/upload"
+    _fail(breakers, 3)
+
+    assert breakers.before_call(other) is None
+    breakers.after_call(other, True)
+    # Successes alone leave no breaker behind
+    assert [stats["key"] for stats in breakers.stats()] == [KEY]
@@ -0,0 +1,161 @@
+"""Tests for the document registry and its collector across restarts."""
+
+import json
+import time
+from pathlib import Path
+
+import httpx
+
+from foxit_pdf_api_mcp_server.client.document_registry import DocumentRegistry
+from foxit_pdf_api_mcp_server.client.foxit_client import FoxitPDFClient
+from foxit_pdf_api_mcp_server.utils.document_gc import DocumentCollector
+
+PRIMARY = "https://primary.example.com"
+FALLBACK = "https://fallback.example.com"
+
+
+class _Api:
+    """Mock API that remembers which account and region created each document."""
+
+    def __init__(self) -> None:
+        self.owners: dict[str, tuple[str, str]] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        owner = (f"{request.url.scheme}://{request.url.host}", request.headers["client_id"])
+        if request.url.path == "/api/documents/upload":
+            document_id = f"doc-{len(self.owners) + 1}"
+            self.owners[document_id] = owner
+            return httpx.Response(200, json={"documentId": document_id})
+        if request.method == "DELETE":
+            document_id = request.url.path.rsplit("/", 1)[1]
+            # Documents of another account or region are not found
+            if self.owners.get(document_id) != owner:
+                return httpx.Response(404, json={"message": "Document not found"})
+            del self.owners[document_id]
+            return httpx.Response(200, json={})
+        return httpx.Response(404, json={"message": "Not found"})
+
+
+def _client(api: _Api, credentials: list[tuple[str, str]], base_urls: list[str]) -> FoxitPDFClient:
+    client = FoxitPDFClient(
+        base_urls[0],
+        *credentials[0],
+        fallback_base_urls=base_urls[1:],
+        extra_credentials=credentials[1:],
+        coalesce_operations=False,
+    )
+    for credential in client.credentials.credentials:
+        credential.http = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    return client
+
+
+def _collector(client: FoxitPDFClient, state_path: Path, **kwargs: bool) -> DocumentCollector:
+    return DocumentCollector(
+        client,
+        ttl=3600,
+        superseded_grace=300,
+        interval=60,
+        concurrency=2,
+        deletes_per_second=1000,
+        state_path=state_path,
+        **kwargs,
+    )
+
+
+async def test_restart_deletes_with_the_creating_credential(tmp_path: Path) -> None:
+    api = _Api()
+    credentials = [("first-id", "secret"), ("second-id", "secret")]
+    client = _client(api, credentials, [PRIMARY, FALLBACK])
+    # Load every credential but the second, so new work goes to it
+    client.credentials.primary.pending = 100
+    upload = await client.upload_document(b"%PDF", "a.pdf")
+    client.documents.request_delete(upload["documentId"])
+    await _collector(client, tmp_path / "documents.json").save()
+    await client.close()
+
+    restarted = _client(api, credentials, [PRIMARY, FALLBACK])
+    collector = _collector(restarted, tmp_path / "documents.json")
+    collector.load()
+    result = await collector.collect(requested_only=True)
+
+    assert result["deleted"] == [upload["documentId"]]
+    assert api.owners == {}
+    await restarted.close()
+
+
+async def test_documents_of_removed_credential_are_not_collected(tmp_path: Path) -> None:
+    api = _Api()
+    client = _client(api, [("first-id", "secret"), ("second-id", "secret")], [PRIMARY])
+    client.credentials.primary.pending = 100
+    upload = await client.upload_document(b"%PDF", "a.pdf")
+    client.documents.request_delete(upload["documentId"])
+    await _collector(client, tmp_path / "documents.json").save()
+    await client.close()
+
+    restarted = _client(api, [("first-id", "secret")], [PRIMARY])
+    collector = _collector(restarted, tmp_path / "documents.json")
+    collector.load()
+    result = await collector.collect(requested_only=True)
+
+    assert result["deleted"] == []
+    assert restarted.documents.get(upload["documentId"]) is not None
+    assert upload["documentId"] in api.owners
+    await restarted.close()
+
+
+def test_state_without_routes_uses_the_primary(tmp_path: Path) -> None:
+    state_path = tmp_path / "documents.json"
+    state_path.write_text(
+        json.dumps(
+            [
+                {
+                    "documentId": "doc-1",
+                    "origin": "upload",
+                    "taskId": None,
+                    "inputs": [],
+                    "createdAt": 1.0,
+                    "pinned": False,
+                    "supersededAt": None,
+                    "deleteRequested": True,
+                }
+            ]
+        )
+    )
+    client = _client(_Api(), [("first-id", "secret"), ("second-id", "secret")], [PRIMARY])
+    client.documents.load(state_path)
+
+    assert client.restore_routes() == []
+    assert client.credentials.credential_for("doc-1") is client.credentials.primary
+
+
+async def test_sweep_without_deletion_forgets_expired_records(tmp_path: Path) -> None:
+    api = _Api()
+    client = _client(api, [("first-id", "secret")], [PRIMARY])
+    old = await client.upload_document(b"%PDF", "old.pdf")
+    pinned = await client.upload_document(b"%PDF", "pinned.pdf")
+    recent = await client.upload_document(b"%PDF", "recent.pdf")
+    for document_id in (old["documentId"], pinned["documentId"]):
+        document = client.documents.get(document_id)
+        assert document is not None
+        document["createdAt"] -= 7200
+    client.documents.pin(pinned["documentId"])
+
+    await _collector(client, tmp_path / "documents.json", delete_expired=False).sweep()
+
+    assert [doc["documentId"] for doc in client.documents.all()] == [
+        pinned["documentId"],
+        recent["documentId"],
+    ]
+    # Forgotten, not deleted
+    assert old["documentId"] in api.owners
+    await client.close()
+
+
+def test_expired_tasks_release_their_inputs() -> None:
+    registry = DocumentRegistry()
+    registry.record_task("stale", "/ops/compress", ["doc-1"])
+    registry.record_task("fresh", "/ops/compress", ["doc-2"])
+    registry._tasks["stale"] = ("/ops/compress", ["doc-1"], time.time() - 7200)
+
+    assert registry.expire_tasks(time.time() - 3600) == ["stale"]
+    assert registry.in_use() == {"doc-2"}
@@ -0,0 +1,87 @@
+"""Tests for the file I/O thread pool."""
+
+import asyncio
+import builtins
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any
+
+import pytest
+
+from foxit_pdf_api_mcp_server.client import file_io
+
+MB = 1024 * 1024
+
+
+class _SlowFile:
+    """File proxy whose reads block like a slow disk."""
+
+    def __init__(self, file: IO[bytes], latency: float) -> None:
+        self._file = file
+        self._latency = latency
+
+    def read(self, size: int = -1) -> bytes:
+        time.sleep(self._latency)
+        return self._file.read(size)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+
+@pytest.fixture
+def large_file(tmp_path: Path) -> Path:
+    path = tmp_path / "large.bin"
+    with open(path, "wb") as file:
+        file.truncate(100 * MB)
+    return path
+
+
+async def test_timer_keeps_cadence_during_large_read(
+    large_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    latency = 0.1
+
+    def slow_open(path: Any, *args: Any, **kwargs: Any) -> Any:
+        return _SlowFile(builtins.open(path, *args, **kwargs), latency)
+
+    monkeypatch.setattr(file_io, "open", slow_open, raising=False)
+
+    interval = 0.005
+    lateness: list[float] = []
+    stop = asyncio.Event()
+
+    async def tick() -> None:
+        while not stop.is_set():
+            due = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            lateness.append(time.monotonic() - due)
+
+    ticker = asyncio.create_task(tick())
+    size = 0
+    async for chunk in file_io.iter_file(large_file, chunk_size=10 * MB):
+        size += len(chunk)
+    stop.set()
+    await ticker
+
+    assert size == 100 * MB
+    # A read on the loop would hold every tick back by the full disk latency
+    assert len(lateness) > 10
+    assert max(lateness) < latency / 2
+
+
+async def test_run_uses_pool_thread() -> None:
+    name = await file_io.run(lambda: threading.current_thread().name)
+
+    assert name.startswith("foxit-file-io")
+
+
+async def test_open_file_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "data.bin"
+    await file_io.write_bytes(path, b"abc")
+
+    async with await file_io.open_file(path, "ab") as file:
+        await file.write(b"def")
+    chunks = [chunk async for chunk in file_io.iter_file(path, chunk_size=2)]
+
+    assert chunks == [b"ab", b"cd", b"ef"]
@@ -0,0 +1,85 @@
+"""Tests for filling one form template with many records."""
+
+import json
+from pathlib import Path
+
+import httpx
+
+from foxit_pdf_api_mcp_server.client.foxit_client import FoxitPDFClient
+from foxit_pdf_api_mcp_server.utils.form_fill import FormFillRunner, load_records
+
+
+class _Api:
+    """Mock API whose form imports complete at once with a new result document."""
+
+    def __init__(self) -> None:
+        self.imports = 0
+        self.results: dict[str, bytes] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/documents/forms/import-pdf-form-data":
+            self.imports += 1
+            self.results[f"result-{self.imports}"] = request.content
+            return httpx.Response(200, json={"taskId": f"task-{self.imports}"})
+        if path.startswith("/api/tasks/"):
+            task_id = path.rsplit("/", 1)[1]
+            return httpx.Response(
+                200,
+                json={
+                    "taskId": task_id,
+                    "status": "COMPLETED",
+                    "resultDocumentId": task_id.replace("task", "result"),
+                },
+            )
+        if path.endswith("/download"):
+            return httpx.Response(200, content=self.results[path.split("/")[-2]])
+        return httpx.Response(404, json={"message": "Not found"})
+
+
+def _client(api: _Api) -> FoxitPDFClient:
+    client = FoxitPDFClient("https://api.example.com", "client-id", "secret", poll_interval=0)
+    client.credentials.primary.http = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    return client
+
+
+def _write_records(path: Path, records: list[dict[str, str]]) -> Path:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+async def test_each_record_gets_its_own_form(tmp_path: Path) -> None:
+    api = _Api()
+    client = _client(api)
+    records = load_records(
+        _write_records(tmp_path / "records.jsonl", [{"id": "a"}, {"id": "b"}]), "id"
+    )
+
+    summary, failures = await FormFillRunner(client, "template", records, tmp_path / "out").run()
+
+    assert (summary["succeeded"], failures) == (2, [])
+    assert b'"a"' in (tmp_path / "out" / "a.pdf").read_bytes()
+    assert b'"b"' in (tmp_path / "out" / "b.pdf").read_bytes()
+    queued = {doc["documentId"] for doc in client.documents.all() if doc["deleteRequested"]}
+    assert queued == {"result-1", "result-2"}
+    await client.close()
+
+
+async def test_identical_records_share_one_import(tmp_path: Path) -> None:
+    api = _Api()
+    client = _client(api)
+    records = load_records(
+        _write_records(tmp_path / "records.jsonl", [{"name": "same"}] * 3 + [{"name": "other"}])
+    )
+
+    summary, failures = await FormFillRunner(
+        client, "template", records, tmp_path / "out", concurrency=4
+    ).run()
+
+    assert (summary["succeeded"], failures) == (4, [])
+    assert api.imports == 2
+    assert len(list((tmp_path / "out").glob("*.pdf"))) == 4
+    # The shared result is queued for deletion once all its records are saved
+    assert all(doc["deleteRequested"] for doc in client.documents.all())
+    assert len(client.documents.all()) == 2
+    await client.close()
@@ -0,0 +1,168 @@
+"""Tests for hedged requests and their rate cap."""
+
+import asyncio
+
+import pytest
+
+from foxit_pdf_api_mcp_server.client.hedging import MAX_BURST, MIN_SAMPLES, HedgePolicy
+
+KEY = "GET /api/tasks/{taskId}"
+
+
+def _policy(max_rate: float = 0.05, latency: float = 0.01) -> HedgePolicy:
+    """A policy whose hedge delay for KEY is already known."""
+    policy = HedgePolicy(percentile=95.0, max_rate=max_rate, min_delay=0.001)
+    for _ in range(MIN_SAMPLES):
+        policy.record(KEY, latency)
+    return policy
+
+
+class _Attempts:
+    """Attempts that each wait for their own release, numbered from zero."""
+
+    def __init__(self, count: int = 2) -> None:
+        self.releases = [asyncio.Event() for _ in range(count)]
+        self.started = 0
+        self.cancelled: list[int] = []
+
+    async def __call__(self) -> str:
+        number = self.started
+        self.started += 1
+        try:
+            await self.releases[number].wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(number)
+            raise
+        return f"answer-{number}"
+
+
+def _hedged(policy: HedgePolicy) -> dict[str, object]:
+    return next(stats for stats in policy.stats() if stats["key"] == KEY)
+
+
+def test_no_delay_before_enough_samples() -> None:
+    policy = HedgePolicy()
+    for _ in range(MIN_SAMPLES - 1):
+        policy.record(KEY, 0.5)
+
+    assert policy.delay(KEY) is None
+    policy.record(KEY, 0.5)
+    assert policy.delay(KEY) == 0.5
+
+
+def test_delay_is_latency_percentile_with_floor() -> None:
+    policy = HedgePolicy(percentile=90.0, min_delay=0.05)
+    for latency in range(1, 101):
+        policy.record(KEY, latency / 1000)
+
+    assert policy.delay(KEY) == pytest.approx(0.09)
+    assert _policy(latency=0.0001).delay(KEY) == 0.001
+
+
+def test_zero_rate_disables_hedging() -> None:
+    policy = _policy(max_rate=0)
+
+    assert policy.delay(KEY) is None
+    assert not policy.acquire(KEY)
+
+
+def test_token_bucket_caps_hedge_rate() -> None:
+    policy = HedgePolicy(max_rate=0.5)
+
+    # A full burst first, then one hedge per 1 / max_rate requests
+    assert sum(policy.acquire(KEY) for _ in range(20)) == MAX_BURST
+    policy.record(KEY, 0.1)
+    assert not policy.acquire(KEY)
+    policy.record(KEY, 0.1)
+    assert policy.acquire(KEY)
+    assert not policy.acquire(KEY)
+
+
+def test_tokens_never_exceed_burst() -> None:
+    policy = HedgePolicy(max_rate=1.0)
+    for _ in range(100):
+        policy.record(KEY, 0.1)
+
+    assert sum(policy.acquire(KEY) for _ in range(100)) == MAX_BURST
+
+
+async def test_fast_answer_is_not_hedged() -> None:
+    policy = _policy(latency=10.0)
+    attempts = _Attempts()
+    attempts.releases[0].set()
+
+    assert await policy.run(KEY, attempts) == "answer-0"
+    assert attempts.started == 1
+
+
+async def test_hedge_wins_and_primary_is_cancelled() -> None:
+    policy = _policy()
+    attempts = _Attempts()
+    attempts.releases[1].set()
+
+    assert await policy.run(KEY, attempts) == "answer-1"
+    assert attempts.cancelled == [0]
+    assert _hedged(policy)["hedged"] == 1
+    assert _hedged(policy)["hedgeWins"] == 1
+
+
+async def test_primary_wins_and_hedge_is_cancelled() -> None:
+    policy = _policy()
+    attempts = _Attempts()
+
+    run = asyncio.create_task(policy.run(KEY, attempts))
+    while attempts.started < 2:
+        await asyncio.sleep(0.001)
+    attempts.releases[0].set()
+
+    assert await run == "answer-0"
+    assert attempts.cancelled == [1]
+    assert _hedged(policy)["hedgeWins"] == 0
+
+
+async def test_answer_of_finished_loser_is_discarded() -> None:
+    policy = _policy()
+    attempts = _Attempts()
+    discarded: list[str] = []
+
+    async def discard(answer: str) -> None:
+        discarded.append(answer)
+
+    run = asyncio.create_task(policy.run(KEY, attempts, discard))
+    while attempts.started < 2:
+        await asyncio.sleep(0.001)
+    # Both answer in the same loop iteration: the primary wins, the hedge is released
+    attempts.releases[0].set()
+    attempts.releases[1].set()
+
+    assert await run == "answer-0"
+    assert discarded == ["answer-1"]
+
+
+async def test_no_hedge_once_budget_is_spent() -> None:
+    policy = _policy()
+    while policy.acquire(KEY):
+        pass
+    attempts = _Attempts()
+
+    run = asyncio.create_task(policy.run(KEY, attempts))
+    await asyncio.sleep(0.05)
+    attempts.releases[0].set()
+
+    assert await run == "answer-0"
+    assert attempts.started == 1
+
+
+async def test_primary_error_when_both_fail() -> None:
+    policy = _policy()
+    started: list[int] = []
+
+    async def fail() -> str:
+        number = len(started)
+        started.append(number)
+        await asyncio.sleep(0.02 if number == 0 else 0)
+        raise ValueError(f"failed-{number}")
+
+    with pytest.raises(ValueError, match="failed-0"):
+        await policy.run(KEY, fail)
+    assert started == [0, 1]
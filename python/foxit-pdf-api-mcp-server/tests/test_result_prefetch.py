@@ -0,0 +1,65 @@
+"""Tests for background prefetching of task results."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from foxit_pdf_api_mcp_server.client.deadline import deadline
+from foxit_pdf_api_mcp_server.utils.blob_store import BlobStore
+from foxit_pdf_api_mcp_server.utils.result_prefetch import ResultPrefetcher
+
+
+class _SlowClient:
+    """Client whose downloads send one chunk, then stall until released."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def iter_document(self, document_id: str) -> AsyncIterator[bytes]:
+        yield b"%PDF-"
+        await self.release.wait()
+        yield b"1.7"
+
+
+def _prefetcher(tmp_path: Path, client: Any) -> ResultPrefetcher:
+    store = BlobStore(tmp_path / "store", max_bytes=1024)
+    return ResultPrefetcher(client, store, max_document_bytes=1024, ttl=60, concurrency=2)
+
+
+async def test_wait_returns_once_prefetch_is_stored(tmp_path: Path) -> None:
+    client = _SlowClient()
+    prefetcher = _prefetcher(tmp_path, client)
+    prefetcher.schedule({"taskId": "task-1", "status": "COMPLETED", "resultDocumentId": "doc-1"})
+
+    waiter = asyncio.create_task(prefetcher.wait("doc-1"))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    client.release.set()
+    await waiter
+
+    blob = prefetcher.blob_store.lookup("doc-1")
+    assert blob is not None and Path(blob["path"]).read_bytes() == b"%PDF-1.7"
+
+
+async def test_wait_ends_at_the_call_deadline(tmp_path: Path) -> None:
+    client = _SlowClient()
+    prefetcher = _prefetcher(tmp_path, client)
+    prefetcher.schedule({"taskId": "task-1", "status": "COMPLETED", "resultDocumentId": "doc-1"})
+
+    started = time.monotonic()
+    with deadline(0.05):
+        await prefetcher.wait("doc-1")
+
+    assert time.monotonic() - started < 1
+    # The prefetch keeps running for later callers
+    client.release.set()
+    await prefetcher.wait("doc-1")
+    assert prefetcher.blob_store.lookup("doc-1") is not None
+    await prefetcher.close()
+
+
+async def test_wait_without_prefetch_returns_at_once(tmp_path: Path) -> None:
+    prefetcher = _prefetcher(tmp_path, _SlowClient())
+
+    await asyncio.wait_for(prefetcher.wait("doc-1"), timeout=1)
@@ -0,0 +1,206 @@
+"""Tests for coalescing identical concurrent calls and operations."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from foxit_pdf_api_mcp_server.client import single_flight
+from foxit_pdf_api_mcp_server.client.deadline import deadline
+from foxit_pdf_api_mcp_server.client.document_registry import DocumentRegistry, track_call
+from foxit_pdf_api_mcp_server.client.single_flight import (
+    OperationCoalescer,
+    SingleFlight,
+    operation_key,
+)
+
+
+class _Call:
+    """A call that runs until released, counting how often it was started."""
+
+    def __init__(self, result: str = "result") -> None:
+        self.result = result
+        self.started = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> str:
+        self.started += 1
+        await self.release.wait()
+        return self.result
+
+
+def test_operation_key_ignores_field_order_and_none() -> None:
+    first = operation_key("/ops/compress", {"documentId": "a", "level": "HIGH", "password": None})
+    second = operation_key("/ops/compress", {"level": "HIGH", "documentId": "a"})
+
+    assert first == second
+    assert first != operation_key("/ops/compress", {"documentId": "b", "level": "HIGH"})
+    assert first != operation_key("/ops/flatten", {"documentId": "a", "level": "HIGH"})
+
+
+async def test_concurrent_callers_share_one_call() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+    call = _Call()
+
+    waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(3)]
+    other = asyncio.create_task(flight.do("other", call))
+    await asyncio.sleep(0)
+    assert flight.in_flight("key")
+    call.release.set()
+
+    assert await asyncio.gather(*waiters, other) == ["result"] * 4
+    assert call.started == 2
+    assert flight.coalesced == 2
+    assert not flight.in_flight("key")
+
+
+async def test_cancelled_caller_does_not_cancel_the_others() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+    call = _Call()
+
+    first = asyncio.create_task(flight.do("key", call))
+    second = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await second == "result"
+    assert first.cancelled()
+    assert call.started == 1
+
+
+async def test_caller_deadline_does_not_cut_the_call_short() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+    call = _Call()
+
+    async def impatient() -> str:
+        with deadline(0.01):
+            return await flight.do("key", call)
+
+    starter = asyncio.create_task(impatient())
+    patient = asyncio.create_task(flight.do("key", call))
+    with pytest.raises(TimeoutError):
+        await starter
+    call.release.set()
+
+    assert await patient == "result"
+    assert call.started == 1
+
+
+async def test_failure_reaches_every_caller() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+
+    async def fail() -> str:
+        await asyncio.sleep(0)
+        raise ValueError("failed")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert not flight.in_flight("key")
+
+
+async def test_identical_submissions_attach_to_one_task() -> None:
+    coalescer = OperationCoalescer(max_age=60)
+    call = _Call("task-1")
+
+    first = asyncio.create_task(coalescer.submit("key", call))
+    second = asyncio.create_task(coalescer.submit("key", call))
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert list(await asyncio.gather(first, second)) == ["task-1", "task-1"]
+    # Submitted, so later identical submissions attach without another call
+    assert await coalescer.submit("key", call) == "task-1"
+    assert call.started == 1
+    assert coalescer.is_shared("task-1")
+    assert coalescer.stats() == {"inFlight": 1, "coalesced": 2}
+
+
+async def test_finished_task_is_no_longer_shared() -> None:
+    coalescer = OperationCoalescer(max_age=60)
+    calls = iter(["task-1", "task-2"])
+
+    async def submit() -> str:
+        return next(calls)
+
+    assert await coalescer.submit("key", submit) == "task-1"
+    assert not coalescer.is_shared("task-1")
+    coalescer.finished("task-1")
+
+    assert await coalescer.submit("key", submit) == "task-2"
+    assert coalescer.stats() == {"inFlight": 1, "coalesced": 0}
+
+
+async def test_submission_is_shared_only_until_max_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(single_flight, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    coalescer = OperationCoalescer(max_age=10)
+    calls = iter(["task-1", "task-2"])
+
+    async def submit() -> str:
+        return next(calls)
+
+    assert await coalescer.submit("key", submit) == "task-1"
+    clock.now += 5
+    assert await coalescer.submit("key", submit) == "task-1"
+    assert coalescer.is_shared("task-1")
+
+    clock.now += 11
+    assert await coalescer.submit("key", submit) == "task-2"
+    # Shared status lapses with the submission it belonged to
+    assert not coalescer.is_shared("task-1")
+
+
+def test_abandon_keeps_shared_tasks_and_queues_the_rest() -> None:
+    registry = DocumentRegistry()
+    with track_call() as call:
+        upload = registry.record_upload("upload-1")
+        for task_id in ("running", "shared", "finished"):
+            registry.record_task(task_id, "/ops/compress", ["upload-1"])
+            registry.track_task(task_id)
+    finished = registry.record_task_finished("finished", "result-finished")
+
+    running = registry.abandon(call, shared_tasks={"shared"})
+
+    assert running == ["running"]
+    assert upload["deleteRequested"]
+    assert finished is not None and finished["deleteRequested"]
+    # Results of the abandoned task are queued when it finishes; the shared one is kept
+    running_result = registry.record_task_finished("running", "result-running")
+    shared_result = registry.record_task_finished("shared", "result-shared")
+    assert running_result is not None and running_result["deleteRequested"]
+    assert shared_result is not None and not shared_result["deleteRequested"]
+
+
+def test_keep_results_undoes_abandon() -> None:
+    registry = DocumentRegistry()
+    with track_call() as call:
+        registry.record_task("running", "/ops/compress", [])
+        registry.track_task("running")
+        registry.record_task("finished", "/ops/compress", [])
+        registry.track_task("finished")
+    registry.record_task_finished("finished", "result-finished")
+    registry.abandon(call)
+
+    registry.keep_results("running")
+    registry.keep_results("finished")
+
+    running_result = registry.record_task_finished("running", "result-running")
+    assert running_result is not None and not running_result["deleteRequested"]
+    finished_result = registry.get("result-finished")
+    assert finished_result is not None and not finished_result["deleteRequested"]
+
+
+def test_track_task_records_each_task_once_per_call() -> None:
+    registry = DocumentRegistry()
+    registry.track_task("outside")
+
+    with track_call() as call:
+        registry.track_task("task-1")
+        registry.track_task("task-1")
+
+    assert call.tasks == ["task-1"]
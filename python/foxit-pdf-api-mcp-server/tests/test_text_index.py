@@ -0,0 +1,108 @@
+"""Tests for the full-text index and its BM25 ranking."""
+
+from pathlib import Path
+
+import pytest
+
+from foxit_pdf_api_mcp_server.utils.text_index import TextIndex, tokenize
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> TextIndex:
+    return TextIndex(tmp_path / "text.db")
+
+
+def _pages(*pages: str) -> bytes:
+    return "\f".join(pages).encode("utf-8")
+
+
+def test_tokenize() -> None:
+    assert tokenize("Invoice #42: Total, total!") == ["invoice", "42", "total", "total"]
+
+
+def test_ranks_higher_term_frequency_first(index: TextIndex) -> None:
+    index.ingest(
+        "doc-1",
+        _pages(
+            "invoice total due now please",
+            "invoice invoice invoice total due",
+            "shipping address and contact",
+        ),
+        "test",
+    )
+
+    hits = index.search("invoice")
+
+    assert [hit["page"] for hit in hits] == [2, 1]
+    assert hits[0]["score"] > hits[1]["score"] > 0
+
+
+def test_ranks_rarer_terms_higher(index: TextIndex) -> None:
+    index.ingest(
+        "doc-1",
+        _pages("common rare", "common filler", "common filler", "common filler"),
+        "test",
+    )
+
+    hits = {hit["page"]: hit["score"] for hit in index.search("common rare")}
+
+    # Only page 1 has the rare term, which outweighs the common one on every page
+    assert max(hits, key=lambda page: hits[page]) == 1
+    assert hits[1] - hits[2] > hits[2]
+
+
+def test_ranks_shorter_page_first_at_equal_frequency(index: TextIndex) -> None:
+    index.ingest(
+        "doc-1",
+        _pages("contract " + "filler " * 40, "contract filler", "other words here"),
+        "test",
+    )
+
+    assert [hit["page"] for hit in index.search("contract")] == [2, 1]
+
+
+def test_trailing_form_feed_does_not_add_a_page(index: TextIndex) -> None:
+    result = index.ingest("doc-1", _pages("one", "two", ""), "test")
+
+    assert result["pageCount"] == 2
+
+
+def test_shared_content_is_indexed_once(index: TextIndex) -> None:
+    content = _pages("quarterly report", "revenue grew")
+    first = index.ingest("doc-1", content, "test")
+    second = index.ingest("doc-2", content, "test")
+
+    assert not first["skipped"]
+    assert second["skipped"]
+    assert second["contentHash"] == first["contentHash"]
+    hits = index.search("revenue")
+    assert len(hits) == 1
+    assert hits[0]["documentIds"] == ["doc-1", "doc-2"]
+    assert index.search("revenue", document_ids=["doc-2"])[0]["documentIds"] == ["doc-2"]
+
+
+def test_search_filters_by_document(index: TextIndex) -> None:
+    index.ingest("doc-1", _pages("alpha beta"), "test")
+    index.ingest("doc-2", _pages("alpha gamma"), "test")
+
+    hits = index.search("alpha", document_ids=["doc-2"])
+
+    assert [hit["documentIds"] for hit in hits] == [["doc-2"]]
+    assert "alpha" in hits[0]["snippet"]
+
+
+def test_reingest_replaces_orphaned_content(index: TextIndex) -> None:
+    index.ingest("doc-1", _pages("old wording"), "test")
+    index.ingest("doc-1", _pages("new wording"), "test")
+
+    assert index.search("old") == []
+    assert [hit["documentIds"] for hit in index.search("new")] == [["doc-1"]]
+
+
+def test_search_without_terms_or_matches(index: TextIndex) -> None:
+    index.ingest("doc-1", _pages("alpha"), "test")
+
+    assert index.search("  !! ") == []
+    assert index.search("missing") == []
+    assert index.is_indexed("doc-1")
+    assert not index.is_indexed("doc-2")
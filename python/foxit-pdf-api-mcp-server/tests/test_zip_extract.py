@@ -0,0 +1,126 @@
+"""Tests for streaming ZIP extraction."""
+
+import hashlib
+import io
+import zipfile
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from foxit_pdf_api_mcp_server.utils.zip_extract import extract_zip_stream
+
+
+class _WriteOnly(io.RawIOBase):
+    """Unseekable output, which makes zipfile write data descriptors."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.data += data
+        return len(data)
+
+
+def _archive(
+    members: list[tuple[str, bytes, int]], seekable: bool = True, force_zip64: bool = False
+) -> bytes:
+    output = io.BytesIO() if seekable else _WriteOnly()
+    with zipfile.ZipFile(output, "w") as archive:
+        for name, data, method in members:
+            info = zipfile.ZipInfo(name)
+            info.compress_type = method
+            with archive.open(info, "w", force_zip64=force_zip64) as entry:
+                entry.write(data)
+    return output.getvalue() if isinstance(output, io.BytesIO) else bytes(output.data)
+
+
+async def _chunks(data: bytes, size: int = 7) -> AsyncIterator[bytes]:
+    # Small chunks split headers and entry data across reads
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _manifest(target: Path, members: list[tuple[str, bytes, int]]) -> list[dict[str, object]]:
+    return [
+        {
+            "name": name,
+            "path": str(target / name),
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+        for name, data, _method in members
+    ]
+
+
+MEMBERS = [
+    ("part_1.pdf", b"%PDF-1.7 first" * 1000, zipfile.ZIP_DEFLATED),
+    ("nested/part_2.pdf", b"%PDF-1.7 second", zipfile.ZIP_STORED),
+    ("part_3.txt", b"", zipfile.ZIP_DEFLATED),
+]
+
+
+@pytest.mark.parametrize("force_zip64", [False, True])
+async def test_streams_entries_with_local_header_sizes(tmp_path: Path, force_zip64: bool) -> None:
+    data = _archive(MEMBERS, force_zip64=force_zip64)
+
+    entries = await extract_zip_stream(_chunks(data), tmp_path)
+
+    assert entries == _manifest(tmp_path, MEMBERS)
+    assert (tmp_path / "nested" / "part_2.pdf").read_bytes() == b"%PDF-1.7 second"
+
+
+async def test_streams_deflated_entries_with_data_descriptors(tmp_path: Path) -> None:
+    members = [(name, data, zipfile.ZIP_DEFLATED) for name, data, _method in MEMBERS]
+    data = _archive(members, seekable=False)
+    assert zipfile.ZipFile(io.BytesIO(data)).infolist()[0].flag_bits & 0x08
+
+    entries = await extract_zip_stream(_chunks(data), tmp_path)
+
+    assert entries == _manifest(tmp_path, members)
+
+
+async def test_falls_back_to_spool_for_stored_entry_with_data_descriptor(
+    tmp_path: Path,
+) -> None:
+    # The stored entry's size is only in its trailing descriptor, so the
+    # extractor streams the first entry and reads the rest from a spool
+    data = _archive(MEMBERS, seekable=False)
+    stored = zipfile.ZipFile(io.BytesIO(data)).getinfo("nested/part_2.pdf")
+    assert stored.compress_type == zipfile.ZIP_STORED and stored.flag_bits & 0x08
+
+    entries = await extract_zip_stream(_chunks(data, 1024), tmp_path)
+
+    assert entries == _manifest(tmp_path, MEMBERS)
+
+
+async def test_falls_back_to_spool_for_prefixed_archive(tmp_path: Path) -> None:
+    data = b"not a local header" + _archive(MEMBERS)
+
+    entries = await extract_zip_stream(_chunks(data), tmp_path)
+
+    assert entries == _manifest(tmp_path, MEMBERS)
+
+
+async def test_empty_archive(tmp_path: Path) -> None:
+    assert await extract_zip_stream(_chunks(_archive([])), tmp_path) == []
+
+
+@pytest.mark.parametrize("name", ["../evil.pdf", "/etc/evil.pdf", "a/../../evil.pdf"])
+async def test_rejects_unsafe_entry_names(tmp_path: Path, name: str) -> None:
+    data = _archive([(name, b"x", zipfile.ZIP_DEFLATED)])
+
+    with pytest.raises(ValueError, match="Unsafe ZIP entry name"):
+        await extract_zip_stream(_chunks(data), tmp_path / "out")
+    assert not (tmp_path / "evil.pdf").exists()
+
+
+@pytest.mark.parametrize("method", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+async def test_rejects_truncated_archive(tmp_path: Path, method: int) -> None:
+    data = _archive([("part_1.pdf", bytes(range(256)) * 100, method)])
+
+    with pytest.raises(ValueError, match="ended"):
+        await extract_zip_stream(_chunks(data[: len(data) // 2]), tmp_path)